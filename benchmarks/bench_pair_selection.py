@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+u"""
+bench_pair_selection.py
+Written by agent (10/2026)
+
+Runtime scaling of the automatic pair selection available in
+utils/pair_selection.py with the archive size. Synthetic catalog records
+are generated with daily acquisitions over a set of frames with randomly
+jittered footprints.
+
+usage: bench_pair_selection.py [-h] [--sizes SIZES [SIZES ...]]
+       [--frames FRAMES] [--min-days MIN_DAYS] [--max-days MAX_DAYS]
+       [--min-overlap MIN_OVERLAP]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --sizes SIZES [SIZES ...], -S SIZES [SIZES ...]
+                        Number of interferograms in the archive.
+  --frames FRAMES       Number of distinct frames (footprints).
+  --min-days MIN_DAYS   Minimum separation [days].
+  --max-days MAX_DAYS   Maximum separation [days].
+  --min-overlap MIN_OVERLAP
+                        Minimum footprint overlap [0-1].
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from utils.scene_names import ICEYE_PREFIX  # noqa: E402
+from utils.pair_selection import select_pairs  # noqa: E402
+
+
+def synthetic_records(n_scenes: int, n_frames: int, seed: int = 0) -> list:
+    """
+    Synthetic catalog records - see utils.catalog.query_scenes
+    :param n_scenes: number of interferograms
+    :param n_frames: number of distinct frames
+    :param seed: random generator seed
+    :return: list of records (dict)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, 1e6, (n_frames, 2))
+    frames = rng.integers(0, n_frames, n_scenes)
+    shift = rng.normal(0, 2e3, (n_scenes, 2))
+    start = np.datetime64('2021-01-01')
+    records = []
+    for k in range(n_scenes):
+        # - one acquisition per frame and day
+        day = start + np.timedelta64(k // n_frames, 'D')
+        date_ref = str(day).replace('-', '')
+        date_sec = str(day + 1).replace('-', '')
+        x_c, y_c = centers[frames[k]] + shift[k]
+        records.append({
+            'name': f'{ICEYE_PREFIX}{date_ref}_{date_sec}_{k:06d}',
+            'date_ref': date_ref, 'date_sec': date_sec, 'crs': 'EPSG:3413',
+            'left': x_c - 5e3, 'bottom': y_c - 5e3,
+            'right': x_c + 5e3, 'top': y_c + 5e3,
+        })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Runtime scaling of the automatic pair selection."""
+    )
+    parser.add_argument('--sizes', '-S', type=int, nargs='+',
+                        default=[1000, 10000, 50000],
+                        help='Number of interferograms in the archive.')
+    parser.add_argument('--frames', type=int, default=50,
+                        help='Number of distinct frames (footprints).')
+    parser.add_argument('--min-days', type=int, default=1,
+                        help='Minimum separation [days].')
+    parser.add_argument('--max-days', type=int, default=4,
+                        help='Maximum separation [days].')
+    parser.add_argument('--min-overlap', type=float, default=0.6,
+                        help='Minimum footprint overlap [0-1].')
+    args = parser.parse_args()
+
+    print(f'{"scenes":>8}{"pairs":>10}{"time [s]":>10}')
+    for size in args.sizes:
+        records = synthetic_records(size, args.frames)
+        t_start = time.perf_counter()
+        pairs = select_pairs(records, min_days=args.min_days,
+                             max_days=args.max_days,
+                             min_overlap=args.min_overlap)
+        t_run = time.perf_counter() - t_start
+        print(f'{size:>8}{len(pairs):>10}{t_run:>10.3f}')
+
+
+# - run main program
+if __name__ == '__main__':
+    main()
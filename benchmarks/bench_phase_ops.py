@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+u"""
+bench_phase_ops.py
+Written by agent (10/2026)
+
+Compare peak memory and wall-clock time of the complex-domain double
+difference expression:
+    np.angle(np.exp(1j * phi_1) * np.conj(np.exp(1j * phi_2)))
+against the float32 wrapped-subtraction kernel in utils/phase_ops.py.
+
+usage: bench_phase_ops.py [-h] [--size SIZE] [--repeat REPEAT]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --size SIZE, -S SIZE  Side of the synthetic square interferogram.
+  --repeat REPEAT, -R REPEAT
+                        Number of timed repetitions.
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    tracemalloc: Trace memory allocations
+           https://docs.python.org/3/library/tracemalloc.html
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from utils.phase_ops import phase_difference, wrap_phase  # noqa: E402
+
+
+def complex_double_difference(phase_1: np.ndarray,
+                              phase_2: np.ndarray) -> np.ndarray:
+    """
+    Reference double difference computed in the complex domain
+    :param phase_1: reference phase [rad]
+    :param phase_2: secondary phase [rad]
+    :return: wrapped phase difference [rad]
+    """
+    cmp_phase_1 = np.exp(1j * phase_1)
+    cmp_phase_2 = np.exp(1j * phase_2)
+    return np.angle(cmp_phase_1 * np.conj(cmp_phase_2))
+
+
+def profile(func, *args, repeat: int = 3, **kwargs) -> tuple:
+    """
+    Measure best wall-clock time and peak traced memory of a function call
+    :param func: function to profile
+    :param args: positional arguments passed to func
+    :param repeat: number of timed repetitions
+    :param kwargs: keyword arguments passed to func
+    :return: best time [s], peak memory [bytes], function output
+    """
+    tracemalloc.start()
+    result = func(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    timings = []
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append(time.perf_counter() - t_start)
+    return min(timings), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Benchmark the float32 double difference kernel
+        against the complex-domain expression."""
+    )
+    parser.add_argument('--size', '-S', type=int, default=4096,
+                        help='Side of the synthetic square interferogram.')
+    parser.add_argument('--repeat', '-R', type=int, default=3,
+                        help='Number of timed repetitions.')
+    args = parser.parse_args()
+
+    # - Synthetic wrapped interferograms
+    rng = np.random.default_rng(0)
+    shape = (args.size, args.size)
+    phase_1 = rng.uniform(-np.pi, np.pi, shape).astype(np.float32)
+    phase_2 = rng.uniform(-np.pi, np.pi, shape).astype(np.float32)
+    out = np.empty(shape, dtype=np.float32)
+
+    t_cmp, m_cmp, dd_cmp = profile(complex_double_difference,
+                                   phase_1, phase_2, repeat=args.repeat)
+    t_ker, m_ker, dd_ker = profile(phase_difference,
+                                   phase_1, phase_2, repeat=args.repeat)
+    t_out, m_out, _ = profile(phase_difference, phase_1, phase_2,
+                              out=out, repeat=args.repeat)
+
+    # - Agreement between the two methods (modulo 2pi)
+    max_err = np.abs(wrap_phase(dd_ker - dd_cmp)).max()
+
+    print(f'# - Interferogram size: {shape[0]} x {shape[1]} '
+          f'({phase_1.nbytes / 2**20:.1f} MiB per input)')
+    print(f'{"method":<28}{"time [s]":>12}{"peak [MiB]":>14}')
+    for label, t_val, m_val in [('complex128 exp/conj/angle', t_cmp, m_cmp),
+                                ('float32 kernel', t_ker, m_ker),
+                                ('float32 kernel (out=)', t_out, m_out)]:
+        print(f'{label:<28}{t_val:>12.4f}{m_val / 2**20:>14.1f}')
+    print(f'# - Speed-up: {t_cmp / t_ker:.1f}x - '
+          f'Max abs. difference: {max_err:.2e} rad')
+
+
+# - run main program
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+u"""
+bench_tile_workers.py
+Written by agent (10/2026)
+
+Scaling report of the streaming double difference engine: the same
+synthetic interferogram pair is processed with an increasing number of
+worker threads.
+
+usage: bench_tile_workers.py [-h] [--size SIZE] [--tile-size TILE_SIZE]
+       [--max-workers MAX_WORKERS] [--workdir WORKDIR]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --size SIZE, -S SIZE  Side of the synthetic square interferograms.
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels].
+  --max-workers MAX_WORKERS, -W MAX_WORKERS
+                        Maximum number of worker threads.
+  --workdir WORKDIR     Directory used to store the synthetic rasters.
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    rasterio: access to geospatial raster data
+           https://rasterio.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from utils.tiling import tile_windows  # noqa: E402
+from utils.double_diff import stream_double_difference  # noqa: E402
+
+
+def synthetic_interferogram(out_path: str, size: int, seed: int,
+                            tile_size: int = 1024) -> None:
+    """
+    Write a synthetic wrapped interferogram tile by tile
+    :param out_path: absolute path to the output GeoTIFF
+    :param size: side of the square raster [pixels]
+    :param seed: random number generator seed
+    :param tile_size: tile side [pixels]
+    :return: None
+    """
+    rng = np.random.default_rng(seed)
+    profile = {'driver': 'GTiff', 'height': size, 'width': size,
+               'count': 1, 'dtype': 'float32', 'crs': 'EPSG:3413',
+               'transform': Affine(5., 0., -100000., 0., -5., -900000.),
+               'nodata': -9999., 'tiled': True, 'blockxsize': 256,
+               'blockysize': 256, 'compress': 'deflate'}
+    with rasterio.open(out_path, 'w', **profile) as dst:
+        for window in tile_windows(size, size, tile_size):
+            shape = (window.height, window.width)
+            dst.write(rng.uniform(-np.pi, np.pi, shape).astype(np.float32),
+                      1, window=window)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Scaling report of the multi-threaded streaming
+        double difference engine."""
+    )
+    parser.add_argument('--size', '-S', type=int, default=20000,
+                        help='Side of the synthetic square interferograms.')
+    parser.add_argument('--tile-size', '-T', type=int, default=1024,
+                        help='Tile side [pixels].')
+    parser.add_argument('--max-workers', '-W', type=int,
+                        default=os.cpu_count(),
+                        help='Maximum number of worker threads.')
+    parser.add_argument('--workdir', type=str, default=None,
+                        help='Directory used to store the synthetic rasters.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp_dir:
+        ref_path = os.path.join(tmp_dir, 'reference.tif')
+        sec_path = os.path.join(tmp_dir, 'secondary.tif')
+        out_path = os.path.join(tmp_dir, 'double_difference.tif')
+        print(f'# - Generating synthetic {args.size} x {args.size} pair.')
+        synthetic_interferogram(ref_path, args.size, 1)
+        synthetic_interferogram(sec_path, args.size, 2)
+
+        print(f'# - CPU cores: {os.cpu_count()}')
+        print(f'{"workers":>8}{"time [s]":>12}{"speed-up":>10}'
+              f'{"efficiency":>12}')
+        t_ref = None
+        for workers in range(1, args.max_workers + 1):
+            t_start = time.perf_counter()
+            stream_double_difference(ref_path, sec_path, out_path,
+                                     tile_size=args.tile_size,
+                                     workers=workers)
+            t_run = time.perf_counter() - t_start
+            t_ref = t_run if t_ref is None else t_ref
+            print(f'{workers:>8}{t_run:>12.2f}{t_ref / t_run:>10.2f}'
+                  f'{t_ref / t_run / workers:>12.2f}')
+
+
+# - run main program
+if __name__ == '__main__':
+    main()
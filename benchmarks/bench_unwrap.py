@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+u"""
+bench_unwrap.py
+Written by agent (10/2026)
+
+Runtime and memory scaling of the quality-guided phase unwrapping available
+in utils/unwrap.py with the scene size: whole-array unwrapping vs tile-based
+unwrapping. Peak memory is measured with tracemalloc.
+
+usage: bench_unwrap.py [-h] [--sizes SIZES [SIZES ...]]
+       [--tile-size TILE_SIZE] [--overlap OVERLAP] [--max-whole MAX_WHOLE]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --sizes SIZES [SIZES ...], -S SIZES [SIZES ...]
+                        Sides of the synthetic square scenes.
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels].
+  --overlap OVERLAP     Overlap between adjacent tiles [pixels].
+  --max-whole MAX_WHOLE
+                        Largest scene unwrapped as a whole.
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from utils.phase_ops import wrap_phase, TWO_PI  # noqa: E402
+from utils.unwrap import unwrap_phase, unwrap_tiled  # noqa: E402
+
+
+def synthetic_scene(size: int, seed: int = 0) -> tuple:
+    """
+    Synthetic tidal-like deformation signal and its noisy wrapped phase
+    :param size: scene side [pixels]
+    :param seed: random generator seed
+    :return: (true phase, wrapped phase) [rad]
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:size, 0:size] / size
+    truth = (60. * np.exp(-((xx - 0.4)**2 + (yy - 0.6)**2) / 0.1)
+             + 20. * xx).astype(np.float32)
+    phase = wrap_phase(truth + rng.normal(0, 0.3, truth.shape)
+                       .astype(np.float32))
+    return truth, phase
+
+
+def profile_call(func, *args, **kwargs) -> tuple:
+    """
+    Run a function and measure its runtime and peak allocated memory
+    :return: (function output, runtime [s], peak memory [MiB])
+    """
+    tracemalloc.start()
+    t_start = time.perf_counter()
+    out = func(*args, **kwargs)
+    t_run = time.perf_counter() - t_start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return out, t_run, peak
+
+
+def fraction_correct(unw_phase: np.ndarray, truth: np.ndarray) -> float:
+    """
+    Fraction of pixels unwrapped with the correct number of cycles (up to
+    a constant offset)
+    """
+    cycles = np.rint((unw_phase - truth) / TWO_PI)
+    cycles = cycles[np.isfinite(cycles)]
+    return np.unique(cycles, return_counts=True)[1].max() / cycles.size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Runtime and memory scaling of the tile-based phase
+        unwrapping."""
+    )
+    parser.add_argument('--sizes', '-S', type=int, nargs='+',
+                        default=[512, 1024, 2048, 4096],
+                        help='Sides of the synthetic square scenes.')
+    parser.add_argument('--tile-size', '-T', type=int, default=512,
+                        help='Tile side [pixels].')
+    parser.add_argument('--overlap', type=int, default=64,
+                        help='Overlap between adjacent tiles [pixels].')
+    parser.add_argument('--max-whole', type=int, default=2048,
+                        help='Largest scene unwrapped as a whole.')
+    args = parser.parse_args()
+
+    print(f'# - Tile size: {args.tile_size} - overlap: {args.overlap}')
+    print(f'{"size":>6}{"mode":>8}{"time [s]":>10}{"peak [MiB]":>12}'
+          f'{"correct":>9}')
+    for size in args.sizes:
+        truth, phase = synthetic_scene(size)
+        runs = [('tiled', unwrap_tiled,
+                 {'tile_size': args.tile_size, 'overlap': args.overlap})]
+        if size <= args.max_whole:
+            runs.insert(0, ('whole', unwrap_phase, {}))
+        for label, func, kwargs in runs:
+            unw_phase, t_run, peak = profile_call(func, phase, **kwargs)
+            print(f'{size:>6}{label:>8}{t_run:>10.2f}{peak:>12.1f}'
+                  f'{fraction_correct(unw_phase, truth):>9.4f}')
+
+
+# - run main program
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+u"""
+closure_phase.py
+Written by agent (10/2026)
+
+Compute the closure phase phi_ab + phi_bc - phi_ac of all the triplets of
+acquisitions (a < b < c) whose three interferograms are available.
+Acquisition dates are read from the interferogram file names:
+    ICEYE-phase_geo-<YYYYMMDD>_<YYYYMMDD>[...].tif
+
+Closure phases are computed tile by tile: each interferogram tile is decoded
+once per tile pass and the closure phases of all the triplets are computed
+with a single batched array operation. Closure rasters are saved in groups
+of 128 triplets to bound the number of open files: with more triplets, the
+interferograms are read once per group.
+
+Output (saved in OUTDIR):
+    closure_<YYYYMMDD>_<YYYYMMDD>_<YYYYMMDD>.tif - closure phase [rad]
+        of each triplet (not saved with --summary-only)
+    closure_summary.csv - valid pixels, mean absolute closure and RMS
+        closure [rad] of each triplet
+
+usage: closure_phase.py [-h] [--directory DIRECTORY] [--outdir OUTDIR]
+       [--tile-size TILE_SIZE] [--workers WORKERS] [--summary-only]
+       [scenes ...]
+
+positional arguments:
+  scenes                Interferograms of the network [default: all the
+                        ICEYE-phase_geo-*.tif files in DIRECTORY].
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --directory DIRECTORY, -D DIRECTORY
+                        Project data directory.
+  --outdir OUTDIR, -O OUTDIR
+                        Output directory.
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels].
+  --workers WORKERS, -W WORKERS
+                        Number of threads used to process tiles.
+  --summary-only        Save only the closure statistics (no rasters).
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    datetime: Basic date and time types
+           https://docs.python.org/3/library/datetime.html
+    rasterio: access to geospatial raster data
+           https://rasterio.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import csv
+import glob
+import argparse
+from datetime import datetime
+from utils.make_dir import make_dir
+from utils.scene_names import strip_tif, interferogram_dates, ICEYE_PREFIX
+from utils.closure import closure_triplets, network_closures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Compute the closure phase of the triplets of a
+        network of interferograms."""
+    )
+    parser.add_argument('scenes', type=str, nargs='*',
+                        help='Interferograms of the network.')
+    # - Absolute Path to directory containing input data.
+    default_dir = os.path.join('/', 'Volumes', 'Extreme Pro',
+                               'Peterman_glacier_X7_subset')
+    parser.add_argument('--directory', '-D',
+                        type=lambda p: os.path.abspath(os.path.expanduser(p)),
+                        default=default_dir,
+                        help='Project data directory.')
+    parser.add_argument('--outdir', '-O', type=str, default='output_test',
+                        help='Output directory.')
+    parser.add_argument('--tile-size', '-T', type=int, default=1024,
+                        help='Tile side [pixels].')
+    parser.add_argument('--workers', '-W', type=int, default=1,
+                        help='Number of threads used to process tiles.')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Save only the closure statistics.')
+    args = parser.parse_args()
+
+    scenes = args.scenes
+    if not scenes:
+        scenes = sorted(os.path.basename(f) for f in glob.glob(
+            os.path.join(args.directory, ICEYE_PREFIX + '*.tif')))
+    scenes = [strip_tif(sc) for sc in scenes]
+    edges = [interferogram_dates(sc) for sc in scenes]
+    triplets, signs = closure_triplets(edges)
+    print(f'# - Network: {len(scenes)} interferograms - '
+          f'{len(triplets)} closed triplets.')
+    if not triplets:
+        return
+
+    out_dir = make_dir(args.directory, args.outdir)
+    # - triplet acquisition dates - (a, b, c)
+    t_dates = [(*sorted(edges[i_ab]), max(edges[i_bc]))
+               for i_ab, i_bc, _ in triplets]
+    out_paths = None if args.summary_only else \
+        [os.path.join(out_dir, 'closure_' + '_'.join(d) + '.tif')
+         for d in t_dates]
+    stats = network_closures(
+        [os.path.join(args.directory, sc + '.tif') for sc in scenes],
+        triplets, signs=signs, out_paths=out_paths, tile_size=args.tile_size,
+        workers=args.workers)
+
+    # - Closure summary
+    print(f'{"triplet":<30}{"valid":>10}{"mean |c| [rad]":>16}'
+          f'{"rms [rad]":>11}')
+    with open(os.path.join(out_dir, 'closure_summary.csv'), 'w',
+              newline='') as f_out:
+        writer = csv.writer(f_out)
+        writer.writerow(['date_a', 'date_b', 'date_c', 'valid',
+                         'mean_abs_rad', 'rms_rad'])
+        for d_t, s_t in zip(t_dates, stats):
+            print(f'{"_".join(d_t):<30}{s_t["valid"]:>10}'
+                  f'{s_t["mean_abs"]:>16.4f}{s_t["rms"]:>11.4f}')
+            writer.writerow([*d_t, s_t['valid'], f"{s_t['mean_abs']:.6f}",
+                             f"{s_t['rms']:.6f}"])
+
+
+# - run main program
+if __name__ == '__main__':
+    start_time = datetime.now()
+    main()
+    end_time = datetime.now()
+    print(f'# - Computation Time: {end_time - start_time}')
@@ -4,15 +4,30 @@ read_ee_phase.py
 Written by Enrico Ciraci' (02/2022)
 
 Compute the complex difference between two coregistered interferograms.
+The double difference is saved as a georeferenced GeoTIFF (or COG) together
+with a figure showing the two inputs and their difference.
 
 usage: read_ee_phase.py [-h] [--directory DIRECTORY]
-       [--outdir OUTDIR] reference secondary
+       [--outdir OUTDIR] [--stream] [--tile-size TILE_SIZE]
+       [--workers WORKERS] [--align] [--resampling RESAMPLING] [--cog]
+       [--no-plot] [--looks LOOKS [LOOKS ...]] [--coherence WINDOW]
+       [--goldstein ALPHA] [--goldstein-patch PATCH] [--unwrap]
+       [--fringe-belt THRESHOLD] [--belt-window WINDOW] [--ref-area SHP]
+       [--zonal-stats [SHP]] [--zone-field FIELD]
+       [--pairs PAIRS] [--processes PROCESSES]
+       [--max-in-flight MAX_IN_FLIGHT] [--watch] [--poll POLL]
+       [--settle SETTLE] [--min-days MIN_DAYS] [--max-days MAX_DAYS]
+       [--min-overlap MIN_OVERLAP] [--network {all,consecutive}]
+       [--scenes SCENES [SCENES ...]] [--mem-limit MEM_LIMIT]
+       [--raster-cache RASTER_CACHE] [--result-cache DIR]
+       [--result-cache-size RESULT_CACHE_SIZE] [--cache-digest] [--force]
+       [reference] [secondary]
 
 TEST: Compute the complex difference between two coregistered interferograms.
 
 positional arguments:
-  reference    Reference Interferogram.
-  secondary    Secondary Interferogram.
+  reference    Reference Interferogram (not required with --pairs/--watch).
+  secondary    Secondary Interferogram (not required with --pairs/--watch).
 
 optional arguments:
   -h, --help            show this help message and exit
@@ -20,6 +35,101 @@ optional arguments:
                         Project data directory.
   --outdir OUTDIR, -O OUTDIR
                         Output directory.
+  --stream              Compute the double difference tile by tile (only the
+                        GeoTIFF is produced, no figure).
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels] used in streaming mode.
+  --workers WORKERS, -W WORKERS
+                        Number of threads used to process tiles in
+                        streaming mode.
+  --align               Align the secondary interferogram to the reference
+                        grid on the fly (WarpedVRT) if the two
+                        interferograms are not defined on the same grid.
+  --resampling RESAMPLING
+                        Resampling algorithm used by --align.
+  --cog                 Save the double difference as a Cloud-Optimized
+                        GeoTIFF.
+  --no-plot             Do not produce the output figure (matplotlib is not
+                        imported).
+  --looks LOOKS [LOOKS ...], -L LOOKS [LOOKS ...]
+                        Number of looks - ROWS [COLUMNS] - used to
+                        multilook the double difference in the complex
+                        domain before saving and plotting it.
+  --coherence WINDOW    Compute the coherence (magnitude of the mean phasor)
+                        of the double difference within a sliding window of
+                        WINDOW x WINDOW pixels (odd number).
+  --goldstein ALPHA     Apply the Goldstein adaptive filter with exponent
+                        ALPHA [0, 1] to the double difference.
+  --goldstein-patch PATCH
+                        Patch side [pixels] used by the Goldstein filter
+                        (multiple of 8).
+  --unwrap              Unwrap the double difference (Goldstein filtered if
+                        --goldstein is used) tile by tile with a
+                        quality-guided algorithm.
+  --fringe-belt THRESHOLD
+                        Compute the wrapped phase gradient magnitude of the
+                        double difference (Goldstein filtered if
+                        --goldstein is used) and the mask of the fringe
+                        belt where its windowed mean exceeds THRESHOLD
+                        [rad/pixel].
+  --belt-window WINDOW  Side of the averaging window [pixels] used by
+                        --fringe-belt (odd number).
+  --ref-area SHP        Shapefile of a stable reference area: the circular
+                        mean phase of the double difference over the area
+                        is subtracted from the double difference.
+  --zonal-stats [SHP]   Save the circular statistics (count, mean, std,
+                        resultant length) of the double difference within
+                        each polygon of SHP [default: Petermann glaciers -
+                        esri_shp/Petermann_Domain_glaciers_epsg3413.shp].
+  --zone-field FIELD    Shapefile attribute used as zone id [default:
+                        feature index].
+  --pairs PAIRS         Manifest (.yaml/.csv) listing the pairs of
+                        interferograms to process (batch mode).
+  --processes PROCESSES, -P PROCESSES
+                        Number of processes used in batch mode.
+  --max-in-flight MAX_IN_FLIGHT
+                        Maximum number of pairs processed at the same time
+                        in batch mode [default: PROCESSES].
+  --watch               Poll DIRECTORY and process the pairs formed by new
+                        ICEYE-phase_geo-*.tif files. Processed pairs are
+                        listed in OUTDIR/watch_done.csv and never
+                        recomputed, also across restarts.
+  --poll POLL           Time between two polls [s] in watch mode.
+  --settle SETTLE       Minimum time [s] since the last modification of a
+                        new file before it is processed.
+  --min-days MIN_DAYS   Minimum separation between the reference dates of
+                        a pair [days] in watch mode.
+  --max-days MAX_DAYS   Maximum separation between the reference dates of
+                        a pair [days] in watch mode.
+  --min-overlap MIN_OVERLAP
+                        Minimum footprint overlap of a pair [0-1] in watch
+                        mode.
+  --network {all,consecutive}
+                        Compute the double differences of every pair or of
+                        every consecutive pair of a set of interferograms.
+  --scenes SCENES [SCENES ...]
+                        Interferograms of the network [default: all the
+                        ICEYE-phase_geo-*.tif files in DIRECTORY].
+  --mem-limit MEM_LIMIT
+                        Memory ceiling [MiB] used in network mode. Outputs
+                        are written in groups of 128 pairs: if the whole
+                        interferograms do not fit in MEM_LIMIT, they are
+                        read again for each group.
+  --raster-cache RASTER_CACHE
+                        Size [MiB] of the in-memory LRU cache of loaded
+                        rasters (one per process) - disabled by default.
+  --result-cache DIR    Directory of the on-disk cache of the products of
+                        each pair - disabled by default. Products of pairs
+                        already processed with the same inputs and options
+                        are hard-linked into OUTDIR and not recomputed.
+  --result-cache-size RESULT_CACHE_SIZE
+                        Size [MiB] of the result cache - least recently
+                        used entries are evicted.
+  --cache-digest        Identify the inputs of the result cache by file
+                        name, size and content digest instead of path,
+                        size and modification time.
+  --force               Recompute the products of each pair even if found
+                        in the result cache.
 
 
 PYTHON DEPENDENCIES:
@@ -29,38 +139,405 @@ PYTHON DEPENDENCIES:
            https://docs.python.org/3/library/datetime.html
     rasterio: access to geospatial raster data
            https://rasterio.readthedocs.io
-    matplotlib: Visualization with Python
+    matplotlib: Visualization with Python (only to produce the figure)
            https://matplotlib.org/
 
 UPDATE HISTORY:
-
+    Updated 10/2026: compute the double difference with the float32
+        wrapped-subtraction kernel from utils.phase_ops.
+    Updated 10/2026: added --stream option - tiled, constant-memory
+        computation of the double difference (utils.double_diff).
+    Updated 10/2026: added --workers option - multi-threaded tile executor.
+    Updated 10/2026: added batch mode - --pairs manifest.yaml|csv processed
+        across a pool of processes with a per-pair status/timing summary.
+    Updated 10/2026: added network mode - all/consecutive double
+        differences of a set of interferograms, each decoded only once.
+    Updated 10/2026: added --raster-cache option - opt-in LRU cache in
+        front of load_raster.
+    Updated 10/2026: compute the double difference only on the overlapping
+        footprint of the two interferograms.
+    Updated 10/2026: added --align option - on-the-fly alignment of the
+        secondary interferogram to the reference grid via WarpedVRT.
+    Updated 10/2026: save the double difference as a georeferenced tiled
+        GeoTIFF or Cloud-Optimized GeoTIFF (--cog) alongside the figure.
+    Updated 10/2026: added --no-plot option - figure code moved to
+        utils.plot_double_diff and matplotlib imported only when needed.
+    Updated 10/2026: added --looks option - complex-domain multilooking.
+    Updated 10/2026: added --coherence option - sliding-window coherence
+        of the double difference computed from integral images.
+    Updated 10/2026: added --goldstein option - batched, multi-threaded
+        Goldstein adaptive filter of the double difference.
+    Updated 10/2026: added --unwrap option - tile-based quality-guided
+        phase unwrapping of the double difference.
+    Updated 10/2026: added --fringe-belt option - wrapped phase gradient
+        magnitude and fringe-belt (tidal flexure zone) mask.
+    Updated 10/2026: added --ref-area option - reference-area phase
+        normalization with cached rasterized polygon masks.
+    Updated 10/2026: added --zonal-stats option - per-glacier circular
+        statistics from a cached label raster and np.bincount.
+    Updated 10/2026: added --watch option - incremental processing of the
+        new pairs delivered to the data directory with a done-manifest.
+    Updated 10/2026: added --result-cache option - content-addressed,
+        size-bounded cache of the products of each pair (--force).
 """
 # - Python Dependencies
 from __future__ import print_function
 import os
+import glob
+import inspect
 import argparse
 import numpy as np
+from functools import partial
 from datetime import datetime
-import matplotlib.pyplot as plt
-from mpl_toolkits.axes_grid1 import make_axes_locatable
-from utils.raster_io import load_raster
+from rasterio.transform import Affine
+from utils.raster_io import load_raster, enable_raster_cache, \
+    get_raster_cache, write_raster
 from utils.make_dir import make_dir
+from utils.phase_ops import phase_difference, multilook, circular_mean, \
+    subtract_phase
+from utils.double_diff import stream_double_difference, open_pair_grid, \
+    read_secondary, valid_mask, NODATA
+from utils.scene_names import interferogram_name, strip_tif, ICEYE_PREFIX
+from utils.pair_manifest import read_pair_manifest
+from utils.batch import run_batch, write_batch_summary
+from utils.network import network_pairs, network_double_differences, \
+    MAX_OPEN_OUTPUTS
+from utils.coherence import phase_coherence, coherence_raster
+from utils.goldstein import goldstein_filter_tiled, goldstein_raster
+from utils.unwrap import unwrap_tiled, unwrap_raster
+from utils.fringe_belt import fringe_belt, fringe_belt_raster, MASK_NODATA
+from utils.shape_masks import shape_mask, label_raster
+from utils.zonal import zonal_stats, zonal_stats_raster, write_zonal_stats
+from utils.catalog import CATALOG_NAME
+from utils.watch import watch_directory
+from utils.result_cache import ResultCache, unlink_outputs
+
+# - Default zones used to compute zonal statistics - glacier outlines
+GLACIERS_SHP = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'esri_shp',
+                            'Petermann_Domain_glaciers_epsg3413.shp')
+
+
+def process_pair(reference: str, secondary: str, directory: str,
+                 outdir: str, stream: bool = False, tile_size: int = 1024,
+                 workers: int = 1, align: bool = False,
+                 resampling: str = 'nearest', cog: bool = False,
+                 plot: bool = True, looks: tuple = (1, 1),
+                 coherence: int = None, goldstein: float = None,
+                 goldstein_patch: int = 32, unwrap: bool = False,
+                 belt_threshold: float = None, belt_window: int = 5,
+                 ref_area: str = None, zones: str = None,
+                 zone_field: str = None) -> None:
+    """
+    Compute the double difference between two coregistered interferograms
+    :param reference: reference interferogram file name (no extension)
+    :param secondary: secondary interferogram file name (no extension)
+    :param directory: project data directory
+    :param outdir: output directory name
+    :param stream: compute the double difference tile by tile
+    :param tile_size: tile side [pixels] used in streaming mode
+    :param workers: number of threads used in streaming mode
+    :param align: align the secondary to the reference grid if needed
+    :param resampling: resampling algorithm used to align the secondary
+    :param cog: save the double difference as a Cloud-Optimized GeoTIFF
+    :param plot: save a figure of the two inputs and their difference
+    :param looks: number of looks - (rows, columns)
+    :param coherence: window side [pixels] used to compute the coherence
+        of the double difference - None: coherence not computed
+    :param goldstein: Goldstein filter exponent - None: filter not applied
+    :param goldstein_patch: Goldstein filter patch side [pixels]
+    :param unwrap: unwrap the (filtered) double difference
+    :param belt_threshold: fringe-belt gradient magnitude threshold
+        [rad/pixel] - None: fringe belt not computed
+    :param belt_window: side of the fringe-belt averaging window [pixels]
+    :param ref_area: absolute path to the shapefile of the reference area
+        used to remove the phase offset - None: no normalization
+    :param zones: absolute path to the shapefile of the zones used to
+        compute zonal statistics - None: not computed
+    :param zone_field: shapefile attribute used as zone id
+    :return: None
+    """
+    # - Test Files/Volumes/Extreme Pro/Peterman_glacier_X7_subset
+    file_1 = reference + '.tif'
+    file_2 = secondary + '.tif'
+
+    # - Extract Interferogram name from file name
+    name_1 = interferogram_name(file_1)
+    name_2 = interferogram_name(file_2)
+
+    if stream:
+        # - Compute the double difference tile by tile
+        out_dir = make_dir(directory, outdir)
+        dd_path = os.path.join(out_dir, f'{name_1}-{name_2}.tif')
+        stream_double_difference(
+            os.path.join(directory, file_1),
+            os.path.join(directory, file_2), dd_path,
+            tile_size=tile_size, workers=workers, align=align,
+            resampling=resampling, cog=cog, looks=looks, ref_area=ref_area)
+        if zones is not None:
+            # - Zonal statistics of the double difference
+            write_zonal_stats(
+                *zonal_stats_raster(dd_path, zones, field=zone_field,
+                                    tile_size=tile_size, workers=workers),
+                os.path.join(out_dir, f'{name_1}-{name_2}_zonal_stats.csv'))
+        if coherence is not None:
+            # - Compute the double difference coherence tile by tile
+            coherence_raster(
+                dd_path,
+                os.path.join(out_dir, f'{name_1}-{name_2}_coherence.tif'),
+                window=coherence, tile_size=tile_size, workers=workers)
+        if goldstein is not None:
+            # - Filter the double difference tile by tile
+            gs_path = os.path.join(out_dir, f'{name_1}-{name_2}_goldstein.tif')
+            goldstein_raster(dd_path, gs_path, alpha=goldstein,
+                             patch=goldstein_patch, tile_size=tile_size,
+                             workers=workers)
+            dd_path = gs_path
+        if unwrap:
+            # - Unwrap the (filtered) double difference tile by tile
+            unwrap_raster(
+                dd_path,
+                os.path.join(out_dir, f'{name_1}-{name_2}_unwrapped.tif'),
+                tile_size=tile_size, workers=workers)
+        if belt_threshold is not None:
+            # - Fringe belt of the (filtered) double difference
+            fringe_belt_raster(
+                dd_path,
+                os.path.join(out_dir, f'{name_1}-{name_2}_gradient.tif'),
+                os.path.join(out_dir, f'{name_1}-{name_2}_fringe_belt.tif'),
+                belt_threshold, window=belt_window, tile_size=tile_size,
+                workers=workers)
+        return
+
+    # - Find the overlapping area of the two interferograms
+    grid = open_pair_grid(os.path.join(directory, file_1),
+                          os.path.join(directory, file_2),
+                          align=align, resampling=resampling)
+
+    # - Load InSAR phase - only over the overlapping area
+    # - Input interferogram 1
+    d_inter1_input = load_raster(os.path.join(directory, file_1),
+                                 window=grid['ref_window'])
+    interf_1 = d_inter1_input['data']
+
+    # - Input interferogram 2
+    if grid['sec_vrt'] is None:
+        d_inter2_input = load_raster(os.path.join(directory, file_2),
+                                     window=grid['sec_window'])
+        interf_2 = d_inter2_input['data']
+        nodata_2 = d_inter2_input['nodata']
+    else:
+        # - secondary aligned on the fly to the reference grid
+        interf_2 = read_secondary(os.path.join(directory, file_2), grid)
+        nodata_2 = NODATA
+        if grid['transform'].e < 0:
+            interf_2 = np.flipud(interf_2)
+
+    # - Compute Differential Interferogram
+    # - NOTE: wrap(phi_1 - phi_2) is equivalent to the complex-domain
+    # - angle(exp(1j*phi_1) * conj(exp(1j*phi_2))) but stays in float32.
+    dd_phase = phase_difference(interf_1, interf_2)
+    valid_1 = valid_mask(interf_1, d_inter1_input['nodata'])
+    valid_2 = valid_mask(interf_2, nodata_2)
+    dd_phase[~(valid_1 & valid_2)] = np.nan
+
+    # - Output grid transform
+    transform = grid['transform']
+    flip = transform.e < 0
+
+    if ref_area is not None:
+        # - Remove the phase offset over the reference area (in place)
+        ref_mask = shape_mask(ref_area, d_inter1_input['crs'], transform,
+                              grid['width'], grid['height'])
+        offset = circular_mean(dd_phase,
+                               np.flipud(ref_mask) if flip else ref_mask)
+        if np.isnan(offset):
+            raise ValueError('No valid pixels found within the reference '
+                             'area.')
+        subtract_phase(dd_phase, offset)
+    if tuple(looks) != (1, 1):
+        # - Multilook inputs and double difference in the complex domain.
+        # - NOTE: blocks are defined starting from the first row at the top
+        # -       of the image, while load_raster returns arrays with the
+        # -       first row at the bottom when transform.e < 0.
+        def ml_native(phase, valid=None):
+            if not flip:
+                return multilook(phase, looks, valid=valid)
+            return np.flipud(multilook(
+                np.flipud(phase), looks,
+                valid=None if valid is None else np.flipud(valid)))
+        interf_1 = ml_native(interf_1, valid=valid_1)
+        interf_2 = ml_native(interf_2, valid=valid_2)
+        dd_phase = ml_native(dd_phase)
+        transform = transform * Affine.scale(looks[1], looks[0])
+
+    # - Create Output directory
+    out_dir = make_dir(directory, outdir)
+
+    # - Save the double difference in GeoTIFF format using the reference
+    # - interferogram CRS and transform (first row at the top of the image)
+    write_raster(np.flipud(dd_phase) if flip else dd_phase,
+                 os.path.join(out_dir, f'{name_1}-{name_2}.tif'),
+                 d_inter1_input['crs'], transform, nodata=NODATA, cog=cog)
 
+    if zones is not None:
+        # - Zonal statistics of the double difference
+        labels, zone_ids = label_raster(zones, d_inter1_input['crs'],
+                                        transform, dd_phase.shape[1],
+                                        dd_phase.shape[0], field=zone_field)
+        write_zonal_stats(
+            zone_ids, zonal_stats(dd_phase,
+                                  np.flipud(labels) if flip else labels,
+                                  len(zone_ids)),
+            os.path.join(out_dir, f'{name_1}-{name_2}_zonal_stats.csv'))
 
-def add_colorbar(fig: plt.figure(), ax: plt.Axes,
-                 im: plt.pcolormesh) -> plt.colorbar:
+    if coherence is not None:
+        # - Compute the double difference coherence
+        dd_coherence = phase_coherence(dd_phase, coherence)
+        write_raster(np.flipud(dd_coherence) if flip else dd_coherence,
+                     os.path.join(out_dir, f'{name_1}-{name_2}_coherence.tif'),
+                     d_inter1_input['crs'], transform, nodata=NODATA)
+
+    # - NOTE: the Goldstein patches and the unwrapping/fringe-belt tiles
+    # -       are defined starting from the first row at the top of the
+    # -       image (as in streaming mode): these stages are computed on
+    # -       the double difference with the first row at the top.
+    dd_filtered = np.flipud(dd_phase) if flip else dd_phase
+    if goldstein is not None:
+        # - Goldstein adaptive filter of the double difference
+        dd_filtered = goldstein_filter_tiled(dd_filtered, alpha=goldstein,
+                                             patch=goldstein_patch,
+                                             workers=workers)
+        write_raster(dd_filtered,
+                     os.path.join(out_dir, f'{name_1}-{name_2}_goldstein.tif'),
+                     d_inter1_input['crs'], transform, nodata=NODATA)
+
+    if unwrap:
+        # - Unwrap the (filtered) double difference tile by tile
+        dd_unwrapped = unwrap_tiled(dd_filtered, tile_size=tile_size,
+                                    workers=workers)
+        write_raster(dd_unwrapped,
+                     os.path.join(out_dir, f'{name_1}-{name_2}_unwrapped.tif'),
+                     d_inter1_input['crs'], transform, nodata=NODATA)
+
+    if belt_threshold is not None:
+        # - Fringe belt of the (filtered) double difference
+        dd_gradient, dd_belt = fringe_belt(dd_filtered, belt_threshold,
+                                           window=belt_window)
+        write_raster(dd_gradient,
+                     os.path.join(out_dir, f'{name_1}-{name_2}_gradient.tif'),
+                     d_inter1_input['crs'], transform, nodata=NODATA)
+        write_raster(dd_belt,
+                     os.path.join(out_dir,
+                                  f'{name_1}-{name_2}_fringe_belt.tif'),
+                     d_inter1_input['crs'], transform, nodata=MASK_NODATA)
+
+    if plot:
+        # - NOTE: matplotlib is imported only when a figure is requested
+        from utils.plot_double_diff import plot_double_difference
+        plot_double_difference(
+            interf_1, interf_2, dd_phase, name_1, name_2,
+            os.path.join(out_dir, f'{name_1}-{name_2}.jpeg'))
+
+
+def pair_outputs(reference: str, secondary: str, stream: bool = False,
+                 plot: bool = True, coherence: int = None,
+                 goldstein: float = None, unwrap: bool = False,
+                 belt_threshold: float = None, zones: str = None) -> list:
     """
-    Add colorbar to the selected plt.Axes
-    :param fig: plt.figure object
-    :param ax: plt.Axes object
-    :param im: plt.pcolormesh object
-    :return: plt.colorbar
+    List the products of process_pair
+    :param reference: reference interferogram file name (no extension)
+    :param secondary: secondary interferogram file name (no extension)
+    :param stream: see process_pair
+    :param plot: see process_pair
+    :param coherence: see process_pair
+    :param goldstein: see process_pair
+    :param unwrap: see process_pair
+    :param belt_threshold: see process_pair
+    :param zones: see process_pair
+    :return: list of output file names
     """
-    divider = make_axes_locatable(ax)
-    cax = divider.new_vertical(size='5%', pad=0.6, pack_start=True)
-    fig.add_axes(cax)
-    cb = fig.colorbar(im, cax=cax, orientation='horizontal')
-    return cb
+    dd_name = '-'.join([interferogram_name(reference),
+                        interferogram_name(secondary)])
+    suffixes = ['.tif']
+    if zones is not None:
+        suffixes.append('_zonal_stats.csv')
+    if coherence is not None:
+        suffixes.append('_coherence.tif')
+    if goldstein is not None:
+        suffixes.append('_goldstein.tif')
+    if unwrap:
+        suffixes.append('_unwrapped.tif')
+    if belt_threshold is not None:
+        suffixes.extend(['_gradient.tif', '_fringe_belt.tif'])
+    if plot and not stream:
+        suffixes.append('.jpeg')
+    return [dd_name + suffix for suffix in suffixes]
+
+
+def process_pair_cached(cache: ResultCache, force: bool, reference: str,
+                        secondary: str, *options) -> str:
+    """
+    Compute the double difference between two coregistered interferograms
+    - products are taken from the result cache when the same pair has
+    already been processed with the same inputs and options
+    :param cache: result cache
+    :param force: recompute the products and refresh the cache entry
+    :param reference: reference interferogram file name (no extension)
+    :param secondary: secondary interferogram file name (no extension)
+    :param options: process_pair options - directory, outdir, ...
+    :return: 'hit' or 'miss'
+    """
+    params = inspect.signature(process_pair).bind(
+        reference, secondary, *options)
+    params.apply_defaults()
+    params = dict(params.arguments)
+    directory, outdir = params.pop('directory'), params.pop('outdir')
+    # - the number of threads does not affect the products
+    params.pop('workers')
+    # - inputs - interferograms and shapefiles (with their sidecar files)
+    in_paths = [os.path.join(directory, reference + '.tif'),
+                os.path.join(directory, secondary + '.tif')]
+    for shp in (params['ref_area'], params['zones']):
+        if shp is not None:
+            in_paths.extend(sorted(glob.glob(
+                os.path.splitext(shp)[0] + '.*')))
+    key = cache.key(in_paths, params)
+    out_dir = make_dir(directory, outdir)
+    if not force and cache.fetch(key, out_dir) is not None:
+        return 'hit'
+    out_paths = [os.path.join(out_dir, f_name) for f_name in pair_outputs(
+        reference, secondary, stream=params['stream'], plot=params['plot'],
+        coherence=params['coherence'], goldstein=params['goldstein'],
+        unwrap=params['unwrap'], belt_threshold=params['belt_threshold'],
+        zones=params['zones'])]
+    unlink_outputs(out_paths)
+    process_pair(reference, secondary, *options)
+    cache.store(key, out_paths)
+    return 'miss'
+
+
+def process_network(scenes: list, directory: str, outdir: str,
+                    mode: str = 'all', mem_limit: float = None) -> None:
+    """
+    Compute the double differences of a network of interferograms
+    :param scenes: interferogram file names (no extension)
+    :param directory: project data directory
+    :param outdir: output directory name
+    :param mode: network mode - 'all' or 'consecutive' pairs
+    :param mem_limit: memory ceiling [MiB] - None: no limit
+    :return: None
+    """
+    out_dir = make_dir(directory, outdir)
+    names = [interferogram_name(sc) for sc in scenes]
+    pairs = network_pairs(len(scenes), mode=mode)
+    print(f'# - Network: {len(scenes)} interferograms - '
+          f'{len(pairs)} double differences.')
+    network_double_differences(
+        [os.path.join(directory, sc + '.tif') for sc in scenes], pairs,
+        [os.path.join(out_dir, f'{names[i]}-{names[j]}.tif')
+         for i, j in pairs],
+        mem_limit=None if mem_limit is None else mem_limit * 2**20)
 
 
 def main():
@@ -69,10 +546,10 @@ def main():
         coregistered interferograms."""
     )
     # - Reference Interferogram
-    parser.add_argument('reference', type=str,
+    parser.add_argument('reference', type=str, nargs='?',
                         help='Reference Interferogram.')
     # - Secondary Interferogram
-    parser.add_argument('secondary', type=str,
+    parser.add_argument('secondary', type=str, nargs='?',
                         help='Secondary Interferogram.')
 
     # - Absolute Path to directory containing input data.
@@ -86,82 +563,253 @@ def main():
     parser.add_argument('--outdir', '-O',
                         type=str,  default='output_test',
                         help='Output directory.')
+    # - Streaming mode
+    parser.add_argument('--stream', action='store_true',
+                        help='Compute the double difference tile by tile '
+                             '(only the GeoTIFF is produced, no figure).')
+    parser.add_argument('--tile-size', '-T', type=int, default=1024,
+                        help='Tile side [pixels] used in streaming mode.')
+    parser.add_argument('--workers', '-W', type=int, default=1,
+                        help='Number of threads used to process tiles in '
+                             'streaming mode.')
+    # - Grid alignment
+    parser.add_argument('--align', action='store_true',
+                        help='Align the secondary interferogram to the '
+                             'reference grid on the fly if the two '
+                             'interferograms are not defined on the same '
+                             'pixel grid.')
+    parser.add_argument('--resampling', type=str, default='nearest',
+                        choices=['nearest', 'bilinear', 'cubic', 'average',
+                                 'mode', 'med'],
+                        help='Resampling algorithm used by --align.')
+    # - Output format
+    parser.add_argument('--cog', action='store_true',
+                        help='Save the double difference as a '
+                             'Cloud-Optimized GeoTIFF.')
+    # - Headless compute-only mode
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Do not produce the output figure '
+                             '(matplotlib is not imported).')
+    # - Multilooking
+    parser.add_argument('--looks', '-L', type=int, nargs='+', default=[1],
+                        metavar='LOOKS',
+                        help='Number of looks - ROWS [COLUMNS] - used to '
+                             'multilook the double difference.')
+    # - Coherence
+    parser.add_argument('--coherence', type=int, default=None,
+                        metavar='WINDOW',
+                        help='Compute the coherence of the double '
+                             'difference within a sliding window of '
+                             'WINDOW x WINDOW pixels (odd number).')
+    # - Goldstein filter
+    parser.add_argument('--goldstein', type=float, default=None,
+                        metavar='ALPHA',
+                        help='Apply the Goldstein adaptive filter with '
+                             'exponent ALPHA [0, 1] to the double '
+                             'difference.')
+    parser.add_argument('--goldstein-patch', type=int, default=32,
+                        metavar='PATCH',
+                        help='Patch side [pixels] used by the Goldstein '
+                             'filter (multiple of 8).')
+    # - Phase unwrapping
+    parser.add_argument('--unwrap', action='store_true',
+                        help='Unwrap the double difference (Goldstein '
+                             'filtered if --goldstein is used) tile by tile.')
+    # - Fringe belt
+    parser.add_argument('--fringe-belt', type=float, default=None,
+                        metavar='THRESHOLD',
+                        help='Compute the phase gradient magnitude of the '
+                             'double difference and the mask of the fringe '
+                             'belt where its windowed mean exceeds '
+                             'THRESHOLD [rad/pixel].')
+    parser.add_argument('--belt-window', type=int, default=5,
+                        metavar='WINDOW',
+                        help='Side of the averaging window [pixels] used by '
+                             '--fringe-belt (odd number).')
+    # - Reference-area normalization
+    parser.add_argument('--ref-area', type=str, default=None,
+                        metavar='SHP',
+                        help='Shapefile of a stable reference area used to '
+                             'remove the phase offset of the double '
+                             'difference.')
+    # - Zonal statistics
+    parser.add_argument('--zonal-stats', type=str, nargs='?', default=None,
+                        const=GLACIERS_SHP, metavar='SHP',
+                        help='Save the circular statistics of the double '
+                             'difference within each polygon of SHP '
+                             '[default: Petermann glaciers].')
+    parser.add_argument('--zone-field', type=str, default=None,
+                        metavar='FIELD',
+                        help='Shapefile attribute used as zone id '
+                             '[default: feature index].')
+    # - Batch mode
+    parser.add_argument('--pairs', type=str, default=None,
+                        help='Manifest (.yaml/.csv) listing the pairs of '
+                             'interferograms to process.')
+    parser.add_argument('--processes', '-P', type=int, default=1,
+                        help='Number of processes used in batch mode.')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='Maximum number of pairs processed at the '
+                             'same time in batch mode [default: PROCESSES].')
+    # - Watch mode
+    parser.add_argument('--watch', action='store_true',
+                        help='Poll DIRECTORY and process the pairs formed '
+                             'by new ICEYE-phase_geo-*.tif files.')
+    parser.add_argument('--poll', type=float, default=60.,
+                        help='Time between two polls [s] in watch mode.')
+    parser.add_argument('--settle', type=float, default=30.,
+                        help='Minimum time [s] since the last modification '
+                             'of a new file before it is processed.')
+    parser.add_argument('--min-days', type=int, default=1,
+                        help='Minimum separation between the reference '
+                             'dates of a pair [days] in watch mode.')
+    parser.add_argument('--max-days', type=int, default=4,
+                        help='Maximum separation between the reference '
+                             'dates of a pair [days] in watch mode.')
+    parser.add_argument('--min-overlap', type=float, default=0.6,
+                        help='Minimum footprint overlap of a pair [0-1] in '
+                             'watch mode.')
+    # - Network mode
+    parser.add_argument('--network', choices=['all', 'consecutive'],
+                        default=None,
+                        help='Compute the double differences of every pair '
+                             'or of every consecutive pair of a set of '
+                             'interferograms.')
+    parser.add_argument('--scenes', type=str, nargs='+', default=None,
+                        help='Interferograms of the network [default: all '
+                             'the ICEYE-phase_geo-*.tif files in DIRECTORY].')
+    parser.add_argument('--mem-limit', type=float, default=None,
+                        help='Memory ceiling [MiB] used in network mode. '
+                             f'Outputs are written in groups of '
+                             f'{MAX_OPEN_OUTPUTS} pairs: '
+                             'if the whole interferograms do not fit in '
+                             'MEM_LIMIT, they are read again for each '
+                             'group.')
+    # - Raster cache
+    parser.add_argument('--raster-cache', type=float, default=None,
+                        help='Size [MiB] of the in-memory LRU cache of loaded '
+                             'rasters (one per process) - disabled by '
+                             'default.')
+    # - Result cache
+    parser.add_argument('--result-cache', type=str, default=None,
+                        metavar='DIR',
+                        help='Directory of the on-disk cache of the '
+                             'products of each pair - disabled by default.')
+    parser.add_argument('--result-cache-size', type=float, default=10240.,
+                        help='Size [MiB] of the result cache - least '
+                             'recently used entries are evicted.')
+    parser.add_argument('--cache-digest', action='store_true',
+                        help='Identify the inputs of the result cache by '
+                             'file name, size and content digest instead '
+                             'of path, size and modification time.')
+    parser.add_argument('--force', action='store_true',
+                        help='Recompute the products of each pair even if '
+                             'found in the result cache.')
     args = parser.parse_args()
 
-    # - Test Files/Volumes/Extreme Pro/Peterman_glacier_X7_subset
-    file_1 = args.reference + '.tif'
-    file_2 = args.secondary + '.tif'
+    # - Number of looks - (rows, columns)
+    if len(args.looks) > 2 or min(args.looks) < 1:
+        parser.error('--looks requires one or two positive integers.')
+    looks = (args.looks[0], args.looks[-1])
+    if args.coherence is not None and \
+            (args.coherence < 1 or args.coherence % 2 == 0):
+        parser.error('--coherence requires an odd positive window size.')
+    if args.goldstein is not None and not 0. <= args.goldstein <= 1.:
+        parser.error('--goldstein requires an exponent in [0, 1].')
+    if args.goldstein_patch < 8 or args.goldstein_patch % 8 != 0:
+        parser.error('--goldstein-patch requires a positive multiple of 8.')
+    if args.belt_window < 1 or args.belt_window % 2 == 0:
+        parser.error('--belt-window requires an odd positive window size.')
+    if not 0 <= args.min_days <= args.max_days:
+        parser.error('--min-days and --max-days must satisfy '
+                     '0 <= MIN_DAYS <= MAX_DAYS.')
 
-    # - Extract Interferogram name from file name
-    name_1 = file_1.replace('ICEYE-phase_geo-', '')[:17]
-    name_2 = file_2.replace('ICEYE-phase_geo-', '')[:17]
+    cache_args = ()
+    if args.raster_cache is not None:
+        cache_args = (int(args.raster_cache * 2**20),)
+        enable_raster_cache(*cache_args)
 
-    # - Load InSAR phase
-    # - Input interferogram 1
-    d_inter1_input = load_raster(os.path.join(args.directory, file_1))
-    interf_1 = d_inter1_input['data']
+    if args.network is not None:
+        scenes = args.scenes
+        if scenes is None:
+            scenes = sorted(os.path.basename(f) for f in glob.glob(
+                os.path.join(args.directory, ICEYE_PREFIX + '*.tif')))
+        process_network([strip_tif(sc) for sc in scenes], args.directory,
+                        args.outdir, mode=args.network,
+                        mem_limit=args.mem_limit)
+        return
 
-    # - Input interferogram 2
-    d_inter2_input = load_raster(os.path.join(args.directory, file_2))
-    interf_2 = d_inter2_input['data']
+    # - Processing options shared by all the pairs
+    options = (args.directory, args.outdir, args.stream,
+               args.tile_size, args.workers, args.align, args.resampling,
+               args.cog, not args.no_plot, looks, args.coherence,
+               args.goldstein, args.goldstein_patch, args.unwrap,
+               args.fringe_belt, args.belt_window, args.ref_area,
+               args.zonal_stats, args.zone_field)
 
-    # - Convert interferometric phase [-pi, +pi] to complex polar format
-    cmp_phase_1 = np.exp(1j * interf_1)
-    cmp_phase_2 = np.exp(1j * interf_2)
+    # - Pair processing function - with or without result cache
+    pair_func = process_pair
+    if args.result_cache is not None:
+        pair_func = partial(process_pair_cached,
+                            ResultCache(args.result_cache,
+                                        int(args.result_cache_size * 2**20),
+                                        digest=args.cache_digest),
+                            args.force)
 
-    # - Compute Differential Interferogram
-    dd_phase_complex = np.angle(cmp_phase_1 * np.conj(cmp_phase_2))
+    if args.pairs is None and not args.watch:
+        if args.reference is None or args.secondary is None:
+            parser.error('reference and secondary interferograms are '
+                         'required when --pairs/--watch are not used.')
+        status = pair_func(args.reference, args.secondary, *options)
+        if status is not None:
+            print(f'# - Result cache: {status}')
+        return
 
-    # - Create Output directory
-    out_dir = make_dir(args.directory, args.outdir)
-
-    # - Output figure parameters
-    fig_size = (15, 5)
-    fig_format = 'jpeg'
-    dpi = 200
-    # - Initialize figure object
-    fig = plt.figure(figsize=fig_size, dpi=dpi)
-    # - Input Interferogram 1
-    ax_1 = fig.add_subplot(1, 3, 1)
-    ax_1.set_title(name_1, weight='bold')
-    im_1 = ax_1.imshow(interf_1, vmin=-np.pi, vmax=np.pi,
-                       cmap=plt.get_cmap('jet'))
-    ax_1.grid(color='k', linestyle='dotted', alpha=0.3)
-    cb_1 = add_colorbar(fig, ax_1, im_1)
-    cb_1.set_label(label='Rad', weight='bold')
-    cb_1.ax.tick_params(labelsize='medium')
-    cb_1.ax.set_xticks([-np.pi, 0, np.pi])
-    cb_1.ax.set_xticklabels(['-$\pi$', '0', r'$\pi$'])
-
-    # - Input Interferogram 2
-    ax_2 = fig.add_subplot(1, 3, 2)
-    ax_2.set_title(name_2, weight='bold')
-    im_2 = ax_2.imshow(interf_2, vmin=-np.pi, vmax=np.pi,
-                       cmap=plt.get_cmap('jet'))
-    ax_2.grid(color='k', linestyle='dotted', alpha=0.3)
-    cb_2 = add_colorbar(fig, ax_2, im_2)
-    cb_2.set_label(label='Rad', weight='bold')
-    cb_2.ax.tick_params(labelsize='medium')
-    cb_2.ax.set_xticks([-np.pi, 0, np.pi])
-    cb_2.ax.set_xticklabels(['-$\pi$', '0', r'$\pi$'])
-
-    # - Differential Interferogram
-    ax_3 = fig.add_subplot(1, 3, 3)
-    ax_3.set_title('Double Difference', weight='bold')
-    im_3 = ax_3.imshow(dd_phase_complex, vmin=-np.pi, vmax=np.pi,
-                       cmap=plt.get_cmap('jet'))
-    ax_3.grid(color='k', linestyle='dotted', alpha=0.3)
-    cb_3 = add_colorbar(fig, ax_3, im_3)
-    cb_3.set_label(label='Rad', weight='bold')
-    cb_3.ax.tick_params(labelsize='medium')
-    cb_3.ax.set_xticks([-np.pi, 0, np.pi])
-    cb_3.ax.set_xticklabels(['-$\pi$', '0', r'$\pi$'])
-
-    plt.tight_layout()
-    plt.savefig(
-        os.path.join(out_dir, f'{name_1}-{name_2}.' + fig_format),
-        dpi=dpi, format=fig_format)
-    plt.close()
+    def process_batch(pairs: list) -> list:
+        """
+        Process a list of pairs across a pool of processes and print the
+        batch summary
+        """
+        summary = run_batch(pair_func, [(*p, *options) for p in pairs],
+                            processes=args.processes,
+                            max_in_flight=args.max_in_flight,
+                            initializer=enable_raster_cache if cache_args
+                            else None, initargs=cache_args)
+        print(f'{"reference":<40}{"secondary":<40}{"status":>8}'
+              f'{"time [s]":>10}')
+        for s_job in summary:
+            print(f'{s_job["job"][0]:<40}{s_job["job"][1]:<40}'
+                  f'{s_job["status"]:>8}{s_job["time"]:>10.2f}')
+            if s_job['error']:
+                print(f'    {s_job["error"]}')
+        n_failed = sum(s_job['status'] != 'ok' for s_job in summary)
+        print(f'# - Processed pairs: {len(summary)} - Failed: {n_failed}')
+        if args.result_cache is not None:
+            n_hits = sum(s_job['output'] == 'hit' for s_job in summary)
+            print(f'# - Result cache hits: {n_hits}')
+        if cache_args and args.processes <= 1:
+            print(f'# - Raster cache: {get_raster_cache().stats()}')
+        return summary
+
+    # - Watch mode - process the new pairs delivered to the data directory
+    if args.watch:
+        try:
+            watch_directory(
+                args.directory, process_batch,
+                os.path.join(args.directory, CATALOG_NAME),
+                os.path.join(make_dir(args.directory, args.outdir),
+                             'watch_done.csv'),
+                interval=args.poll, settle=args.settle,
+                min_days=args.min_days, max_days=args.max_days,
+                min_overlap=args.min_overlap)
+        except KeyboardInterrupt:
+            print('# - Watch mode interrupted.')
+        return
+
+    # - Batch mode - process all the pairs listed in the manifest
+    summary = process_batch(read_pair_manifest(args.pairs))
+    write_batch_summary(summary, os.path.join(
+        make_dir(args.directory, args.outdir), 'batch_summary.csv'))
 
 
 # - run main program
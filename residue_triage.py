@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+u"""
+residue_triage.py
+Written by agent (10/2026)
+
+Triage a set of wrapped phase rasters (input interferograms or double
+differences) by their phase-residue density. Residues are computed tile by
+tile from the sum of the wrapped differences around every 2x2 loop of
+pixels, and per-tile residue counts are collected in the same pass.
+Rasters are processed across a pool of processes.
+
+Two CSV files are saved in the output directory:
+    residue_triage.csv - one row per raster: total residues, density and
+        number of tiles exceeding the selected density threshold.
+    residue_tiles.csv - one row per tile of each raster.
+
+usage: residue_triage.py [-h] [--directory DIRECTORY] [--outdir OUTDIR]
+       [--tile-size TILE_SIZE] [--workers WORKERS] [--processes PROCESSES]
+       [--max-in-flight MAX_IN_FLIGHT] [--threshold THRESHOLD]
+       [--save-maps] [scenes ...]
+
+positional arguments:
+  scenes                Wrapped phase rasters to triage [default: all the
+                        ICEYE-phase_geo-*.tif files in DIRECTORY].
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --directory DIRECTORY, -D DIRECTORY
+                        Project data directory.
+  --outdir OUTDIR, -O OUTDIR
+                        Output directory.
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels].
+  --workers WORKERS, -W WORKERS
+                        Number of threads used to process the tiles of
+                        each raster.
+  --processes PROCESSES, -P PROCESSES
+                        Number of processes.
+  --max-in-flight MAX_IN_FLIGHT
+                        Maximum number of rasters processed at the same
+                        time [default: PROCESSES].
+  --threshold THRESHOLD
+                        Residue density [residues/loop] above which a tile
+                        is flagged.
+  --save-maps           Save the residue map of each raster (int8 GeoTIFF).
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    datetime: Basic date and time types
+           https://docs.python.org/3/library/datetime.html
+    rasterio: access to geospatial raster data
+           https://rasterio.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import csv
+import glob
+import argparse
+from datetime import datetime
+from utils.make_dir import make_dir
+from utils.scene_names import strip_tif, ICEYE_PREFIX
+from utils.batch import run_batch
+from utils.residues import residue_raster
+
+# - Per-tile statistics saved in residue_tiles.csv
+TILE_FIELDS = ['row_off', 'col_off', 'loops', 'positive', 'negative',
+               'density']
+
+
+def triage_scene(in_path: str, tile_size: int = 1024, workers: int = 1,
+                 map_path: str = None) -> list:
+    """
+    Residue statistics of a wrapped phase raster
+    :param in_path: absolute path to the input phase GeoTIFF
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :param map_path: absolute path to the output residue map - None: not
+        saved
+    :return: list of per-tile statistics - see utils.residues
+    """
+    return residue_raster(in_path, out_path=map_path, tile_size=tile_size,
+                          workers=workers)
+
+
+def scene_summary(t_stats: list, threshold: float) -> dict:
+    """
+    Summarize the per-tile statistics of a raster
+    :param t_stats: list of per-tile statistics
+    :param threshold: residue density threshold [residues/loop]
+    :return: dictionary - loops, residues, density, max tile density and
+        number of flagged tiles
+    """
+    loops = sum(t['loops'] for t in t_stats)
+    residues = sum(t['positive'] + t['negative'] for t in t_stats)
+    densities = [t['density'] for t in t_stats if t['loops'] > 0]
+    return {'loops': loops, 'residues': residues,
+            'density': residues / loops if loops else float('nan'),
+            'max_tile_density': max(densities, default=float('nan')),
+            'flagged_tiles': sum(d > threshold for d in densities)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Triage wrapped phase rasters by their phase-residue
+        density."""
+    )
+    parser.add_argument('scenes', type=str, nargs='*',
+                        help='Wrapped phase rasters to triage.')
+    # - Absolute Path to directory containing input data.
+    default_dir = os.path.join('/', 'Volumes', 'Extreme Pro',
+                               'Peterman_glacier_X7_subset')
+    parser.add_argument('--directory', '-D',
+                        type=lambda p: os.path.abspath(os.path.expanduser(p)),
+                        default=default_dir,
+                        help='Project data directory.')
+    parser.add_argument('--outdir', '-O', type=str, default='output_test',
+                        help='Output directory.')
+    parser.add_argument('--tile-size', '-T', type=int, default=1024,
+                        help='Tile side [pixels].')
+    parser.add_argument('--workers', '-W', type=int, default=1,
+                        help='Number of threads used to process the tiles '
+                             'of each raster.')
+    parser.add_argument('--processes', '-P', type=int, default=1,
+                        help='Number of processes.')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='Maximum number of rasters processed at the '
+                             'same time [default: PROCESSES].')
+    parser.add_argument('--threshold', type=float, default=0.01,
+                        help='Residue density [residues/loop] above which '
+                             'a tile is flagged.')
+    parser.add_argument('--save-maps', action='store_true',
+                        help='Save the residue map of each raster.')
+    args = parser.parse_args()
+
+    scenes = args.scenes
+    if not scenes:
+        scenes = sorted(os.path.basename(f) for f in glob.glob(
+            os.path.join(args.directory, ICEYE_PREFIX + '*.tif')))
+    scenes = [strip_tif(sc) for sc in scenes]
+    out_dir = make_dir(args.directory, args.outdir)
+
+    jobs = [(os.path.join(args.directory, sc + '.tif'), args.tile_size,
+             args.workers,
+             os.path.join(out_dir, f'{os.path.basename(sc)}_residues.tif')
+             if args.save_maps else None) for sc in scenes]
+    summary = run_batch(triage_scene, jobs, processes=args.processes,
+                        max_in_flight=args.max_in_flight)
+
+    # - Triage summary
+    print(f'{"scene":<50}{"residues":>10}{"density":>10}{"flagged":>9}')
+    with open(os.path.join(out_dir, 'residue_triage.csv'), 'w',
+              newline='') as f_sum, \
+            open(os.path.join(out_dir, 'residue_tiles.csv'), 'w',
+                 newline='') as f_tile:
+        w_sum = csv.writer(f_sum)
+        w_sum.writerow(['scene', 'loops', 'residues', 'density',
+                        'max_tile_density', 'flagged_tiles', 'status',
+                        'time_s', 'error'])
+        w_tile = csv.writer(f_tile)
+        w_tile.writerow(['scene', *TILE_FIELDS])
+        for sc, s_job in zip(scenes, summary):
+            if s_job['status'] != 'ok':
+                print(f'{sc:<50}{s_job["status"]:>29}\n    {s_job["error"]}')
+                w_sum.writerow([sc, '', '', '', '', '', s_job['status'],
+                                f"{s_job['time']:.3f}", s_job['error']])
+                continue
+            s_scene = scene_summary(s_job['output'], args.threshold)
+            print(f'{sc:<50}{s_scene["residues"]:>10}'
+                  f'{s_scene["density"]:>10.4f}'
+                  f'{s_scene["flagged_tiles"]:>9}')
+            w_sum.writerow([sc, s_scene['loops'], s_scene['residues'],
+                            f"{s_scene['density']:.6f}",
+                            f"{s_scene['max_tile_density']:.6f}",
+                            s_scene['flagged_tiles'], s_job['status'],
+                            f"{s_job['time']:.3f}", ''])
+            for t_stats in s_job['output']:
+                w_tile.writerow([sc, *[t_stats[f] for f in TILE_FIELDS]])
+
+
+# - run main program
+if __name__ == '__main__':
+    start_time = datetime.now()
+    main()
+    end_time = datetime.now()
+    print(f'# - Computation Time: {end_time - start_time}')
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+u"""
+sbas_inversion.py
+Written by agent (10/2026)
+
+Per-pixel least-squares (SBAS-style) inversion of a network of unwrapped
+phase rasters - interferograms or double differences (e.g. the
+*_unwrapped.tif files produced by read_ee_phase.py --unwrap).
+The nodes connected by each raster are read from its file name:
+    ICEYE-phase_geo-<YYYYMMDD>_<YYYYMMDD>[...].tif - acquisition dates
+    <YYYYMMDD>_<YYYYMMDD>-<YYYYMMDD>_<YYYYMMDD>[...].tif - interferograms
+Each raster measures the phase of its first node minus the phase of its
+second node - the convention of read_ee_phase.py, which computes the double
+difference as wrap(phi_ref - phi_sec). The phase of the first node (in
+chronological order) is set to zero.
+
+The inversion is computed tile by tile: pixels sharing the same set of
+valid edges are inverted together with one matrix multiply by the
+pseudo-inverse of the design matrix restricted to those edges.
+
+Output (saved in OUTDIR):
+    <NAME>_<NODE>.tif - phase of each node [rad] w.r.t. the first node
+    <NAME>_rms.tif    - RMS of the least-squares residuals [rad]
+
+usage: sbas_inversion.py [-h] [--directory DIRECTORY] [--outdir OUTDIR]
+       [--name NAME] [--tile-size TILE_SIZE] [--workers WORKERS]
+       rasters [rasters ...]
+
+positional arguments:
+  rasters               Unwrapped phase rasters - file names within
+                        DIRECTORY or glob patterns.
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --directory DIRECTORY, -D DIRECTORY
+                        Project data directory.
+  --outdir OUTDIR, -O OUTDIR
+                        Output directory.
+  --name NAME, -N NAME  Output file name prefix.
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels].
+  --workers WORKERS, -W WORKERS
+                        Number of threads used to process tiles.
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    datetime: Basic date and time types
+           https://docs.python.org/3/library/datetime.html
+    rasterio: access to geospatial raster data
+           https://rasterio.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import argparse
+from datetime import datetime
+from utils.make_dir import make_dir
+from utils.file_patterns import expand_patterns
+from utils.scene_names import edge_nodes
+from utils.sbas import design_matrix, sbas_rasters
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Per-pixel least-squares inversion of a network of
+        unwrapped phase rasters."""
+    )
+    parser.add_argument('rasters', type=str, nargs='+',
+                        help='Unwrapped phase rasters - file names within '
+                             'DIRECTORY or glob patterns.')
+    # - Absolute Path to directory containing input data.
+    default_dir = os.path.join('/', 'Volumes', 'Extreme Pro',
+                               'Peterman_glacier_X7_subset')
+    parser.add_argument('--directory', '-D',
+                        type=lambda p: os.path.abspath(os.path.expanduser(p)),
+                        default=default_dir,
+                        help='Project data directory.')
+    parser.add_argument('--outdir', '-O', type=str, default='output_test',
+                        help='Output directory.')
+    parser.add_argument('--name', '-N', type=str, default='sbas',
+                        help='Output file name prefix.')
+    parser.add_argument('--tile-size', '-T', type=int, default=1024,
+                        help='Tile side [pixels].')
+    parser.add_argument('--workers', '-W', type=int, default=1,
+                        help='Number of threads used to process tiles.')
+    args = parser.parse_args()
+
+    # - Expand glob patterns - relative to the data directory
+    try:
+        in_paths = expand_patterns(args.directory, args.rasters)
+    except FileNotFoundError as err:
+        parser.error(str(err))
+    edges = [edge_nodes(p) for p in in_paths]
+    d_matrix, nodes = design_matrix(edges)
+    print(f'# - Network: {len(edges)} edges - {len(nodes)} nodes '
+          f'(reference: {nodes[0]}).')
+
+    out_dir = make_dir(args.directory, args.outdir)
+    inverses = sbas_rasters(
+        in_paths, edges,
+        {node: os.path.join(out_dir, f'{args.name}_{node}.tif')
+         for node in nodes[1:]},
+        rms_path=os.path.join(out_dir, f'{args.name}_rms.tif'),
+        tile_size=args.tile_size, workers=args.workers)
+    print(f'# - Validity patterns inverted: {len(inverses)}')
+
+
+# - run main program
+if __name__ == '__main__':
+    start_time = datetime.now()
+    main()
+    end_time = datetime.now()
+    print(f'# - Computation Time: {end_time - start_time}')
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+u"""
+scene_catalog.py
+Written by agent (10/2026)
+
+Build/update the SQLite catalog of the interferograms available in the
+project data directory. Only the raster headers are read: acquisition
+dates, bounds, CRS, resolution, size, data type, no-data value and file
+size are stored in the catalog. Later scans are incremental - only new or
+modified files are read again and deleted files are removed. Files whose
+header cannot be read are reported, recorded as failed and skipped until
+they are modified.
+
+usage: scene_catalog.py [-h] [--directory DIRECTORY] [--catalog CATALOG]
+       [--pattern PATTERN] [--list] [--start START] [--end END]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --directory DIRECTORY, -D DIRECTORY
+                        Project data directory.
+  --catalog CATALOG, -C CATALOG
+                        SQLite catalog [default:
+                        DIRECTORY/scene_catalog.sqlite].
+  --pattern PATTERN     Glob pattern of the rasters to catalog.
+  --list                List the cataloged interferograms.
+  --start START         List only interferograms with reference date
+                        >= START (YYYYMMDD).
+  --end END             List only interferograms with secondary date
+                        <= END (YYYYMMDD).
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    datetime: Basic date and time types
+           https://docs.python.org/3/library/datetime.html
+    sqlite3: DB-API 2.0 interface for SQLite databases
+           https://docs.python.org/3/library/sqlite3.html
+    rasterio: access to geospatial raster data
+           https://rasterio.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import argparse
+from datetime import datetime
+from utils.scene_names import ICEYE_PREFIX
+from utils.catalog import open_catalog, scan_directory, query_scenes, \
+    CATALOG_NAME
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Build/update the catalog of the interferograms
+        available in the project data directory."""
+    )
+    # - Absolute Path to directory containing input data.
+    default_dir = os.path.join('/', 'Volumes', 'Extreme Pro',
+                               'Peterman_glacier_X7_subset')
+    parser.add_argument('--directory', '-D',
+                        type=lambda p: os.path.abspath(os.path.expanduser(p)),
+                        default=default_dir,
+                        help='Project data directory.')
+    parser.add_argument('--catalog', '-C', type=str, default=None,
+                        help='SQLite catalog [default: '
+                             'DIRECTORY/scene_catalog.sqlite].')
+    parser.add_argument('--pattern', type=str, default=ICEYE_PREFIX + '*.tif',
+                        help='Glob pattern of the rasters to catalog.')
+    parser.add_argument('--list', action='store_true',
+                        help='List the cataloged interferograms.')
+    parser.add_argument('--start', type=str, default=None,
+                        help='List only interferograms with reference '
+                             'date >= START (YYYYMMDD).')
+    parser.add_argument('--end', type=str, default=None,
+                        help='List only interferograms with secondary '
+                             'date <= END (YYYYMMDD).')
+    args = parser.parse_args()
+
+    db_path = args.catalog if args.catalog is not None \
+        else os.path.join(args.directory, CATALOG_NAME)
+    conn = open_catalog(db_path)
+    try:
+        summary = scan_directory(conn, args.directory, pattern=args.pattern)
+        print(f'# - Catalog: {db_path}')
+        print('# - ' + ' - '.join(f'{key}: {val}'
+                                  for key, val in summary.items()))
+        if args.list:
+            print(f'{"name":<45}{"dates":>19}{"size":>12}{"res":>8}'
+                  f'{"epsg":>7}')
+            for rec in query_scenes(conn, directory=args.directory,
+                                    start=args.start, end=args.end):
+                print(f'{rec["name"]:<45}'
+                      f'{rec["date_ref"] or "":>9}_{rec["date_sec"] or "":<9}'
+                      f'{rec["width"]:>6}x{rec["height"]:<5}'
+                      f'{rec["res_x"]:>8.1f}{rec["epsg"] or "":>7}')
+    finally:
+        conn.close()
+
+
+# - run main program
+if __name__ == '__main__':
+    start_time = datetime.now()
+    main()
+    end_time = datetime.now()
+    print(f'# - Computation Time: {end_time - start_time}')
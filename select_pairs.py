@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+u"""
+select_pairs.py
+Written by agent (10/2026)
+
+Select the pairs of interferograms to process by temporal separation and
+spatial overlap. The selection uses the scene catalog only (see
+scene_catalog.py) - the rasters are never opened. The catalog is updated
+(incremental scan) before the selection unless --no-scan is used.
+
+Two interferograms are paired if they share the same CRS and pixel size,
+if the separation between their reference dates is within [MIN_DAYS,
+MAX_DAYS] and if their footprints overlap by at least MIN_OVERLAP (fraction
+of the smaller footprint).
+
+The selected pairs are saved as a CSV manifest that can be processed with:
+    read_ee_phase.py --pairs MANIFEST
+
+usage: select_pairs.py [-h] [--directory DIRECTORY] [--catalog CATALOG]
+       [--min-days MIN_DAYS] [--max-days MAX_DAYS]
+       [--min-overlap MIN_OVERLAP] [--start START] [--end END]
+       [--output OUTPUT] [--no-scan] [--verbose]
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --directory DIRECTORY, -D DIRECTORY
+                        Project data directory.
+  --catalog CATALOG, -C CATALOG
+                        SQLite catalog [default:
+                        DIRECTORY/scene_catalog.sqlite].
+  --min-days MIN_DAYS   Minimum separation between reference dates [days].
+  --max-days MAX_DAYS   Maximum separation between reference dates [days].
+  --min-overlap MIN_OVERLAP
+                        Minimum footprint overlap [0-1].
+  --start START         Use only interferograms with reference date
+                        >= START (YYYYMMDD).
+  --end END             Use only interferograms with secondary date
+                        <= END (YYYYMMDD).
+  --output OUTPUT, -o OUTPUT
+                        Output manifest [default:
+                        DIRECTORY/selected_pairs.csv].
+  --no-scan             Do not update the catalog before the selection.
+  --verbose, -V         List the selected pairs.
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    datetime: Basic date and time types
+           https://docs.python.org/3/library/datetime.html
+    sqlite3: DB-API 2.0 interface for SQLite databases
+           https://docs.python.org/3/library/sqlite3.html
+    shapely: Manipulation and analysis of geometric objects
+           https://shapely.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import time
+import argparse
+from datetime import datetime
+from utils.catalog import open_catalog, scan_directory, query_scenes, \
+    CATALOG_NAME
+from utils.pair_selection import select_pairs
+from utils.pair_manifest import write_pair_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Select the pairs of interferograms to process by
+        temporal separation and spatial overlap."""
+    )
+    # - Absolute Path to directory containing input data.
+    default_dir = os.path.join('/', 'Volumes', 'Extreme Pro',
+                               'Peterman_glacier_X7_subset')
+    parser.add_argument('--directory', '-D',
+                        type=lambda p: os.path.abspath(os.path.expanduser(p)),
+                        default=default_dir,
+                        help='Project data directory.')
+    parser.add_argument('--catalog', '-C', type=str, default=None,
+                        help='SQLite catalog [default: '
+                             'DIRECTORY/scene_catalog.sqlite].')
+    parser.add_argument('--min-days', type=int, default=1,
+                        help='Minimum separation between reference dates '
+                             '[days].')
+    parser.add_argument('--max-days', type=int, default=4,
+                        help='Maximum separation between reference dates '
+                             '[days].')
+    parser.add_argument('--min-overlap', type=float, default=0.6,
+                        help='Minimum footprint overlap [0-1].')
+    parser.add_argument('--start', type=str, default=None,
+                        help='Use only interferograms with reference '
+                             'date >= START (YYYYMMDD).')
+    parser.add_argument('--end', type=str, default=None,
+                        help='Use only interferograms with secondary '
+                             'date <= END (YYYYMMDD).')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='Output manifest [default: '
+                             'DIRECTORY/selected_pairs.csv].')
+    parser.add_argument('--no-scan', action='store_true',
+                        help='Do not update the catalog before the '
+                             'selection.')
+    parser.add_argument('--verbose', '-V', action='store_true',
+                        help='List the selected pairs.')
+    args = parser.parse_args()
+
+    if not 0 <= args.min_days <= args.max_days:
+        parser.error('--min-days and --max-days must satisfy '
+                     '0 <= MIN_DAYS <= MAX_DAYS.')
+
+    db_path = args.catalog if args.catalog is not None \
+        else os.path.join(args.directory, CATALOG_NAME)
+    conn = open_catalog(db_path)
+    try:
+        if not args.no_scan:
+            summary = scan_directory(conn, args.directory)
+            print('# - Catalog: ' + ' - '.join(
+                f'{key}: {val}' for key, val in summary.items()))
+        records = query_scenes(conn, directory=args.directory,
+                               start=args.start, end=args.end)
+    finally:
+        conn.close()
+
+    t_start = time.perf_counter()
+    pairs = select_pairs(records, min_days=args.min_days,
+                         max_days=args.max_days, min_overlap=args.min_overlap)
+    t_select = time.perf_counter() - t_start
+    print(f'# - Interferograms: {len(records)} - Selected pairs: '
+          f'{len(pairs)} ({t_select:.3f} s)')
+    if args.verbose:
+        print(f'{"reference":<40}{"secondary":<40}{"days":>6}'
+              f'{"overlap":>9}')
+        for pair in pairs:
+            print(f'{pair["reference"]:<40}{pair["secondary"]:<40}'
+                  f'{pair["days"]:>6}{pair["overlap"]:>9.3f}')
+
+    out_path = args.output if args.output is not None \
+        else os.path.join(args.directory, 'selected_pairs.csv')
+    write_pair_manifest([(p['reference'], p['secondary']) for p in pairs],
+                        out_path)
+    print(f'# - Manifest: {out_path}')
+
+
+# - run main program
+if __name__ == '__main__':
+    start_time = datetime.now()
+    main()
+    end_time = datetime.now()
+    print(f'# - Computation Time: {end_time - start_time}')
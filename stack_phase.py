@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+u"""
+stack_phase.py
+Written by agent (10/2026)
+
+Circular-mean stack of an arbitrary number of wrapped phase rasters (e.g.
+double differences computed with read_ee_phase.py). The complex phasor sum
+and the number of valid inputs are accumulated tile by tile, so that memory
+is bounded by one tile-sized accumulator plus one input tile.
+
+Output (saved in OUTDIR):
+    <NAME>_mean.tif    - mean phase [rad]
+    <NAME>_length.tif  - resultant length [0, 1]
+    <NAME>_count.tif   - number of valid inputs per pixel
+
+usage: stack_phase.py [-h] [--directory DIRECTORY] [--outdir OUTDIR]
+       [--name NAME] [--tile-size TILE_SIZE] [--workers WORKERS]
+       [--min-count MIN_COUNT] rasters [rasters ...]
+
+positional arguments:
+  rasters               Wrapped phase rasters to stack - file names within
+                        DIRECTORY or glob patterns (e.g. "output/*.tif").
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --directory DIRECTORY, -D DIRECTORY
+                        Project data directory.
+  --outdir OUTDIR, -O OUTDIR
+                        Output directory.
+  --name NAME, -N NAME  Output file name prefix.
+  --tile-size TILE_SIZE, -T TILE_SIZE
+                        Tile side [pixels].
+  --workers WORKERS, -W WORKERS
+                        Number of threads used to process tiles.
+  --min-count MIN_COUNT
+                        Minimum number of valid inputs per pixel.
+
+PYTHON DEPENDENCIES:
+    argparse: Parser for command-line options, arguments and sub-commands
+           https://docs.python.org/3/library/argparse.html
+    datetime: Basic date and time types
+           https://docs.python.org/3/library/datetime.html
+    rasterio: access to geospatial raster data
+           https://rasterio.readthedocs.io
+"""
+# - Python Dependencies
+from __future__ import print_function
+import os
+import argparse
+from datetime import datetime
+from utils.make_dir import make_dir
+from utils.file_patterns import expand_patterns
+from utils.stacking import stack_rasters
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Circular-mean stack of wrapped phase rasters."""
+    )
+    parser.add_argument('rasters', type=str, nargs='+',
+                        help='Wrapped phase rasters to stack - file names '
+                             'within DIRECTORY or glob patterns.')
+    # - Absolute Path to directory containing input data.
+    default_dir = os.path.join('/', 'Volumes', 'Extreme Pro',
+                               'Peterman_glacier_X7_subset')
+    parser.add_argument('--directory', '-D',
+                        type=lambda p: os.path.abspath(os.path.expanduser(p)),
+                        default=default_dir,
+                        help='Project data directory.')
+    parser.add_argument('--outdir', '-O', type=str, default='output_test',
+                        help='Output directory.')
+    parser.add_argument('--name', '-N', type=str, default='stack',
+                        help='Output file name prefix.')
+    parser.add_argument('--tile-size', '-T', type=int, default=1024,
+                        help='Tile side [pixels].')
+    parser.add_argument('--workers', '-W', type=int, default=1,
+                        help='Number of threads used to process tiles.')
+    parser.add_argument('--min-count', type=int, default=1,
+                        help='Minimum number of valid inputs per pixel.')
+    args = parser.parse_args()
+
+    # - Expand glob patterns - relative to the data directory
+    try:
+        in_paths = expand_patterns(args.directory, args.rasters)
+    except FileNotFoundError as err:
+        parser.error(str(err))
+    print(f'# - Stacking {len(in_paths)} rasters.')
+
+    out_dir = make_dir(args.directory, args.outdir)
+    stack_rasters(in_paths,
+                  os.path.join(out_dir, f'{args.name}_mean.tif'),
+                  os.path.join(out_dir, f'{args.name}_length.tif'),
+                  count_path=os.path.join(out_dir, f'{args.name}_count.tif'),
+                  tile_size=args.tile_size, workers=args.workers,
+                  min_count=args.min_count)
+
+
+# - run main program
+if __name__ == '__main__':
+    start_time = datetime.now()
+    main()
+    end_time = datetime.now()
+    print(f'# - Computation Time: {end_time - start_time}')
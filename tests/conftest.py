@@ -0,0 +1,8 @@
+"""
+agent 10/2026
+Make the repository modules importable from the tests.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,86 @@
+"""
+agent 10/2026
+Incremental scans of the scene catalog with unreadable and unmatched files.
+"""
+import os
+import time
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+from utils.raster_io import geotiff_profile
+from utils.catalog import open_catalog, scan_directory, query_scenes, \
+    SCENE_FAILED
+
+
+def write_scene(out_path: str, age: float = 3600.) -> None:
+    """
+    Write a small phase raster modified age seconds ago
+    """
+    profile = geotiff_profile('EPSG:3413', from_origin(0., 40., 10., 10.),
+                              4, 4, blocksize=16)
+    with rasterio.open(out_path, 'w', **profile) as dst:
+        dst.write(np.zeros((4, 4), dtype=np.float32), 1)
+    set_age(out_path, age)
+
+
+def write_corrupt(out_path: str, age: float = 3600.) -> None:
+    """
+    Write an empty file modified age seconds ago
+    """
+    open(out_path, 'wb').close()
+    set_age(out_path, age)
+
+
+def set_age(in_path: str, age: float) -> None:
+    """
+    Set the modification time of a file to age seconds ago
+    """
+    m_time = time.time() - age
+    os.utime(in_path, (m_time, m_time))
+
+
+def test_scan_corrupt_file(tmp_path):
+    directory = str(tmp_path)
+    write_scene(os.path.join(directory,
+                             'ICEYE-phase_geo-20210101_20210102.tif'))
+    bad_path = os.path.join(directory, 'ICEYE-phase_geo-20210102_20210103.tif')
+    write_corrupt(bad_path)
+    conn = open_catalog(os.path.join(directory, 'catalog.sqlite'))
+    try:
+        with pytest.warns(UserWarning, match='20210102_20210103'):
+            summary = scan_directory(conn, directory, min_age=30.)
+        assert summary['added'] == 1 and summary['failed'] == 1
+        assert [r['name'] for r in query_scenes(conn, directory)] \
+            == ['ICEYE-phase_geo-20210101_20210102']
+        status, error = conn.execute('SELECT status, error FROM scenes '
+                                     'WHERE path = ?', (bad_path,)).fetchone()
+        assert status == SCENE_FAILED and error
+        # - the failed file is not read again until it changes
+        summary = scan_directory(conn, directory, min_age=30.)
+        assert summary['unchanged'] == 2 and summary['failed'] == 0
+        write_scene(bad_path, age=60.)
+        summary = scan_directory(conn, directory, min_age=30.)
+        assert summary['updated'] == 1
+        assert len(query_scenes(conn, directory)) == 2
+    finally:
+        conn.close()
+
+
+def test_scan_keeps_unmatched_files(tmp_path):
+    directory = str(tmp_path)
+    in_path = os.path.join(directory, 'ICEYE-phase_geo-20210101_20210102.tif')
+    write_scene(in_path)
+    conn = open_catalog(os.path.join(directory, 'catalog.sqlite'))
+    try:
+        assert scan_directory(conn, directory)['added'] == 1
+        # - existing files not matching the pattern are kept
+        assert scan_directory(conn, directory,
+                              pattern='other-*.tif')['removed'] == 0
+        assert len(query_scenes(conn, directory)) == 1
+        # - deleted files matching the pattern are removed
+        os.remove(in_path)
+        assert scan_directory(conn, directory)['removed'] == 1
+        assert query_scenes(conn, directory) == []
+    finally:
+        conn.close()
@@ -0,0 +1,24 @@
+"""
+agent 10/2026
+Automatic pair selection from catalog records.
+"""
+from utils.pair_selection import select_pairs
+
+
+def scene_record(name: str, date_ref: str, date_sec: str,
+                 res: float) -> dict:
+    """
+    Catalog record of a 10 km x 10 km footprint
+    """
+    return {'name': name, 'date_ref': date_ref, 'date_sec': date_sec,
+            'crs': 'EPSG:3413', 'left': 0., 'bottom': 0., 'right': 1e4,
+            'top': 1e4, 'res_x': res, 'res_y': res}
+
+
+def test_pairs_share_pixel_size():
+    records = [scene_record('a', '20210101', '20210102', 10.),
+               scene_record('b', '20210102', '20210103', 20.),
+               scene_record('c', '20210103', '20210104', 10.)]
+    pairs = select_pairs(records, min_days=1, max_days=4)
+    # - the 20 m scene is not paired with the 10 m scenes
+    assert [(p['reference'], p['secondary']) for p in pairs] == [('a', 'c')]
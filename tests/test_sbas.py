@@ -0,0 +1,61 @@
+"""
+agent 10/2026
+Least-squares inversion of a synthetic chain of double differences built
+with the sign convention of read_ee_phase.py.
+"""
+import os
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+from utils.phase_ops import phase_difference
+from utils.raster_io import geotiff_profile
+from utils.scene_names import edge_nodes
+from utils.sbas import design_matrix, sbas_rasters
+
+# - Interferograms (nodes) and their phase [rad] - one value per pixel
+NODES = ['20210101_20210102', '20210102_20210103', '20210103_20210104',
+         '20210104_20210105']
+NODE_PHASE = {node: np.float32(k * 0.4 - 0.3) + np.linspace(
+    0., 0.2 * k, 12, dtype=np.float32).reshape(3, 4)
+    for k, node in enumerate(NODES)}
+
+
+def double_difference(name_1: str, name_2: str) -> np.ndarray:
+    """
+    Double difference as computed by read_ee_phase.py - reference minus
+    secondary interferogram
+    """
+    return phase_difference(NODE_PHASE[name_1], NODE_PHASE[name_2])
+
+
+def test_design_matrix_sign():
+    d_matrix, nodes = design_matrix([(NODES[1], NODES[2])])
+    assert nodes == NODES[1:3]
+    # - edge = first node - second node; the first node is the reference
+    np.testing.assert_array_equal(d_matrix, [[-1.]])
+
+
+def test_sbas_chain(tmp_path):
+    pairs = [(NODES[0], NODES[1]), (NODES[1], NODES[2]),
+             (NODES[2], NODES[3]), (NODES[0], NODES[2])]
+    profile = geotiff_profile('EPSG:3413', from_origin(0., 30., 10., 10.),
+                              4, 3, blocksize=16)
+    in_paths = []
+    for name_1, name_2 in pairs:
+        in_paths.append(os.path.join(tmp_path,
+                                     f'{name_1}-{name_2}_unwrapped.tif'))
+        with rasterio.open(in_paths[-1], 'w', **profile) as dst:
+            dst.write(double_difference(name_1, name_2), 1)
+    edges = [edge_nodes(p) for p in in_paths]
+    assert edges == pairs
+    out_paths = {node: os.path.join(tmp_path, f'sbas_{node}.tif')
+                 for node in NODES}
+    sbas_rasters(in_paths, edges, out_paths,
+                 rms_path=os.path.join(tmp_path, 'sbas_rms.tif'))
+    for node in NODES[1:]:
+        with rasterio.open(out_paths[node]) as src:
+            np.testing.assert_allclose(
+                src.read(1), NODE_PHASE[node] - NODE_PHASE[NODES[0]],
+                atol=1e-5)
+    with rasterio.open(os.path.join(tmp_path, 'sbas_rms.tif')) as src:
+        assert np.all(src.read(1) < 1e-5)
@@ -0,0 +1,39 @@
+"""
+agent 10/2026
+Watch mode with an unreadable raster in the watched directory.
+"""
+import os
+import warnings
+import pytest
+from utils.watch import watch_directory, read_done_manifest
+from test_catalog import write_scene, write_corrupt
+
+
+def test_watch_corrupt_file(tmp_path):
+    directory = str(tmp_path)
+    names = ('ICEYE-phase_geo-20210101_20210102',
+             'ICEYE-phase_geo-20210102_20210103')
+    for name in names:
+        write_scene(os.path.join(directory, f'{name}.tif'))
+    write_corrupt(os.path.join(directory,
+                               'ICEYE-phase_geo-20210103_20210104.tif'))
+    batches = []
+
+    def process_batch(pairs):
+        batches.append(pairs)
+        return [{'job': (*pair, None), 'status': 'ok'} for pair in pairs]
+
+    db_path = os.path.join(directory, 'catalog.sqlite')
+    done_path = os.path.join(directory, 'done.csv')
+    # - the corrupt file is reported and does not stop the polls
+    with pytest.warns(UserWarning, match='20210103_20210104'):
+        watch_directory(directory, process_batch, db_path, done_path,
+                        interval=0., settle=30., max_polls=2)
+    assert batches == [[names]]
+    assert read_done_manifest(done_path) == {names}
+    # - after a restart the corrupt file is not read again
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        watch_directory(directory, process_batch, db_path, done_path,
+                        interval=0., settle=30., max_polls=1)
+    assert batches == [[names]]
@@ -0,0 +1,88 @@
+"""
+agent 10/2026
+Run a list of independent jobs across a pool of processes.
+
+Each worker process pays Python, matplotlib and GDAL startup only once.
+The number of jobs submitted to the pool - and therefore the number of
+rasters loaded in memory at the same time - is bounded by max_in_flight.
+"""
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable
+
+
+def timed_call(func: Callable, args: tuple) -> tuple:
+    """
+    Execute a job and measure its wall-clock time
+    :param func: job function
+    :param args: job positional arguments
+    :return: (status, elapsed time [s], error message, job output)
+    """
+    t_start = time.perf_counter()
+    output = None
+    try:
+        output = func(*args)
+        status, error = 'ok', ''
+    except Exception as exc:
+        status, error = 'failed', f'{type(exc).__name__}: {exc}'
+    return status, time.perf_counter() - t_start, error, output
+
+
+def run_batch(func: Callable, jobs: list, processes: int = 1,
+              max_in_flight: int = None, initializer: Callable = None,
+              initargs: tuple = ()) -> list:
+    """
+    Run a list of jobs across a pool of processes
+    :param func: job function - must be defined at module level
+    :param jobs: list of tuples of positional arguments passed to func
+    :param processes: number of worker processes
+    :param max_in_flight: maximum number of submitted jobs [default: processes]
+    :param initializer: function executed once by each worker process
+    :param initargs: arguments passed to initializer
+    :return: list of job summaries - dict(job, status, time, error,
+        output) - following the order of jobs. output is the value
+        returned by func (None if the job failed)
+    """
+    results = [None] * len(jobs)
+    if processes <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for j, job in enumerate(jobs):
+            results[j] = timed_call(func, job)
+    else:
+        if max_in_flight is None:
+            max_in_flight = processes
+        with ProcessPoolExecutor(max_workers=processes,
+                                 initializer=initializer,
+                                 initargs=initargs) as executor:
+            pending = {}
+            job_iter = iter(enumerate(jobs))
+            while True:
+                for j, job in job_iter:
+                    pending[executor.submit(timed_call, func, job)] = j
+                    if len(pending) >= max_in_flight:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+    return [{'job': job, 'status': r[0], 'time': r[1], 'error': r[2],
+             'output': r[3]} for job, r in zip(jobs, results)]
+
+
+def write_batch_summary(summary: list, out_path: str) -> None:
+    """
+    Save batch summary in CSV format
+    :param summary: list of job summaries returned by run_batch
+    :param out_path: absolute path to the output CSV file
+    :return: None
+    """
+    with open(out_path, 'w', newline='') as f_out:
+        writer = csv.writer(f_out)
+        writer.writerow(['reference', 'secondary', 'status',
+                         'time_s', 'error'])
+        for s_job in summary:
+            writer.writerow([*s_job['job'][:2], s_job['status'],
+                             f"{s_job['time']:.3f}", s_job['error']])
@@ -0,0 +1,216 @@
+"""
+agent 10/2026
+SQLite catalog of the interferograms available in a data directory.
+
+The catalog stores, for each raster, the acquisition dates parsed from the
+file name and the information found in the raster header only - CRS,
+bounds, resolution, size, data type and no-data value - together with the
+file size and modification time. Scans are incremental: the header of a
+file is read again only if the file is new or its size/modification time
+changed, and the records of deleted files are removed.
+
+Files whose header cannot be read (e.g. truncated or corrupt) are recorded
+with status 'failed' and the reading error, so that a single bad file
+neither aborts the scan nor is read again until it changes. Queries return
+only the scenes read successfully.
+
+Queries on the catalog (e.g. pair selection and processing planning) never
+need to open the rasters.
+"""
+import os
+import glob
+import time
+import fnmatch
+import sqlite3
+import warnings
+from datetime import datetime
+import rasterio
+from rasterio.errors import RasterioError
+from utils.scene_names import interferogram_dates, strip_tif, ICEYE_PREFIX
+
+# - Catalog default file name - saved in the data directory
+CATALOG_NAME = 'scene_catalog.sqlite'
+
+# - Scene status - header read successfully or unreadable file
+SCENE_OK, SCENE_FAILED = 'ok', 'failed'
+
+# - Catalog columns and SQLite types
+COLUMNS = [
+    ('path', 'TEXT PRIMARY KEY'), ('directory', 'TEXT'), ('name', 'TEXT'),
+    ('date_ref', 'TEXT'), ('date_sec', 'TEXT'), ('crs', 'TEXT'),
+    ('epsg', 'INTEGER'), ('left', 'REAL'), ('bottom', 'REAL'),
+    ('right', 'REAL'), ('top', 'REAL'), ('res_x', 'REAL'), ('res_y', 'REAL'),
+    ('width', 'INTEGER'), ('height', 'INTEGER'), ('count', 'INTEGER'),
+    ('dtype', 'TEXT'), ('nodata', 'REAL'), ('file_size', 'INTEGER'),
+    ('mtime_ns', 'INTEGER'), ('scanned_at', 'TEXT'),
+    ('status', f"TEXT DEFAULT '{SCENE_OK}'"), ('error', 'TEXT'),
+]
+
+
+def open_catalog(db_path: str) -> sqlite3.Connection:
+    """
+    Open (create if needed) a scene catalog
+    :param db_path: absolute path to the SQLite catalog
+    :return: sqlite3 connection - rows returned as sqlite3.Row
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute('CREATE TABLE IF NOT EXISTS scenes ('
+                 + ', '.join(f'"{c}" {t}' for c, t in COLUMNS) + ')')
+    # - add the columns missing from catalogs created by older versions
+    existing = {row['name'] for row in
+                conn.execute('PRAGMA table_info(scenes)')}
+    for column, c_type in COLUMNS:
+        if column not in existing:
+            conn.execute(f'ALTER TABLE scenes ADD COLUMN "{column}" {c_type}')
+    conn.execute('CREATE INDEX IF NOT EXISTS scenes_dates '
+                 'ON scenes (date_ref, date_sec)')
+    return conn
+
+
+def read_header(in_path: str) -> dict:
+    """
+    Read the catalog record of a raster - header only
+    :param in_path: absolute path to the raster
+    :return: dictionary containing the catalog columns
+    """
+    f_stat = os.stat(in_path)
+    try:
+        date_ref, date_sec = interferogram_dates(in_path)
+    except ValueError:
+        date_ref, date_sec = None, None
+    with rasterio.open(in_path) as src:
+        crs = src.crs
+        return {'path': os.path.abspath(in_path),
+                'directory': os.path.dirname(os.path.abspath(in_path)),
+                'name': strip_tif(os.path.basename(in_path)),
+                'date_ref': date_ref, 'date_sec': date_sec,
+                'crs': None if crs is None else crs.to_wkt(),
+                'epsg': None if crs is None else crs.to_epsg(),
+                'left': src.bounds.left, 'bottom': src.bounds.bottom,
+                'right': src.bounds.right, 'top': src.bounds.top,
+                'res_x': src.res[0], 'res_y': src.res[1],
+                'width': src.width, 'height': src.height,
+                'count': src.count, 'dtype': src.dtypes[0],
+                'nodata': src.nodata, 'file_size': f_stat.st_size,
+                'mtime_ns': f_stat.st_mtime_ns,
+                'scanned_at': datetime.now().isoformat(timespec='seconds'),
+                'status': SCENE_OK, 'error': None}
+
+
+def failed_record(in_path: str, error: Exception) -> dict:
+    """
+    Catalog record of a raster whose header cannot be read
+    :param in_path: absolute path to the raster
+    :param error: reading error
+    :return: dictionary containing the catalog columns - header columns
+        set to None
+    """
+    f_stat = os.stat(in_path)
+    try:
+        date_ref, date_sec = interferogram_dates(in_path)
+    except ValueError:
+        date_ref, date_sec = None, None
+    record = dict.fromkeys(c for c, _ in COLUMNS)
+    record.update({'path': os.path.abspath(in_path),
+                   'directory': os.path.dirname(os.path.abspath(in_path)),
+                   'name': strip_tif(os.path.basename(in_path)),
+                   'date_ref': date_ref, 'date_sec': date_sec,
+                   'file_size': f_stat.st_size,
+                   'mtime_ns': f_stat.st_mtime_ns,
+                   'scanned_at': datetime.now().isoformat(
+                       timespec='seconds'),
+                   'status': SCENE_FAILED, 'error': str(error)})
+    return record
+
+
+def scan_directory(conn: sqlite3.Connection, directory: str,
+                   pattern: str = ICEYE_PREFIX + '*.tif',
+                   min_age: float = 0.) -> dict:
+    """
+    Update the catalog with the rasters found in a directory
+    :param conn: catalog connection - see open_catalog
+    :param directory: absolute path to the data directory
+    :param pattern: glob pattern of the rasters to catalog
+    :param min_age: minimum time [s] since the last modification - files
+        modified more recently (e.g. still being copied) are left as they
+        are in the catalog and scanned again later
+    :return: dictionary - number of added, updated, removed, unchanged,
+        pending (too recent) and failed (unreadable header) records
+    """
+    directory = os.path.abspath(directory)
+    known = {row['path']: (row['file_size'], row['mtime_ns'])
+             for row in conn.execute('SELECT path, file_size, mtime_ns '
+                                     'FROM scenes WHERE directory = ?',
+                                     (directory,))}
+    summary = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0,
+               'pending': 0, 'failed': 0}
+    found = set()
+    # - NOTE: column names are quoted - left/right are SQL keywords
+    insert = 'INSERT OR REPLACE INTO scenes ({}) VALUES ({})'.format(
+        ', '.join(f'"{c}"' for c, _ in COLUMNS), ', '.join('?' * len(COLUMNS)))
+    t_limit = time.time_ns() - int(min_age * 1e9)
+    with conn:
+        for in_path in sorted(glob.glob(os.path.join(directory, pattern))):
+            in_path = os.path.abspath(in_path)
+            try:
+                f_stat = os.stat(in_path)
+            except FileNotFoundError:
+                # - deleted after the directory listing
+                continue
+            found.add(in_path)
+            if known.get(in_path) == (f_stat.st_size, f_stat.st_mtime_ns):
+                summary['unchanged'] += 1
+                continue
+            if f_stat.st_mtime_ns > t_limit:
+                summary['pending'] += 1
+                continue
+            try:
+                record = read_header(in_path)
+            except (RasterioError, OSError) as err:
+                # - unreadable file - recorded as failed and read again
+                # - only once modified
+                warnings.warn(f'Unable to read the header of {in_path}: '
+                              f'{err}')
+                try:
+                    record = failed_record(in_path, err)
+                except FileNotFoundError:
+                    continue
+                summary['failed'] += 1
+            else:
+                summary['updated' if in_path in known else 'added'] += 1
+            conn.execute(insert, [record[c] for c, _ in COLUMNS])
+        # - remove only the records of files matching the pattern and no
+        # - longer found on disk
+        removed = [(p,) for p in known if p not in found
+                   and fnmatch.fnmatch(os.path.relpath(p, directory),
+                                       pattern)
+                   and not os.path.exists(p)]
+        conn.executemany('DELETE FROM scenes WHERE path = ?', removed)
+        summary['removed'] = len(removed)
+    return summary
+
+
+def query_scenes(conn: sqlite3.Connection, directory: str = None,
+                 start: str = None, end: str = None) -> list:
+    """
+    Query the catalog
+    :param conn: catalog connection - see open_catalog
+    :param directory: data directory - None: all the directories
+    :param start: earliest reference date - <YYYYMMDD> - None: no limit
+    :param end: latest secondary date - <YYYYMMDD> - None: no limit
+    :return: list of records (dict) sorted by acquisition dates - files
+        whose header cannot be read are not returned
+    """
+    query, params = 'SELECT * FROM scenes WHERE status = ?', [SCENE_OK]
+    if directory is not None:
+        query += ' AND directory = ?'
+        params.append(os.path.abspath(directory))
+    if start is not None:
+        query += ' AND date_ref >= ?'
+        params.append(start)
+    if end is not None:
+        query += ' AND date_sec <= ?'
+        params.append(end)
+    query += ' ORDER BY date_ref, date_sec, name'
+    return [dict(row) for row in conn.execute(query, params)]
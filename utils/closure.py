@@ -0,0 +1,198 @@
+"""
+agent 10/2026
+Phase closure of triplets of interferograms.
+
+Given three acquisitions a < b < c and the interferograms a-b, b-c and a-c,
+the closure phase:
+    phi_abc = w(phi_ab + phi_bc - phi_ac)
+is zero for a consistent network and measures the non-closing (e.g.
+decorrelation or processing) errors otherwise.
+
+Triplets are enumerated from the edges (pairs of acquisition dates) of the
+available interferograms. Interferograms stored with reversed orientation
+(<later>_<earlier>) are used with their phase negated. Closure phases are
+computed tile by tile: at each tile pass every raster used by at least one
+triplet is decoded exactly once into a (n_rasters, rows, cols) stack, and
+the closure phases of all the triplets are computed with a single batched
+operation on the stack.
+
+As for the network double differences (utils.network), the closure phases
+are saved in groups of at most max_open triplets, so that the number of
+open output GeoTIFFs stays below the limit on open files - the triplet
+count of an all-pairs network grows with the cube of the number of
+acquisitions. The rasters used by each group are decoded once per group.
+"""
+import numpy as np
+import rasterio
+from utils.phase_ops import phase_difference
+from utils.tiling import tile_windows, run_tiles
+from utils.raster_io import geotiff_profile
+from utils.double_diff import common_grid, shift_window, valid_mask, NODATA
+from utils.network import MAX_OPEN_OUTPUTS
+
+
+def closure_triplets(edges: list) -> list:
+    """
+    Enumerate the closed triplets of a network of interferograms
+    :param edges: list of (reference date, secondary date) tuples - one
+        per interferogram
+    :return: (list of (i_ab, i_bc, i_ac) tuples of indices of edges,
+        list of (s_ab, s_bc, s_ac) tuples of edge signs - +1: edge stored
+        as earlier_later, -1: edge stored as later_earlier)
+    """
+    index = {}
+    for k, (d_a, d_b) in enumerate(edges):
+        index.setdefault((min(d_a, d_b), max(d_a, d_b)), k)
+
+    def sign(k):
+        return 1 if edges[k][0] <= edges[k][1] else -1
+
+    # - adjacency - later acquisitions linked to each date
+    later = {}
+    for d_a, d_b in index:
+        later.setdefault(d_a, []).append(d_b)
+    triplets = []
+    for (d_a, d_b), i_ab in sorted(index.items()):
+        for d_c in sorted(later.get(d_b, [])):
+            if (d_a, d_c) in index:
+                triplets.append((i_ab, index[(d_b, d_c)], index[(d_a, d_c)]))
+    return triplets, [tuple(sign(k) for k in triplet) for triplet in triplets]
+
+
+def closure_phase(stack: np.ndarray, valid: np.ndarray,
+                  triplets: np.ndarray, signs: np.ndarray = None) \
+        -> np.ndarray:
+    """
+    Closure phases of a set of triplets - single batched operation
+    :param stack: wrapped phase [rad] - np.ndarray (n_rasters, rows, cols)
+    :param valid: boolean mask of valid pixels - same shape as stack
+    :param triplets: np.ndarray (n_triplets, 3) of stack indices
+        (i_ab, i_bc, i_ac)
+    :param signs: np.ndarray (n_triplets, 3) of edge signs (+1/-1) - see
+        closure_triplets - None: all the edges stored as earlier_later
+    :return: closure phases [rad] - np.ndarray (n_triplets, rows, cols)
+        (float32) - NaN where any of the three interferograms is not valid
+    """
+    i_ab, i_bc, i_ac = triplets.T
+    if signs is None:
+        closure = np.add(stack[i_ab], stack[i_bc], dtype=np.float32)
+        phase_difference(closure, stack[i_ac], out=closure)
+    else:
+        s_ab, s_bc, s_ac = signs.astype(np.float32).T[:, :, None, None]
+        closure = np.add(s_ab * stack[i_ab], s_bc * stack[i_bc],
+                         dtype=np.float32)
+        phase_difference(closure, s_ac * stack[i_ac], out=closure)
+    closure[~(valid[i_ab] & valid[i_bc] & valid[i_ac])] = np.nan
+    return closure
+
+
+def network_closures(in_paths: list, triplets: list, signs: list = None,
+                     out_paths: list = None, tile_size: int = 1024,
+                     workers: int = 1,
+                     max_open: int = MAX_OPEN_OUTPUTS) -> list:
+    """
+    Compute the closure phases of the triplets of a network tile by tile
+    :param in_paths: absolute paths to the input interferograms
+    :param triplets: list of (i_ab, i_bc, i_ac) tuples - see
+        closure_triplets
+    :param signs: list of (s_ab, s_bc, s_ac) edge signs - see
+        closure_triplets - None: all the edges stored as earlier_later
+    :param out_paths: absolute path to the output GeoTIFF of each triplet -
+        None: closure phases not saved
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :param max_open: maximum number of output GeoTIFFs open at the same
+        time
+    :return: list of closure statistics - dict(valid, mean_abs, rms) [rad] -
+        one per triplet
+    """
+    # - Compute the grid covering the overlapping area of all the rasters
+    # - used by at least one triplet - headers only
+    used = sorted({k for triplet in triplets for k in triplet})
+    srcs = [rasterio.open(in_paths[k]) for k in used]
+    try:
+        offsets, transform, width, height = common_grid(srcs)
+        crs = srcs[0].crs
+    finally:
+        for src in srcs:
+            src.close()
+    offsets = dict(zip(used, offsets))
+    profile = geotiff_profile(crs, transform, width, height, nodata=NODATA)
+    # - triplets processed in groups of at most max_open saved outputs
+    g_size = len(triplets) if out_paths is None else max_open
+    stats = []
+    for g_start in range(0, len(triplets), max(g_size, 1)):
+        g_slice = slice(g_start, g_start + g_size)
+        stats.extend(_closure_group(
+            in_paths, triplets[g_slice],
+            None if signs is None else signs[g_slice],
+            None if out_paths is None else out_paths[g_slice], offsets,
+            profile, tile_size=tile_size, workers=workers))
+    return stats
+
+
+def _closure_group(in_paths: list, triplets: list, signs: list,
+                   out_paths: list, offsets: dict, profile: dict,
+                   tile_size: int = 1024, workers: int = 1) -> list:
+    """
+    Compute the closure phases of a group of triplets tile by tile
+    :param in_paths: absolute paths to the input interferograms
+    :param triplets: list of (i_ab, i_bc, i_ac) tuples
+    :param signs: list of (s_ab, s_bc, s_ac) edge signs - None: all the
+        edges stored as earlier_later
+    :param out_paths: absolute path to the output GeoTIFF of each triplet -
+        None: closure phases not saved
+    :param offsets: window of the common grid within each interferogram
+    :param profile: output raster profile
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :return: list of closure statistics - see network_closures
+    """
+    # - rasters used by at least one triplet of the group - stack indices
+    used = sorted({k for triplet in triplets for k in triplet})
+    s_index = {k: s for s, k in enumerate(used)}
+    s_triplets = np.array([[s_index[k] for k in triplet]
+                           for triplet in triplets], dtype=np.intp)
+    s_signs = None if signs is None else np.array(signs, dtype=np.int8)
+
+    def process(window):
+        # - decode each raster once per tile pass
+        stack = np.empty((len(used), window.height, window.width),
+                         dtype=np.float32)
+        valid = np.empty(stack.shape, dtype=bool)
+        for s, k in enumerate(used):
+            with rasterio.open(in_paths[k]) as src:
+                stack[s] = src.read(1,
+                                    window=shift_window(window, offsets[k]))
+                valid[s] = valid_mask(stack[s], src.nodata)
+        return closure_phase(stack, valid, s_triplets, signs=s_signs)
+
+    # - closure statistics accumulated over the tiles
+    n_valid = np.zeros(len(triplets), dtype=np.int64)
+    sum_abs = np.zeros(len(triplets), dtype=np.float64)
+    sum_sq = np.zeros(len(triplets), dtype=np.float64)
+    dsts = []
+    try:
+        if out_paths is not None:
+            for out_path in out_paths:
+                dsts.append(rasterio.open(out_path, 'w', **profile))
+
+        def write(window, closure):
+            c_valid = np.isfinite(closure)
+            c_abs = np.where(c_valid, np.abs(closure), 0.)
+            n_valid[:] += c_valid.sum(axis=(1, 2))
+            sum_abs[:] += c_abs.sum(axis=(1, 2), dtype=np.float64)
+            sum_sq[:] += (c_abs ** 2).sum(axis=(1, 2), dtype=np.float64)
+            closure[~c_valid] = NODATA
+            for dst, t_closure in zip(dsts, closure):
+                dst.write(t_closure, 1, window=window)
+
+        run_tiles(tile_windows(profile['width'], profile['height'],
+                               tile_size), process, write, workers=workers)
+    finally:
+        for dst in dsts:
+            dst.close()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return [{'valid': int(n), 'mean_abs': s_a / n,
+                 'rms': np.sqrt(s_q / n)}
+                for n, s_a, s_q in zip(n_valid, sum_abs, sum_sq)]
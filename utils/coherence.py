@@ -0,0 +1,86 @@
+"""
+agent 10/2026
+Phase consistency (coherence) of a wrapped phase field.
+
+The coherence of the double difference is estimated as the magnitude of the
+mean unit-complex phasor within a sliding window centred on each pixel:
+    coh = |sum(exp(1j * phase))| / N
+Window sums are computed from integral images (cumulative sums) so that the
+cost per pixel does not depend on the window size. Windows are truncated at
+the raster edges.
+
+The coherence can be computed tile by tile from a double difference saved
+in GeoTIFF format: each tile is read with a halo of half a window, so that
+the tiled result matches the one obtained on the whole raster.
+"""
+import numpy as np
+from utils.tiling import map_raster
+
+
+def box_sum(data: np.ndarray, half_window: tuple) -> np.ndarray:
+    """
+    Sum of the values within a sliding window centred on each pixel
+    computed from the integral image of the input array
+    :param data: input array - np.ndarray
+    :param half_window: window half size - (rows, columns). The window
+        covers 2 * half_window + 1 pixels along each axis.
+    :return: window sums - np.ndarray (float64)
+    """
+    n_rows, n_cols = data.shape
+    h_rows, h_cols = half_window
+    # - integral image with a leading row/column of zeros
+    integral = np.zeros((n_rows + 1, n_cols + 1), dtype=np.float64)
+    np.cumsum(data, axis=0, dtype=np.float64, out=integral[1:, 1:])
+    np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+    # - window limits - truncated at the array edges
+    r_0 = np.clip(np.arange(n_rows) - h_rows, 0, n_rows)
+    r_1 = np.clip(np.arange(n_rows) + h_rows + 1, 0, n_rows)
+    c_0 = np.clip(np.arange(n_cols) - h_cols, 0, n_cols)
+    c_1 = np.clip(np.arange(n_cols) + h_cols + 1, 0, n_cols)
+    return (integral[np.ix_(r_1, c_1)] - integral[np.ix_(r_0, c_1)]
+            - integral[np.ix_(r_1, c_0)] + integral[np.ix_(r_0, c_0)])
+
+
+def phase_coherence(phase: np.ndarray, window: int = 5,
+                    valid: np.ndarray = None) -> np.ndarray:
+    """
+    Magnitude of the windowed mean unit-complex phasor
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param window: window side [pixels] - odd number
+    :param valid: optional boolean mask of valid pixels - NaN values are
+        always considered invalid
+    :return: coherence [0, 1] - np.ndarray (float32) - NaN where the
+        central pixel is not valid
+    """
+    half = (window // 2, window // 2)
+    v_mask = np.isfinite(phase)
+    if valid is not None:
+        v_mask &= valid
+    # - unit-complex phasor - real and imaginary parts
+    re_part = np.cos(phase, dtype=np.float32)
+    im_part = np.sin(phase, dtype=np.float32)
+    re_part[~v_mask] = 0.
+    im_part[~v_mask] = 0.
+    count = box_sum(v_mask, half)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        coherence = (np.hypot(box_sum(re_part, half), box_sum(im_part, half))
+                     / count).astype(np.float32)
+    coherence[~v_mask] = np.nan
+    return coherence
+
+
+def coherence_raster(in_path: str, out_path: str, window: int = 5,
+                     tile_size: int = 1024, workers: int = 1) -> None:
+    """
+    Compute the coherence of a wrapped phase raster tile by tile
+    :param in_path: absolute path to the input phase GeoTIFF
+    :param out_path: absolute path to the output coherence GeoTIFF
+    :param window: window side [pixels] - odd number
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :return: None
+    """
+    map_raster(in_path, [out_path],
+               lambda phase, valid: phase_coherence(phase, window,
+                                                    valid=valid),
+               halo=window // 2, tile_size=tile_size, workers=workers)
@@ -0,0 +1,334 @@
+"""
+agent 10/2026
+Streaming computation of the double difference between two coregistered
+interferograms saved in GeoTIFF format.
+
+The reference and secondary interferograms are read one tile at a time,
+the wrapped phase difference of each tile is computed with the float32
+kernel available in utils.phase_ops, and the result is written straight to
+the output GeoTIFF. Peak memory depends on the selected tile size and not
+on the size of the scene. Tiles can be read and processed concurrently by a
+pool of threads, while the output is always written in row-major order.
+
+The two interferograms can cover different areas: the double difference is
+computed on the intersection of their footprints only. The intersection is
+derived from the raster headers, and only the matching windows are read
+from each file.
+
+If the secondary interferogram is defined on a different grid (origin,
+resolution or CRS), it can be aligned on the fly to the reference grid:
+the secondary is wrapped in a rasterio WarpedVRT targeting the reference
+pixels within the overlapping area and is resampled window by window,
+without writing intermediate files to disk.
+For more info about virtual warping see:
+https://rasterio.readthedocs.io/en/latest/topics/virtual-warping.html
+
+The double difference can be multilooked tile by tile: the output grid is
+coarser than the input grid by the selected number of looks, and each
+output tile is computed from the matching block of input pixels.
+
+The constant offset of the double difference can be removed by subtracting
+its circular mean phase over a stable reference area (polygons stored in a
+shapefile). The reference area is rasterized once per output grid - see
+utils.shape_masks - within the bounding window of the area only, and the
+circular mean is accumulated tile by tile over that window, before the
+main pass.
+
+The output can be saved as a Cloud-Optimized GeoTIFF (COG). The COG driver
+cannot be written window by window, therefore the tiles are first written
+to a temporary tiled GeoTIFF which is then converted to COG.
+"""
+import os
+import math
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+from rasterio.vrt import WarpedVRT
+from rasterio.enums import Resampling
+from rasterio.warp import transform_bounds
+from rasterio.transform import Affine
+from utils.phase_ops import phase_difference, multilook, phasor_sums, \
+    subtract_phase
+from utils.tiling import tile_windows, run_tiles
+from utils.raster_io import geotiff_profile, convert_to_cog
+from utils.shape_masks import shape_window_mask
+
+# - Output no-data value
+NODATA = -9999.
+
+
+def common_grid(srcs: list, tol: float = 1e-6) -> tuple:
+    """
+    Compute the grid covering the intersection of the footprints of a set
+    of rasters sharing the same CRS, resolution and pixel alignment
+    :param srcs: list of rasterio datasets
+    :param tol: tolerance on pixel alignment [fraction of a pixel]
+    :return: (list of windows - one per dataset - covering the intersection,
+        intersection transform, intersection width, intersection height)
+    """
+    ref = srcs[0]
+    for src in srcs[1:]:
+        if src.crs != ref.crs or not np.allclose(src.res, ref.res):
+            raise ValueError(f'{ref.name} and {src.name} do not share the '
+                             f'same CRS and resolution.')
+    # - footprint intersection
+    left = max(src.bounds.left for src in srcs)
+    right = min(src.bounds.right for src in srcs)
+    bottom = max(src.bounds.bottom for src in srcs)
+    top = min(src.bounds.top for src in srcs)
+    if left >= right or bottom >= top:
+        raise ValueError('The selected rasters do not overlap.')
+    width = int(round((right - left) / ref.res[0]))
+    height = int(round((top - bottom) / ref.res[1]))
+    windows = []
+    for src in srcs:
+        # - intersection upper-left corner in pixel coordinates
+        col_off, row_off = ~src.transform * (left, top)
+        if abs(col_off - round(col_off)) > tol \
+                or abs(row_off - round(row_off)) > tol:
+            raise ValueError(f'{ref.name} and {src.name} are not aligned '
+                             f'on the same pixel grid.')
+        windows.append(Window(int(round(col_off)), int(round(row_off)),
+                              width, height))
+    return windows, ref.window_transform(windows[0]), width, height
+
+
+def shift_window(window, offset) -> Window:
+    """
+    Shift a window defined on the intersection grid to a source raster
+    :param window: window on the intersection grid
+    :param offset: window of the intersection on the source raster
+    :return: rasterio Window on the source raster
+    """
+    return Window(window.col_off + offset.col_off,
+                  window.row_off + offset.row_off,
+                  window.width, window.height)
+
+
+def pair_grid(ref, sec, align: bool = False, resampling: str = 'nearest',
+              tol: float = 1e-6) -> dict:
+    """
+    Define the output grid of the double difference between two rasters
+    :param ref: reference rasterio dataset
+    :param sec: secondary rasterio dataset
+    :param align: align the secondary to the reference grid if the two
+        rasters are not defined on the same pixel grid
+    :param resampling: resampling algorithm used to align the secondary
+        NOTE: interpolating wrapped phase across fringes is not meaningful,
+              nearest neighbour is used by default.
+    :param tol: tolerance on pixel alignment [fraction of a pixel]
+    :return: dictionary containing the output grid (transform, width,
+        height), the reference/secondary windows on the output grid and the
+        WarpedVRT options used to read the secondary (None if not needed)
+    """
+    try:
+        (w_ref, w_sec), transform, width, height = common_grid([ref, sec])
+        return {'transform': transform, 'width': width, 'height': height,
+                'ref_window': w_ref, 'sec_window': w_sec, 'sec_vrt': None}
+    except ValueError:
+        if not align:
+            raise
+    # - footprint of the secondary in the reference CRS
+    left, bottom, right, top = transform_bounds(sec.crs, ref.crs,
+                                                *sec.bounds)
+    # - reference pixels entirely within the overlapping area
+    col_0, row_0 = ~ref.transform * (max(left, ref.bounds.left),
+                                     min(top, ref.bounds.top))
+    col_1, row_1 = ~ref.transform * (min(right, ref.bounds.right),
+                                     max(bottom, ref.bounds.bottom))
+    col_0, row_0 = math.ceil(col_0 - tol), math.ceil(row_0 - tol)
+    width = math.floor(col_1 + tol) - col_0
+    height = math.floor(row_1 + tol) - row_0
+    if width <= 0 or height <= 0:
+        raise ValueError('The selected rasters do not overlap.')
+    w_ref = Window(col_0, row_0, width, height)
+    transform = ref.window_transform(w_ref)
+    # - Virtual Warping Options
+    vrt_options = {'crs': ref.crs, 'transform': transform,
+                   'width': width, 'height': height,
+                   'resampling': Resampling[resampling], 'nodata': NODATA}
+    if sec.nodata is not None:
+        vrt_options['src_nodata'] = sec.nodata
+    return {'transform': transform, 'width': width, 'height': height,
+            'ref_window': w_ref, 'sec_window': Window(0, 0, width, height),
+            'sec_vrt': vrt_options}
+
+
+def open_pair_grid(ref_path: str, sec_path: str, align: bool = False,
+                   resampling: str = 'nearest') -> dict:
+    """
+    Define the output grid of the double difference between two rasters
+    reading only the raster headers - see pair_grid
+    :param ref_path: absolute path to the reference raster
+    :param sec_path: absolute path to the secondary raster
+    :param align: align the secondary to the reference grid if needed
+    :param resampling: resampling algorithm used to align the secondary
+    :return: dictionary containing the output grid
+    """
+    with rasterio.open(ref_path) as ref, rasterio.open(sec_path) as sec:
+        return pair_grid(ref, sec, align=align, resampling=resampling)
+
+
+def read_tile(in_path: str, window, offset, vrt_options: dict = None) \
+        -> tuple:
+    """
+    Read a tile of the output grid from a source raster
+    :param in_path: absolute path to the source raster
+    :param window: window on the output grid
+    :param offset: window of the output grid on the source raster
+    :param vrt_options: WarpedVRT options - None: read the source directly
+    :return: (tile data, no-data value)
+    """
+    with rasterio.open(in_path) as src:
+        if vrt_options is None:
+            return (src.read(1, window=shift_window(window, offset)),
+                    src.nodata)
+        with WarpedVRT(src, **vrt_options) as vrt:
+            return (vrt.read(1, window=shift_window(window, offset)),
+                    vrt.nodata)
+
+
+def read_secondary(sec_path: str, grid: dict) -> np.ndarray:
+    """
+    Read the secondary interferogram over the whole output grid
+    :param sec_path: absolute path to the secondary interferogram
+    :param grid: output grid - see pair_grid
+    :return: secondary phase on the output grid - np.ndarray
+    """
+    window = Window(0, 0, grid['width'], grid['height'])
+    return read_tile(sec_path, window, grid['sec_window'],
+                     vrt_options=grid['sec_vrt'])[0]
+
+
+def valid_mask(data: np.ndarray, nodata) -> np.ndarray:
+    """
+    Find valid pixels of a phase tile
+    :param data: phase tile - np.ndarray
+    :param nodata: raster no-data value (can be None)
+    :return: boolean mask of valid pixels
+    """
+    valid = np.isfinite(data)
+    if nodata is not None and not np.isnan(nodata):
+        valid &= data != nodata
+    return valid
+
+
+def reference_offset(ref_path: str, sec_path: str, grid: dict,
+                     window: Window, mask: np.ndarray, tile_size: int = 1024,
+                     workers: int = 1) -> float:
+    """
+    Circular mean of the double difference over a reference area computed
+    tile by tile - only tiles within the bounding window of the area are read
+    :param ref_path: absolute path to the reference interferogram
+    :param sec_path: absolute path to the secondary interferogram
+    :param grid: output grid - see pair_grid
+    :param window: bounding window of the reference area on the output grid
+        - see utils.shape_masks.shape_window_mask
+    :param mask: boolean mask of the reference area within window
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :return: circular mean [rad]
+    """
+    if window is None or not mask.any():
+        raise ValueError('The reference area does not overlap the double '
+                         'difference.')
+    sums = [0., 0., 0]
+
+    def process(t_window):
+        rows, cols = t_window.toslices()
+        t_window = shift_window(t_window, window)
+        phase_1, nodata_1 = read_tile(ref_path, t_window, grid['ref_window'])
+        phase_2, nodata_2 = read_tile(sec_path, t_window, grid['sec_window'],
+                                      vrt_options=grid['sec_vrt'])
+        valid = valid_mask(phase_1, nodata_1) & valid_mask(phase_2, nodata_2)
+        return phasor_sums(phase_difference(phase_1, phase_2),
+                           mask=valid & mask[rows, cols])
+
+    def write(t_window, t_sums):
+        for i, val in enumerate(t_sums):
+            sums[i] += val
+
+    run_tiles(tile_windows(window.width, window.height, tile_size), process,
+              write, workers=workers)
+    if sums[2] == 0:
+        raise ValueError('No valid pixels found within the reference area.')
+    return float(np.arctan2(sums[1], sums[0]))
+
+
+def stream_double_difference(ref_path: str, sec_path: str, out_path: str,
+                             tile_size: int = 1024, workers: int = 1,
+                             align: bool = False, resampling: str = 'nearest',
+                             cog: bool = False,
+                             looks: tuple = (1, 1),
+                             ref_area: str = None) -> None:
+    """
+    Compute the double difference between two interferograms tile by tile
+    :param ref_path: absolute path to the reference interferogram
+    :param sec_path: absolute path to the secondary interferogram
+    :param out_path: absolute path to the output GeoTIFF
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :param align: align the secondary to the reference grid if needed
+    :param resampling: resampling algorithm used to align the secondary
+    :param cog: save the output as a Cloud-Optimized GeoTIFF
+    :param looks: number of looks - (rows, columns)
+    :param ref_area: absolute path to the shapefile of the reference area
+        used to remove the phase offset - None: no normalization
+    :return: None
+    """
+    n_rows, n_cols = looks
+    with rasterio.open(ref_path) as ref, rasterio.open(sec_path) as sec:
+        # - Compute the grid covering the overlapping area
+        grid = pair_grid(ref, sec, align=align, resampling=resampling)
+        # - Output grid - multilooked
+        width, height = grid['width'] // n_cols, grid['height'] // n_rows
+        transform = grid['transform'] * Affine.scale(n_cols, n_rows)
+        # - Output raster profile - tiled and compressed GeoTIFF
+        profile = geotiff_profile(ref.crs, transform, width, height,
+                                  nodata=NODATA)
+        # - Phase offset over the reference area - native grid
+        offset = None
+        if ref_area is not None:
+            ref_window, ref_mask = shape_window_mask(
+                ref_area, ref.crs, grid['transform'], grid['width'],
+                grid['height'])
+            offset = reference_offset(ref_path, sec_path, grid, ref_window,
+                                      ref_mask, tile_size=tile_size,
+                                      workers=workers)
+    # - output tiles - each one computed from n_rows x n_cols input tiles
+    windows = tile_windows(width, height,
+                           max(tile_size // max(n_rows, n_cols), 1))
+
+    def process(window):
+        # - input window corresponding to the output tile
+        in_window = Window(window.col_off * n_cols, window.row_off * n_rows,
+                           window.width * n_cols, window.height * n_rows)
+        # - Read tile from both interferograms
+        phase_1, nodata_1 = read_tile(ref_path, in_window,
+                                      grid['ref_window'])
+        phase_2, nodata_2 = read_tile(sec_path, in_window,
+                                      grid['sec_window'],
+                                      vrt_options=grid['sec_vrt'])
+        valid = valid_mask(phase_1, nodata_1) & valid_mask(phase_2, nodata_2)
+        # - Compute wrapped phase difference
+        dd_phase = phase_difference(phase_1, phase_2)
+        if offset is not None:
+            subtract_phase(dd_phase, offset)
+        if (n_rows, n_cols) != (1, 1):
+            dd_phase = multilook(dd_phase, looks, valid=valid)
+            valid = np.isfinite(dd_phase)
+        dd_phase[~valid] = NODATA
+        return dd_phase
+
+    tile_path = out_path + '.tiles.tif' if cog else out_path
+    with rasterio.open(tile_path, 'w', **profile) as dst:
+
+        def write(window, dd_phase):
+            dst.write(dd_phase, 1, window=window)
+
+        run_tiles(windows, process, write, workers=workers)
+
+    if cog:
+        # - Convert the tiled GeoTIFF into a Cloud-Optimized GeoTIFF
+        convert_to_cog(tile_path, out_path)
+        os.remove(tile_path)
@@ -0,0 +1,23 @@
+"""
+agent 10/2026
+Expand the glob patterns of the input files passed on the command line.
+"""
+import os
+import glob
+
+
+def expand_patterns(directory: str, patterns: list) -> list:
+    """
+    Expand glob patterns relative to a data directory
+    :param directory: absolute path to the data directory
+    :param patterns: list of file names or glob patterns
+    :return: list of absolute paths - matches of each pattern are sorted,
+        patterns are expanded in order and duplicates are removed
+    """
+    in_paths = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.join(directory, pattern)))
+        if not matches:
+            raise FileNotFoundError(f'No rasters found matching: {pattern}')
+        in_paths.update(dict.fromkeys(matches))
+    return list(in_paths)
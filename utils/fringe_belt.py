@@ -0,0 +1,120 @@
+"""
+agent 10/2026
+Fringe-belt (tidal flexure / grounding zone) detection from the wrapped
+phase gradient of a double difference.
+
+The double difference cancels the steady ice flow signal and leaves the
+differential tidal displacement: the floating ice tongue moves rigidly,
+while the fringes concentrate in the flexure zone close to the grounding
+line. The belt is therefore located where the phase gradient is large.
+
+The gradient is computed from wrapped finite differences - the phase is
+never unwrapped:
+    d_row[i] = [w(phi[i + 1] - phi[i]) + w(phi[i] - phi[i - 1])] / 2
+and analogously along the columns; one-sided differences are used at the
+raster edges and next to invalid pixels. The gradient magnitude [rad/pixel]
+is averaged within a sliding window (integral-image box sums, see
+utils.coherence) and thresholded to obtain the fringe-belt mask.
+
+Full scenes are processed tile by tile with the tiled engine used to
+compute the double difference (utils.tiling): tiles are read with a halo
+of half a window plus one pixel, so that the tiled result matches the one
+obtained on the whole raster.
+"""
+import numpy as np
+from utils.phase_ops import phase_difference
+from utils.coherence import box_sum
+from utils.tiling import map_raster
+from utils.double_diff import NODATA
+
+# - Fringe-belt mask values
+BELT, OUTSIDE, MASK_NODATA = 1, 0, 255
+
+
+def wrapped_gradient(phase: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Wrapped phase gradient along one axis - central differences
+    :param phase: wrapped phase [rad] - np.ndarray - NaN where not valid
+    :param axis: gradient axis - 0: rows, 1: columns
+    :return: phase gradient [rad/pixel] - np.ndarray (float32) - NaN
+        where no valid neighbour is found
+    """
+    phase = np.moveaxis(phase, axis, 0)
+    gradient = np.full(phase.shape, np.nan, dtype=np.float32)
+    if phase.shape[0] < 2:
+        return np.moveaxis(gradient, 0, axis)
+    forward = phase_difference(phase[1:], phase[:-1])
+    # - forward/backward differences available at each pixel
+    d_fwd = np.full(phase.shape, np.nan, dtype=np.float32)
+    d_bwd = np.full(phase.shape, np.nan, dtype=np.float32)
+    d_fwd[:-1] = forward
+    d_bwd[1:] = forward
+    # - central difference where both are available, one-sided otherwise
+    with np.errstate(invalid='ignore'):
+        np.copyto(gradient, (d_fwd + d_bwd) / 2.)
+    np.copyto(gradient, d_fwd, where=np.isnan(gradient))
+    np.copyto(gradient, d_bwd, where=np.isnan(gradient))
+    gradient[np.isnan(phase)] = np.nan
+    return np.moveaxis(gradient, 0, axis)
+
+
+def gradient_magnitude(phase: np.ndarray, valid: np.ndarray = None) \
+        -> np.ndarray:
+    """
+    Magnitude of the wrapped phase gradient
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param valid: optional boolean mask of valid pixels - NaN values are
+        always considered invalid
+    :return: gradient magnitude [rad/pixel] - np.ndarray (float32)
+    """
+    if valid is not None:
+        phase = np.where(valid, phase, np.nan)
+    return np.hypot(wrapped_gradient(phase, 0), wrapped_gradient(phase, 1))
+
+
+def fringe_belt(phase: np.ndarray, threshold: float, window: int = 5,
+                valid: np.ndarray = None) -> tuple:
+    """
+    Detect the fringe belt of a wrapped double difference
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param threshold: gradient magnitude threshold [rad/pixel]
+    :param window: side of the averaging window [pixels] - odd number
+    :param valid: optional boolean mask of valid pixels
+    :return: (gradient magnitude [rad/pixel] - np.ndarray (float32) - NaN
+        where not valid, fringe-belt mask - np.ndarray (uint8) - BELT,
+        OUTSIDE or MASK_NODATA)
+    """
+    magnitude = gradient_magnitude(phase, valid=valid)
+    g_valid = np.isfinite(magnitude)
+    # - mean gradient magnitude within the sliding window
+    half = (window // 2, window // 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        smoothed = box_sum(np.where(g_valid, magnitude, 0.), half) \
+            / box_sum(g_valid, half)
+    belt = np.full(phase.shape, OUTSIDE, dtype=np.uint8)
+    belt[g_valid & (smoothed > threshold)] = BELT
+    belt[~g_valid] = MASK_NODATA
+    return magnitude, belt
+
+
+def fringe_belt_raster(in_path: str, grad_path: str, belt_path: str,
+                       threshold: float, window: int = 5,
+                       tile_size: int = 1024, workers: int = 1) -> None:
+    """
+    Compute gradient magnitude and fringe-belt mask of a wrapped phase
+    raster tile by tile
+    :param in_path: absolute path to the input phase GeoTIFF
+    :param grad_path: absolute path to the output gradient magnitude GeoTIFF
+    :param belt_path: absolute path to the output fringe-belt mask GeoTIFF
+    :param threshold: gradient magnitude threshold [rad/pixel]
+    :param window: side of the averaging window [pixels] - odd number
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :return: None
+    """
+    # - halo: half window + central differences
+    map_raster(in_path, [grad_path, belt_path],
+               lambda phase, valid: fringe_belt(phase, threshold,
+                                                window=window, valid=valid),
+               halo=window // 2 + 1, tile_size=tile_size, workers=workers,
+               out_types=[('float32', NODATA), ('uint8', MASK_NODATA)])
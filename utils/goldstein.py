@@ -0,0 +1,149 @@
+"""
+agent 10/2026
+Goldstein adaptive phase filter.
+
+Goldstein, R. M., and C. L. Werner (1998), Radar interferogram filtering
+for geophysical applications, Geophys. Res. Lett., 25(21), 4035-4038.
+
+The unit-complex phasor of the input phase is split into overlapping
+square patches. The patches are extracted as a strided view of the padded
+image and are filtered with one batched FFT per patch stack: the spectrum
+of each patch is weighted by its own smoothed amplitude raised to the
+power alpha. The filtered patches are blended back with a precomputed
+triangular weight window through an overlap-add performed on blocks of
+step x step pixels - (patch / step)^2 vectorized additions instead of a
+Python loop over the patches.
+
+Large rasters are filtered tile by tile by a pool of threads. Tiles are
+read with a halo of one patch and are aligned on the patch grid, so that
+the tiled result matches the one obtained on the whole raster.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from utils.tiling import tile_windows, pad_window, run_tiles, map_raster
+
+
+def weight_window(patch: int) -> np.ndarray:
+    """
+    Triangular (Bartlett) weight window used to blend filtered patches
+    :param patch: patch side [pixels]
+    :return: weight window - np.ndarray (patch, patch)
+    """
+    tri = 1. - np.abs(np.arange(patch) - (patch - 1) / 2.) / (patch / 2.)
+    return np.outer(tri, tri).astype(np.float32)
+
+
+def goldstein_filter(phase: np.ndarray, alpha: float = 0.5,
+                     patch: int = 32, step: int = 8,
+                     valid: np.ndarray = None) -> np.ndarray:
+    """
+    Goldstein adaptive filter of a wrapped phase field
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param alpha: filter exponent [0, 1] - 0: no filtering
+    :param patch: patch side [pixels]
+    :param step: distance between patches [pixels] - patch % step == 0
+    :param valid: optional boolean mask of valid pixels - NaN values are
+        always considered invalid
+    :return: filtered phase [rad] - np.ndarray (float32) - NaN where the
+        input is not valid
+    """
+    if patch % step != 0:
+        raise ValueError('Patch size must be a multiple of the step.')
+    n_sub = patch // step
+    n_rows, n_cols = phase.shape
+    v_mask = np.isfinite(phase)
+    if valid is not None:
+        v_mask &= valid
+    # - unit-complex phasor - zero outside the valid area
+    phasor = np.zeros(phase.shape, dtype=np.complex64)
+    phasor[v_mask] = np.exp(1j * phase[v_mask])
+    # - pad the image so that every pixel is covered by n_sub^2 patches
+    pad = patch - step
+    phasor = np.pad(phasor, ((pad, pad + (-n_rows) % step),
+                             (pad, pad + (-n_cols) % step)))
+    # - overlapping patches - strided view (n_py, n_px, patch, patch)
+    patches = sliding_window_view(phasor, (patch, patch))[::step, ::step]
+    n_py, n_px = patches.shape[:2]
+    # - batched FFT of the whole patch stack
+    spectrum = np.fft.fft2(patches, axes=(-2, -1))
+    # - smoothed spectrum amplitude - 3x3 circular box
+    amplitude = np.abs(spectrum)
+    smoothed = np.zeros_like(amplitude)
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            smoothed += np.roll(amplitude, (d_row, d_col), axis=(-2, -1))
+    smoothed /= np.maximum(smoothed.max(axis=(-2, -1), keepdims=True),
+                           np.finfo(np.float32).tiny)
+    spectrum *= smoothed ** alpha
+    filtered = np.fft.ifft2(spectrum, axes=(-2, -1))
+    filtered *= weight_window(patch)
+    # - overlap-add on blocks of step x step pixels
+    # - NOTE: all the pixels are covered by the same set of weights, the
+    # -       phase of the weighted sum does not need to be normalized.
+    acc = np.zeros(phasor.shape, dtype=filtered.dtype)
+    acc_b = acc.reshape(phasor.shape[0] // step, step,
+                        phasor.shape[1] // step, step)
+    filtered = filtered.reshape(n_py, n_px, n_sub, step, n_sub, step)
+    for u_sub in range(n_sub):
+        for v_sub in range(n_sub):
+            acc_b[u_sub:u_sub + n_py, :, v_sub:v_sub + n_px, :] \
+                += filtered[:, :, u_sub, :, v_sub, :].transpose(0, 2, 1, 3)
+    out_phase = np.angle(acc[pad:pad + n_rows, pad:pad + n_cols])\
+        .astype(np.float32)
+    out_phase[~v_mask] = np.nan
+    return out_phase
+
+
+def goldstein_filter_tiled(phase: np.ndarray, alpha: float = 0.5,
+                           patch: int = 32, step: int = 8,
+                           tile_size: int = 512,
+                           workers: int = 1) -> np.ndarray:
+    """
+    Goldstein adaptive filter of a wrapped phase field computed tile by tile
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param alpha: filter exponent [0, 1]
+    :param patch: patch side [pixels]
+    :param step: distance between patches [pixels]
+    :param tile_size: tile side [pixels] - rounded to a multiple of step
+    :param workers: number of worker threads
+    :return: filtered phase [rad] - np.ndarray (float32)
+    """
+    n_rows, n_cols = phase.shape
+    out_phase = np.empty(phase.shape, dtype=np.float32)
+    tile_size = max(step, tile_size - tile_size % step)
+
+    def process(window):
+        p_window, inner = pad_window(window, patch, n_cols, n_rows)
+        rows, cols = p_window.toslices()
+        return goldstein_filter(phase[rows, cols], alpha=alpha, patch=patch,
+                                step=step)[inner]
+
+    def write(window, tile):
+        rows, cols = window.toslices()
+        out_phase[rows, cols] = tile
+
+    run_tiles(tile_windows(n_cols, n_rows, tile_size), process, write,
+              workers=workers)
+    return out_phase
+
+
+def goldstein_raster(in_path: str, out_path: str, alpha: float = 0.5,
+                     patch: int = 32, step: int = 8, tile_size: int = 512,
+                     workers: int = 1) -> None:
+    """
+    Goldstein adaptive filter of a wrapped phase raster computed tile by tile
+    :param in_path: absolute path to the input phase GeoTIFF
+    :param out_path: absolute path to the output filtered GeoTIFF
+    :param alpha: filter exponent [0, 1]
+    :param patch: patch side [pixels]
+    :param step: distance between patches [pixels]
+    :param tile_size: tile side [pixels] - rounded to a multiple of step
+    :param workers: number of worker threads
+    :return: None
+    """
+    # - each tile is read together with a halo of one patch
+    map_raster(in_path, [out_path],
+               lambda phase, valid: goldstein_filter(
+                   phase, alpha=alpha, patch=patch, step=step, valid=valid),
+               halo=patch, tile_size=max(step, tile_size - tile_size % step),
+               workers=workers)
@@ -13,6 +13,10 @@ def make_dir(abs_path: str, dir_name: str) -> str:
     :return: absolute path to the new directory
     """
     dir_to_create = os.path.join(abs_path, dir_name)
-    if not os.path.exists(dir_to_create):
+    # - NOTE: the directory can be created at the same time by another
+    # -       process (batch mode)
+    try:
         os.mkdir(dir_to_create)
+    except FileExistsError:
+        pass
     return dir_to_create
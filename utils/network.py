@@ -0,0 +1,234 @@
+"""
+agent 10/2026
+Double differences over a network of coregistered interferograms.
+
+Every interferogram of the network is decoded exactly once (see below for
+networks of more than max_open pairs): the scenes are read in horizontal
+strips, all the strips are kept in memory together, and all the requested
+double differences are computed from that shared set and written to their
+output GeoTIFFs before moving to the next strip.
+
+The wrapped phase is stored in float32 and differenced with the kernel
+available in utils.phase_ops, which is equivalent to the product of the
+unit-complex phasors exp(1j*phi_i) * conj(exp(1j*phi_j)) at half the memory
+of a complex64 representation. The strip height is selected so that the
+in-memory set never exceeds the selected memory ceiling.
+
+All the double differences are computed on the intersection of the
+footprints of the interferograms of the network.
+
+The output GeoTIFFs are written in groups of at most max_open pairs, so
+that the number of open GDAL datasets stays well below the usual limit on
+open files. Each open output keeps (at least) one row of partially written
+blocks in the GDAL block cache: these buffers are included in the memory
+ceiling used to select the strip height. With more than max_open pairs:
+    - if the whole interferograms fit in the memory ceiling (or no ceiling
+      is set), they are decoded once and every group is written from
+      memory;
+    - otherwise the interferograms used by each group are decoded once per
+      group - i.e. read again for every group of max_open pairs.
+Strip heights are validated before any output is created, so that a too
+small memory ceiling does not leave empty outputs on disk.
+"""
+import math
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+from utils.phase_ops import phase_difference
+from utils.double_diff import common_grid, shift_window, valid_mask, NODATA
+from utils.raster_io import geotiff_profile
+
+# - Bytes per pixel of each in-memory interferogram (float32 phase + mask)
+BYTES_PER_PIXEL = 5
+# - Maximum number of output GeoTIFFs open at the same time
+MAX_OPEN_OUTPUTS = 128
+
+
+def network_pairs(n_scenes: int, mode: str = 'all') -> list:
+    """
+    List the pairs of interferograms forming the network
+    :param n_scenes: number of interferograms
+    :param mode: 'all' - every pair, 'consecutive' - consecutive pairs only
+    :return: list of (i, j) index tuples
+    """
+    if mode == 'all':
+        return [(i, j) for i in range(n_scenes)
+                for j in range(i + 1, n_scenes)]
+    if mode == 'consecutive':
+        return [(i, i + 1) for i in range(n_scenes - 1)]
+    raise ValueError(f'Unknown network mode: {mode}')
+
+
+def strip_height(width: int, height: int, n_scenes: int,
+                 mem_limit: float = None, block: int = 256,
+                 n_outputs: int = 0) -> int:
+    """
+    Compute the height of the strips read from the network interferograms
+    :param width: raster width [pixels]
+    :param height: raster height [pixels]
+    :param n_scenes: number of interferograms kept in memory
+    :param mem_limit: memory ceiling [bytes] - None: no limit
+    :param block: output GeoTIFF block size - strips taller than a block
+        are aligned to whole blocks
+    :param n_outputs: number of output GeoTIFFs open at the same time
+    :return: strip height [pixels]
+    """
+    if mem_limit is None:
+        return height
+    # - one row of float32 blocks per open output (GDAL block cache)
+    block_bytes = n_outputs * math.ceil(width / block) * block * block * 4
+    # - in-memory interferograms + one output buffer
+    row_bytes = width * (BYTES_PER_PIXEL * n_scenes + 4)
+    n_rows = int(max(mem_limit - block_bytes, 0) // row_bytes)
+    if n_rows < 1:
+        raise ValueError(f'Memory limit ({mem_limit / 2**20:.1f} MiB) too '
+                         f'small to hold one row of {n_scenes} scenes and '
+                         f'the blocks of {n_outputs} outputs.')
+    if n_rows > block:
+        n_rows -= n_rows % block
+    return min(n_rows, height)
+
+
+def network_double_differences(in_paths: list, pairs: list,
+                               out_paths: list,
+                               mem_limit: float = None,
+                               max_open: int = MAX_OPEN_OUTPUTS) -> None:
+    """
+    Compute the double differences of a network of interferograms
+    :param in_paths: absolute paths to the input interferograms
+    :param pairs: list of (i, j) index tuples - see network_pairs
+    :param out_paths: absolute path to the output GeoTIFF of each pair
+    :param mem_limit: memory ceiling [bytes] - None: no limit
+    :param max_open: maximum number of output GeoTIFFs open at the same
+        time
+    :return: None
+    """
+    # - Compute the grid covering the overlapping area of all the
+    # - interferograms used by at least one pair - headers only
+    used = sorted({k for pair in pairs for k in pair})
+    srcs = [rasterio.open(in_paths[k]) for k in used]
+    try:
+        offsets, transform, width, height = common_grid(srcs)
+        crs = srcs[0].crs
+    finally:
+        for src in srcs:
+            src.close()
+    offsets = dict(zip(used, offsets))
+    # - Output raster profile - tiled and compressed GeoTIFF
+    profile = geotiff_profile(crs, transform, width, height, nodata=NODATA)
+    block = profile['blockysize']
+    groups = [(pairs[g:g + max_open], out_paths[g:g + max_open])
+              for g in range(0, len(pairs), max_open)]
+    # - NOTE: strip heights are validated before any output is created
+    n_rows = strip_height(width, height, len(used), mem_limit, block=block,
+                          n_outputs=len(groups[0][0]))
+    if len(groups) > 1 and n_rows == height:
+        # - the whole network fits in memory - decoded once for all groups
+        _double_differences_in_memory(in_paths, used, groups, offsets,
+                                      profile)
+        return
+    # - interferograms decoded in strips - once per group of outputs
+    g_rows = [strip_height(width, height,
+                           len({k for pair in g_pairs for k in pair}),
+                           mem_limit, block=block, n_outputs=len(g_pairs))
+              for g_pairs, _ in groups]
+    for (g_pairs, g_paths), rows in zip(groups, g_rows):
+        _double_differences(in_paths, g_pairs, g_paths, offsets, profile,
+                            rows)
+
+
+def _read_strip(srcs: dict, offsets: dict, window: Window) -> tuple:
+    """
+    Decode a strip of the network interferograms
+    :param srcs: open datasets - dict(index: dataset)
+    :param offsets: window of the common grid within each interferogram
+    :param window: strip window on the common grid
+    :return: (dict(index: phase), dict(index: valid mask))
+    """
+    phase, valid = {}, {}
+    for k, src in srcs.items():
+        phase[k] = src.read(1, window=shift_window(window, offsets[k]))
+        valid[k] = valid_mask(phase[k], src.nodata)
+    return phase, valid
+
+
+def _write_strip(pairs: list, dsts: list, phase: dict, valid: dict,
+                 window: Window, dd_buffer: np.ndarray) -> None:
+    """
+    Compute and write a strip of a group of double differences
+    :param pairs: list of (i, j) index tuples
+    :param dsts: output datasets - one per pair
+    :param phase: decoded strips - see _read_strip
+    :param valid: valid masks - see _read_strip
+    :param window: strip window on the common grid
+    :param dd_buffer: float32 output buffer - at least window.height rows
+    :return: None
+    """
+    dd_phase = dd_buffer[:window.height]
+    for (i, j), dst in zip(pairs, dsts):
+        phase_difference(phase[i], phase[j], out=dd_phase)
+        dd_phase[~(valid[i] & valid[j])] = NODATA
+        dst.write(dd_phase, 1, window=window)
+
+
+def _double_differences(in_paths: list, pairs: list, out_paths: list,
+                        offsets: dict, profile: dict, n_rows: int) -> None:
+    """
+    Compute a group of double differences of a network strip by strip
+    :param in_paths: absolute paths to the input interferograms
+    :param pairs: list of (i, j) index tuples
+    :param out_paths: absolute path to the output GeoTIFF of each pair
+    :param offsets: window of the common grid within each interferogram
+    :param profile: output raster profile
+    :param n_rows: strip height [pixels] - see strip_height
+    :return: None
+    """
+    width, height = profile['width'], profile['height']
+    # - interferograms used by at least one pair of the group
+    used = sorted({k for pair in pairs for k in pair})
+    srcs = {}
+    dsts = []
+    try:
+        srcs = {k: rasterio.open(in_paths[k]) for k in used}
+        dsts = [rasterio.open(p, 'w', **profile) for p in out_paths]
+        dd_buffer = np.empty((n_rows, width), dtype=np.float32)
+        for row_off in range(0, height, n_rows):
+            window = Window(0, row_off, width, min(n_rows, height - row_off))
+            # - decode each interferogram once per strip
+            phase, valid = _read_strip(srcs, offsets, window)
+            _write_strip(pairs, dsts, phase, valid, window, dd_buffer)
+    finally:
+        for dataset in [*srcs.values(), *dsts]:
+            dataset.close()
+
+
+def _double_differences_in_memory(in_paths: list, used: list, groups: list,
+                                  offsets: dict, profile: dict) -> None:
+    """
+    Compute the double differences of a network from whole interferograms
+    decoded once and written group by group
+    :param in_paths: absolute paths to the input interferograms
+    :param used: indices of the interferograms used by the network
+    :param groups: list of (pairs, output paths) tuples
+    :param offsets: window of the common grid within each interferogram
+    :param profile: output raster profile
+    :return: None
+    """
+    width, height = profile['width'], profile['height']
+    window = Window(0, 0, width, height)
+    srcs = {}
+    try:
+        srcs = {k: rasterio.open(in_paths[k]) for k in used}
+        phase, valid = _read_strip(srcs, offsets, window)
+    finally:
+        for src in srcs.values():
+            src.close()
+    dd_buffer = np.empty((height, width), dtype=np.float32)
+    for pairs, out_paths in groups:
+        dsts = []
+        try:
+            dsts = [rasterio.open(p, 'w', **profile) for p in out_paths]
+            _write_strip(pairs, dsts, phase, valid, window, dd_buffer)
+        finally:
+            for dst in dsts:
+                dst.close()
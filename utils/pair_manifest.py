@@ -0,0 +1,73 @@
+"""
+agent 10/2026
+Read/write the list of interferogram pairs to process in batch mode.
+
+Supported manifest formats:
+  - YAML: list of [reference, secondary] pairs or of mappings with
+    reference/secondary keys. The list can also be stored under the
+    'pairs' key of a mapping.
+        pairs:
+          - reference: ICEYE-phase_geo-20210101_20210102
+            secondary: ICEYE-phase_geo-20210102_20210103
+  - CSV: two columns - reference, secondary - with an optional header.
+        reference,secondary
+        ICEYE-phase_geo-20210101_20210102,ICEYE-phase_geo-20210102_20210103
+
+Interferograms are listed by file name - with or without the .tif extension.
+"""
+import os
+import csv
+import yaml
+from utils.scene_names import strip_tif
+
+
+def _parse_pair(entry) -> tuple:
+    """
+    Convert a manifest entry into a (reference, secondary) tuple
+    :param entry: manifest entry - sequence or mapping
+    :return: (reference, secondary)
+    """
+    if isinstance(entry, dict):
+        pair = (entry.get('reference'), entry.get('secondary'))
+    else:
+        pair = tuple(entry)
+    if len(pair) != 2 or not all(pair):
+        raise ValueError(f'Invalid manifest entry: {entry}')
+    return tuple(strip_tif(str(p).strip()) for p in pair)
+
+
+def read_pair_manifest(manifest: str) -> list:
+    """
+    Read a manifest of interferogram pairs
+    :param manifest: absolute path to the manifest file (.yaml/.yml/.csv)
+    :return: list of (reference, secondary) tuples
+    """
+    ext = os.path.splitext(manifest)[1].lower()
+    if ext in ('.yaml', '.yml'):
+        with open(manifest, 'r') as f_in:
+            entries = yaml.safe_load(f_in) or []
+        if isinstance(entries, dict):
+            entries = entries.get('pairs', [])
+    elif ext == '.csv':
+        with open(manifest, 'r', newline='') as f_in:
+            entries = [row for row in csv.reader(f_in)
+                       if row and not row[0].startswith('#')]
+        if entries and [c.strip().lower() for c in entries[0]] \
+                == ['reference', 'secondary']:
+            entries = entries[1:]
+    else:
+        raise ValueError(f'Unsupported manifest format: {manifest}')
+    return [_parse_pair(entry) for entry in entries]
+
+
+def write_pair_manifest(pairs: list, manifest: str) -> None:
+    """
+    Save a list of interferogram pairs as a CSV manifest
+    :param pairs: list of (reference, secondary) tuples
+    :param manifest: absolute path to the output manifest (.csv)
+    :return: None
+    """
+    with open(manifest, 'w', newline='') as f_out:
+        writer = csv.writer(f_out)
+        writer.writerow(['reference', 'secondary'])
+        writer.writerows(pairs)
@@ -0,0 +1,153 @@
+"""
+agent 10/2026
+Automatic selection of the interferogram pairs to process.
+
+Candidate pairs are generated from the scene catalog (see utils.catalog)
+without opening the rasters. Two interferograms form a candidate pair if:
+    - they are stored in the same CRS and with the same pixel size - pairs
+      of different grids would require --align to be processed;
+    - the separation between their reference dates is within
+      [min_days, max_days];
+    - their footprints overlap by at least min_overlap - the overlap is
+      computed as the fraction of the smaller footprint covered by the
+      intersection of the two footprints.
+
+The footprints of the interferograms acquired on the same day are indexed
+with a shapely STRtree (R-tree). For each acquisition day, only the trees
+of the days falling within the temporal window are queried - days are
+sorted and the window is found with a binary search - so that the cost
+depends on the number of candidates rather than on the square of the
+archive size. The overlap of the candidate pairs is computed with numpy
+from the footprint bounds.
+"""
+import numpy as np
+from shapely import STRtree, box
+
+# - Number of decimals compared when grouping scenes by pixel size
+RES_DECIMALS = 6
+
+
+def scene_days(dates: list) -> np.ndarray:
+    """
+    Convert acquisition dates into day numbers
+    :param dates: list of <YYYYMMDD> strings
+    :return: np.ndarray (int64) - days since 1970-01-01
+    """
+    return np.array([f'{d[:4]}-{d[4:6]}-{d[6:]}' for d in dates],
+                    dtype='datetime64[D]').astype(np.int64)
+
+
+def overlap_fraction(bounds_a: np.ndarray, bounds_b: np.ndarray) -> np.ndarray:
+    """
+    Fraction of the smaller footprint covered by the intersection of two
+    footprints
+    :param bounds_a: np.ndarray (n, 4) - left, bottom, right, top
+    :param bounds_b: np.ndarray (n, 4) - left, bottom, right, top
+    :return: np.ndarray (n, ) - overlap fraction [0, 1]
+    """
+    i_width = np.minimum(bounds_a[:, 2], bounds_b[:, 2]) \
+        - np.maximum(bounds_a[:, 0], bounds_b[:, 0])
+    i_height = np.minimum(bounds_a[:, 3], bounds_b[:, 3]) \
+        - np.maximum(bounds_a[:, 1], bounds_b[:, 1])
+    inter = np.clip(i_width, 0, None) * np.clip(i_height, 0, None)
+    area_a = (bounds_a[:, 2] - bounds_a[:, 0]) \
+        * (bounds_a[:, 3] - bounds_a[:, 1])
+    area_b = (bounds_b[:, 2] - bounds_b[:, 0]) \
+        * (bounds_b[:, 3] - bounds_b[:, 1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.nan_to_num(inter / np.minimum(area_a, area_b))
+
+
+def candidate_pairs(days: np.ndarray, bounds: np.ndarray, min_days: int,
+                    max_days: int) -> tuple:
+    """
+    Pairs of spatially intersecting footprints within the temporal window
+    :param days: np.ndarray (n, ) - reference day of each footprint
+    :param bounds: np.ndarray (n, 4) - left, bottom, right, top
+    :param min_days: minimum separation [days]
+    :param max_days: maximum separation [days]
+    :return: (np.ndarray, np.ndarray) - indices of the first (earlier) and
+        of the second footprint of each pair
+    """
+    footprints = box(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+    u_days, inverse = np.unique(days, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+    trees = {}
+    first, second = [], []
+    for k, day in enumerate(u_days):
+        idx_a = groups[k]
+        lo = np.searchsorted(u_days, day + min_days, side='left')
+        hi = np.searchsorted(u_days, day + max_days, side='right')
+        for m in range(lo, hi):
+            idx_b = groups[m]
+            if m not in trees:
+                trees[m] = STRtree(footprints[idx_b])
+            q_a, q_b = trees[m].query(footprints[idx_a],
+                                      predicate='intersects')
+            p_a, p_b = idx_a[q_a], idx_b[q_b]
+            if m == k:
+                # - same day - keep each pair once
+                keep = p_a < p_b
+                p_a, p_b = p_a[keep], p_b[keep]
+            first.append(p_a)
+            second.append(p_b)
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def grid_key(record: dict) -> tuple:
+    """
+    Key grouping the catalog records that can be paired without
+    resampling
+    :param record: catalog record - see utils.catalog.query_scenes
+    :return: (CRS, pixel size along x, pixel size along y) - missing
+        values replaced by empty strings
+    """
+    res = tuple('' if record.get(r_key) is None
+                else round(float(record[r_key]), RES_DECIMALS)
+                for r_key in ('res_x', 'res_y'))
+    return (record['crs'] or '', *res)
+
+
+def select_pairs(records: list, min_days: int = 1, max_days: int = 4,
+                 min_overlap: float = 0.6) -> list:
+    """
+    Select the pairs of interferograms to process from the catalog records
+    :param records: catalog records - see utils.catalog.query_scenes
+    :param min_days: minimum separation between reference dates [days]
+    :param max_days: maximum separation between reference dates [days]
+    :param min_overlap: minimum overlap fraction of the footprints [0, 1]
+    :return: list of dictionaries - reference, secondary (interferogram
+        names), days (separation) and overlap - sorted by reference date
+    """
+    if not 0 <= min_days <= max_days:
+        raise ValueError(f'Invalid temporal window: [{min_days}, '
+                         f'{max_days}] days.')
+    records = [r for r in records if r['date_ref'] is not None]
+    pairs = []
+    # - pairs are selected only among interferograms sharing the same CRS
+    # - and pixel size
+    groups = {}
+    for r in records:
+        groups.setdefault(grid_key(r), []).append(r)
+    for key in sorted(groups, key=str):
+        c_records = groups[key]
+        days = scene_days([r['date_ref'] for r in c_records])
+        bounds = np.array([[r['left'], r['bottom'], r['right'], r['top']]
+                           for r in c_records], dtype=np.float64)
+        p_a, p_b = candidate_pairs(days, bounds, min_days, max_days)
+        overlap = overlap_fraction(bounds[p_a], bounds[p_b])
+        keep = overlap >= min_overlap
+        for i, j, frac in zip(p_a[keep], p_b[keep], overlap[keep]):
+            if days[i] > days[j] or (days[i] == days[j]
+                                     and c_records[i]['name']
+                                     > c_records[j]['name']):
+                i, j = j, i
+            pairs.append({'reference': c_records[i]['name'],
+                          'secondary': c_records[j]['name'],
+                          'days': int(days[j] - days[i]),
+                          'overlap': float(frac)})
+    pairs.sort(key=lambda p: (p['reference'], p['secondary']))
+    return pairs
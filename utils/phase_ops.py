@@ -0,0 +1,128 @@
+"""
+agent 10/2026
+Set of vectorized kernels used to manipulate wrapped interferometric phase.
+
+The kernels operate directly on the wrapped phase values in single precision
+and never build the complex phasor exp(1j * phase). The wrapped difference of
+two interferograms:
+    angle(exp(1j * phi_1) * conj(exp(1j * phi_2)))
+is computed as:
+    wrap(phi_1 - phi_2)
+which is mathematically equivalent and requires neither transcendental
+functions nor complex128 temporaries.
+
+Multilooking averages the unit-complex phasors exp(1j * phase) over
+non-overlapping blocks of pixels - via reshape-based block sums of their
+real and imaginary parts - and only then takes the angle.
+
+The arbitrary constant offset of a double difference can be removed by
+subtracting the circular mean phase of a stable reference area:
+    mean = angle(sum(exp(1j * phase[mask])))
+The correction is applied in place on the input array.
+"""
+import numpy as np
+
+# - Full phase cycle [rad]
+TWO_PI = 2. * np.pi
+
+
+def wrap_phase(phase: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Wrap phase values to the [-pi, +pi] interval
+    :param phase: input phase [rad] - np.ndarray
+    :param out: optional output buffer (can be phase itself)
+    :return: wrapped phase [rad] - np.ndarray
+    """
+    out = np.add(phase, np.pi, out=out)
+    np.mod(out, TWO_PI, out=out)
+    out -= np.pi
+    return out
+
+
+def phase_difference(phase_1: np.ndarray, phase_2: np.ndarray,
+                     out: np.ndarray = None) -> np.ndarray:
+    """
+    Compute the wrapped difference between two interferometric phase fields
+    :param phase_1: reference phase [rad] - np.ndarray
+    :param phase_2: secondary phase [rad] - np.ndarray
+    :param out: optional float32 output buffer
+    :return: wrapped phase difference [rad] - np.ndarray (float32)
+    """
+    if out is None:
+        out = np.empty(np.broadcast_shapes(np.shape(phase_1),
+                                           np.shape(phase_2)),
+                       dtype=np.float32)
+    np.subtract(phase_1, phase_2, out=out)
+    return wrap_phase(out, out=out)
+
+
+def multilook(phase: np.ndarray, looks: tuple,
+              valid: np.ndarray = None) -> np.ndarray:
+    """
+    Multilook wrapped phase in the complex domain
+    NOTE: trailing rows/columns that do not fill a complete block
+          are discarded.
+    :param phase: input phase [rad] - np.ndarray
+    :param looks: number of looks - (rows, columns)
+    :param valid: optional boolean mask of valid pixels - NaN values are
+        always considered invalid
+    :return: multilooked phase [rad] - np.ndarray (float32) - NaN where
+        no valid pixels are found within a block
+    """
+    n_rows, n_cols = looks
+    rows = phase.shape[0] // n_rows
+    cols = phase.shape[1] // n_cols
+    phase = phase[:rows * n_rows, :cols * n_cols]
+    v_mask = np.isfinite(phase)
+    if valid is not None:
+        v_mask &= valid[:rows * n_rows, :cols * n_cols]
+    # - unit-complex phasor - real and imaginary parts
+    re_part = np.cos(phase, dtype=np.float32)
+    im_part = np.sin(phase, dtype=np.float32)
+    re_part[~v_mask] = 0.
+    im_part[~v_mask] = 0.
+    # - block sums
+    b_shape = (rows, n_rows, cols, n_cols)
+    re_sum = re_part.reshape(b_shape).sum(axis=(1, 3))
+    im_sum = im_part.reshape(b_shape).sum(axis=(1, 3))
+    count = v_mask.reshape(b_shape).sum(axis=(1, 3))
+    ml_phase = np.arctan2(im_sum, re_sum)
+    ml_phase[count == 0] = np.nan
+    return ml_phase
+
+
+def phasor_sums(phase: np.ndarray, mask: np.ndarray = None) -> tuple:
+    """
+    Sums of the real and imaginary parts of the unit-complex phasors of
+    the valid pixels selected by a mask
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param mask: optional boolean mask of the pixels to consider - NaN
+        values are always ignored
+    :return: (sum of cos(phase), sum of sin(phase), number of pixels)
+    """
+    sel = phase[mask] if mask is not None else phase.ravel()
+    sel = sel[np.isfinite(sel)]
+    return (float(np.cos(sel).sum(dtype=np.float64)),
+            float(np.sin(sel).sum(dtype=np.float64)), sel.size)
+
+
+def circular_mean(phase: np.ndarray, mask: np.ndarray = None) -> float:
+    """
+    Circular mean of a wrapped phase field
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param mask: optional boolean mask of the pixels to consider
+    :return: circular mean [rad] - NaN if no valid pixels are found
+    """
+    re_sum, im_sum, count = phasor_sums(phase, mask=mask)
+    return float(np.arctan2(im_sum, re_sum)) if count else np.nan
+
+
+def subtract_phase(phase: np.ndarray, offset: float) -> np.ndarray:
+    """
+    Subtract a constant phase offset in place and re-wrap the result
+    :param phase: wrapped phase [rad] - np.ndarray (modified in place)
+    :param offset: phase offset [rad]
+    :return: phase - same array as the input
+    """
+    phase -= offset
+    return wrap_phase(phase, out=phase)
@@ -0,0 +1,87 @@
+"""
+Enrico Ciraci 02/2022
+Plot the double difference between two coregistered interferograms.
+
+This module imports matplotlib: it should be imported only when a figure is
+actually requested, so that compute-only runs do not pay matplotlib startup.
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+from mpl_toolkits.axes_grid1 import make_axes_locatable
+
+
+def add_colorbar(fig: plt.Figure, ax: plt.Axes,
+                 im: plt.pcolormesh) -> plt.colorbar:
+    """
+    Add colorbar to the selected plt.Axes
+    :param fig: plt.figure object
+    :param ax: plt.Axes object
+    :param im: plt.pcolormesh object
+    :return: plt.colorbar
+    """
+    divider = make_axes_locatable(ax)
+    cax = divider.new_vertical(size='5%', pad=0.6, pack_start=True)
+    fig.add_axes(cax)
+    cb = fig.colorbar(im, cax=cax, orientation='horizontal')
+    return cb
+
+
+def plot_double_difference(interf_1: np.ndarray, interf_2: np.ndarray,
+                           dd_phase: np.ndarray, name_1: str, name_2: str,
+                           out_path: str, fig_format: str = 'jpeg',
+                           dpi: int = 200) -> None:
+    """
+    Plot the two input interferograms and their double difference
+    :param interf_1: reference interferogram [rad]
+    :param interf_2: secondary interferogram [rad]
+    :param dd_phase: double difference [rad]
+    :param name_1: reference interferogram name
+    :param name_2: secondary interferogram name
+    :param out_path: absolute path to the output figure
+    :param fig_format: output figure format
+    :param dpi: output figure resolution
+    :return: None
+    """
+    # - Output figure parameters
+    fig_size = (15, 5)
+    # - Initialize figure object
+    fig = plt.figure(figsize=fig_size, dpi=dpi)
+    # - Input Interferogram 1
+    ax_1 = fig.add_subplot(1, 3, 1)
+    ax_1.set_title(name_1, weight='bold')
+    im_1 = ax_1.imshow(interf_1, vmin=-np.pi, vmax=np.pi,
+                       cmap=plt.get_cmap('jet'))
+    ax_1.grid(color='k', linestyle='dotted', alpha=0.3)
+    cb_1 = add_colorbar(fig, ax_1, im_1)
+    cb_1.set_label(label='Rad', weight='bold')
+    cb_1.ax.tick_params(labelsize='medium')
+    cb_1.ax.set_xticks([-np.pi, 0, np.pi])
+    cb_1.ax.set_xticklabels([r'-$\pi$', '0', r'$\pi$'])
+
+    # - Input Interferogram 2
+    ax_2 = fig.add_subplot(1, 3, 2)
+    ax_2.set_title(name_2, weight='bold')
+    im_2 = ax_2.imshow(interf_2, vmin=-np.pi, vmax=np.pi,
+                       cmap=plt.get_cmap('jet'))
+    ax_2.grid(color='k', linestyle='dotted', alpha=0.3)
+    cb_2 = add_colorbar(fig, ax_2, im_2)
+    cb_2.set_label(label='Rad', weight='bold')
+    cb_2.ax.tick_params(labelsize='medium')
+    cb_2.ax.set_xticks([-np.pi, 0, np.pi])
+    cb_2.ax.set_xticklabels([r'-$\pi$', '0', r'$\pi$'])
+
+    # - Differential Interferogram
+    ax_3 = fig.add_subplot(1, 3, 3)
+    ax_3.set_title('Double Difference', weight='bold')
+    im_3 = ax_3.imshow(dd_phase, vmin=-np.pi, vmax=np.pi,
+                       cmap=plt.get_cmap('jet'))
+    ax_3.grid(color='k', linestyle='dotted', alpha=0.3)
+    cb_3 = add_colorbar(fig, ax_3, im_3)
+    cb_3.set_label(label='Rad', weight='bold')
+    cb_3.ax.tick_params(labelsize='medium')
+    cb_3.ax.set_xticks([-np.pi, 0, np.pi])
+    cb_3.ax.set_xticklabels([r'-$\pi$', '0', r'$\pi$'])
+
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=dpi, format=fig_format)
+    plt.close()
@@ -0,0 +1,130 @@
+"""
+agent 10/2026
+Size-bounded Least Recently Used (LRU) cache of rasters loaded in memory.
+
+Entries are keyed by absolute file path, file modification time, file size
+and read options. The cache budget is expressed in bytes: the least
+recently used entries are evicted until the total size of the cached arrays
+fits the budget. Cached arrays are returned as read-only views - callers
+that need to modify the data must copy it first.
+"""
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+def file_identity(in_path: str) -> tuple:
+    """
+    Identify the current version of a file
+    :param in_path: path to the input file
+    :return: (absolute path, modification time [ns], size [bytes])
+    """
+    f_stat = os.stat(in_path)
+    return os.path.abspath(in_path), f_stat.st_mtime_ns, f_stat.st_size
+
+
+def entry_nbytes(entry: dict) -> int:
+    """
+    Compute the memory footprint of the arrays stored in a cache entry
+    :param entry: dictionary returned by a raster reader
+    :return: size [bytes]
+    """
+    return sum(v.nbytes for v in entry.values() if isinstance(v, np.ndarray))
+
+
+class RasterCache:
+    """
+    Size-bounded LRU cache of rasters
+    :param max_bytes: cache budget [bytes]
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, in_path: str, options: tuple = ()):
+        """
+        Retrieve a raster from the cache
+        :param in_path: path to the input file
+        :param options: read options used to load the raster
+        :return: cached entry (shallow copy) or None
+        """
+        f_id = file_identity(in_path)
+        with self._lock:
+            entry = self._entries.get((f_id, options))
+            if entry is None:
+                self.misses += 1
+                # - drop entries referring to old versions of the file
+                if self._versions.get(f_id[0], f_id) != f_id:
+                    self._invalidate(f_id[0])
+                return None
+            self.hits += 1
+            self._entries.move_to_end((f_id, options))
+            return dict(entry)
+
+    def put(self, in_path: str, entry: dict, options: tuple = ()) -> dict:
+        """
+        Store a raster in the cache
+        :param in_path: path to the input file
+        :param entry: dictionary returned by a raster reader
+        :param options: read options used to load the raster
+        :return: read-only version of the entry (shallow copy)
+        """
+        for value in entry.values():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+        f_id = file_identity(in_path)
+        size = entry_nbytes(entry)
+        with self._lock:
+            if size > self.max_bytes:
+                return dict(entry)
+            key = (f_id, options)
+            if key in self._entries:
+                self.nbytes -= entry_nbytes(self._entries.pop(key))
+            self._entries[key] = entry
+            self._versions[f_id[0]] = f_id
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, old_entry = self._entries.popitem(last=False)
+                self.nbytes -= entry_nbytes(old_entry)
+                self.evictions += 1
+        return dict(entry)
+
+    def _invalidate(self, abs_path: str) -> None:
+        """
+        Remove all the entries of a file - must be called holding the lock
+        :param abs_path: absolute path to the file
+        :return: None
+        """
+        for key in [k for k in self._entries if k[0][0] == abs_path]:
+            self.nbytes -= entry_nbytes(self._entries.pop(key))
+            self.evictions += 1
+        self._versions.pop(abs_path, None)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries from the cache
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict:
+        """
+        Cache counters
+        :return: dictionary containing hits, misses, evictions, number of
+            entries and cached bytes
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries), 'nbytes': self.nbytes,
+                    'max_bytes': self.max_bytes}
@@ -22,45 +22,133 @@ import affine
 from pyproj import CRS
 import numpy as np
 from typing import Union
+from utils.raster_cache import RasterCache
 
+# - Optional in-memory raster cache used by load_raster
+_RASTER_CACHE = None
 
-def load_raster(in_path: str) -> dict:
+
+def enable_raster_cache(max_bytes: int) -> RasterCache:
+    """
+    Enable the size-bounded LRU cache in front of load_raster
+    :param max_bytes: cache budget [bytes]
+    :return: RasterCache object - see RasterCache.stats()
+    """
+    global _RASTER_CACHE
+    _RASTER_CACHE = RasterCache(max_bytes)
+    return _RASTER_CACHE
+
+
+def disable_raster_cache() -> None:
+    """
+    Disable the raster cache and release the cached arrays
+    :return: None
+    """
+    global _RASTER_CACHE
+    _RASTER_CACHE = None
+
+
+def get_raster_cache() -> Union[RasterCache, None]:
+    """
+    Return the active raster cache
+    :return: RasterCache object or None if the cache is disabled
+    """
+    return _RASTER_CACHE
+
+
+def load_raster(in_path: str, band: int = 1, window=None) -> dict:
     """
     # - Load raster saved in GeoTiff format
+    # - NOTE: when the raster cache is enabled (see enable_raster_cache),
+    # -       the full band is cached - windows are sliced from the cached
+    # -       band - and the returned arrays are read-only.
     :param in_path: absolute path to input file
+    :param band: raster band to read
+    :param window: rasterio Window - read only a subset of the raster
+    :return: dictionary containing the input raster + ancillary info.
+    """
+    cache = _RASTER_CACHE
+    if cache is None:
+        return _read_raster(in_path, band=band, window=window)
+    options = (band, )
+    raster = cache.get(in_path, options)
+    if raster is None:
+        raster = cache.put(in_path, _read_raster(in_path, band=band),
+                           options)
+    if window is None:
+        return raster
+    # - window of the cached band - rows in the native (top-down) order
+    native = np.flipud(raster['data']) if raster['src_transform'].e < 0 \
+        else raster['data']
+    rows, cols = window.toslices()
+    return _raster_entry(native[rows, cols],
+                         raster['src_transform']
+                         * Affine.translation(window.col_off, window.row_off),
+                         raster['res'], raster['crs'], raster['nodata'],
+                         raster['dtype'])
+
+
+def _read_raster(in_path: str, band: int = 1, window=None) -> dict:
+    """
+    # - Read raster saved in GeoTiff format
+    :param in_path: absolute path to input file
+    :param band: raster band to read
+    :param window: rasterio Window - read only a subset of the raster
     :return: dictionary containing the input raster + ancillary info.
     """
     with rasterio.open(in_path, mode='r+') as src:
-        # - read band #1
-        raster_input = src.read(1).astype(src.dtypes[0])
-        # - raster upper-left and lower-right corners
-        ul_corner = src.transform * (0, 0)
-        lr_corner = src.transform * (src.width, src.height)
-        grid_res = src.res
-        # - compute x- and y-axis coordinates
-        x_coords = np.arange(ul_corner[0], lr_corner[0], grid_res[0])
-        y_coords = np.arange(lr_corner[1], ul_corner[1], grid_res[1])
-        # - compute raster extent - (left, right, bottom, top)
-        extent = [ul_corner[0], lr_corner[0], lr_corner[1], ul_corner[1]]
-        # - compute cell centroids
-        x_centroids = x_coords + (grid_res[0]/2.)
-        y_centroids = y_coords + (grid_res[1]/2.)
-        # - rotate the output numpy array in such a way that
-        # - the lower-left corner of the raster is considered
-        # - the origin of the reference system.
-        if src.transform.e < 0:
-            raster_input = np.flipud(raster_input)
-        # - Compute New Affine Transform
-        transform = (Affine.translation(x_coords[0], y_coords[0])
-                     * Affine.scale(src.res[0], src.res[1]))
-
-        return{'data': raster_input, 'crs': src.crs, 'res': src.res,
-               'y_coords': y_coords, 'x_coords': x_coords,
-               'y_centroids': y_centroids, 'x_centroids': x_centroids,
-               'transform': transform, 'src_transform': src.transform,
-               'width': src.width, 'height': src.height, 'extent': extent,
-               'ul_corner': ul_corner, 'lr_corner': lr_corner,
-               'nodata': src.nodata, 'dtype': src.dtypes[0]}
+        # - read selected band
+        raster_input = src.read(band, window=window)\
+            .astype(src.dtypes[band - 1])
+        # - transform of the area read from the raster
+        src_transform = src.transform if window is None \
+            else src.window_transform(window)
+        return _raster_entry(raster_input, src_transform, src.res, src.crs,
+                             src.nodata, src.dtypes[band - 1])
+
+
+def _raster_entry(raster_input: np.ndarray, src_transform, res: tuple,
+                  crs, nodata: float, dtype: str) -> dict:
+    """
+    # - Build the dictionary returned by load_raster
+    :param raster_input: raster band - np.ndarray - first row at the top of
+        the image (as returned by rasterio)
+    :param src_transform: affine transform of raster_input
+    :param res: raster resolution - (x, y)
+    :param crs: coordinate reference system
+    :param nodata: no-data value
+    :param dtype: raster data type
+    :return: dictionary containing the input raster + ancillary info.
+    """
+    width, height = raster_input.shape[1], raster_input.shape[0]
+    # - raster upper-left and lower-right corners
+    ul_corner = src_transform * (0, 0)
+    lr_corner = src_transform * (width, height)
+    grid_res = res
+    # - compute x- and y-axis coordinates
+    x_coords = np.arange(ul_corner[0], lr_corner[0], grid_res[0])
+    y_coords = np.arange(lr_corner[1], ul_corner[1], grid_res[1])
+    # - compute raster extent - (left, right, bottom, top)
+    extent = [ul_corner[0], lr_corner[0], lr_corner[1], ul_corner[1]]
+    # - compute cell centroids
+    x_centroids = x_coords + (grid_res[0]/2.)
+    y_centroids = y_coords + (grid_res[1]/2.)
+    # - rotate the output numpy array in such a way that
+    # - the lower-left corner of the raster is considered
+    # - the origin of the reference system.
+    if src_transform.e < 0:
+        raster_input = np.flipud(raster_input)
+    # - Compute New Affine Transform
+    transform = (Affine.translation(x_coords[0], y_coords[0])
+                 * Affine.scale(res[0], res[1]))
+
+    return{'data': raster_input, 'crs': crs, 'res': res,
+           'y_coords': y_coords, 'x_coords': x_coords,
+           'y_centroids': y_centroids, 'x_centroids': x_centroids,
+           'transform': transform, 'src_transform': src_transform,
+           'width': width, 'height': height, 'extent': extent,
+           'ul_corner': ul_corner, 'lr_corner': lr_corner,
+           'nodata': nodata, 'dtype': dtype}
 
 
 def save_raster(raster: np.ndarray, res: int, x: np.ndarray,
@@ -90,6 +178,76 @@ def save_raster(raster: np.ndarray, res: int, x: np.ndarray,
         dst.write(raster, 1)
 
 
+def geotiff_profile(crs, transform, width: int, height: int,
+                    dtype: str = 'float32', count: int = 1,
+                    nodata: float = -9999., blocksize: int = 256,
+                    compress: str = 'deflate') -> dict:
+    """
+    Rasterio profile of a tiled and compressed GeoTiff
+    :param crs: coordinate reference system
+    :param transform: affine transform
+    :param width: raster width [pixels]
+    :param height: raster height [pixels]
+    :param dtype: raster data type
+    :param count: number of bands
+    :param nodata: no-data value
+    :param blocksize: internal tile side [pixels] - multiple of 16
+    :param compress: compression algorithm
+    :return: dictionary containing the output profile
+    """
+    return {'driver': 'GTiff', 'height': height, 'width': width,
+            'count': count, 'dtype': dtype, 'crs': crs,
+            'transform': transform, 'nodata': nodata, 'tiled': True,
+            'blockxsize': blocksize, 'blockysize': blocksize,
+            'compress': compress}
+
+
+def write_raster(raster: np.ndarray, out_path: str, crs, transform,
+                 nodata: float = -9999., cog: bool = False) -> None:
+    """
+    Save the Provided Raster as a tiled, compressed GeoTiff or as a
+    Cloud-Optimized GeoTiff (COG)
+    :param raster: input raster - np.ndarray - first row at the top of the
+        image (as returned by rasterio)
+    :param out_path: absolute path to output file
+    :param crs: coordinate reference system
+    :param transform: affine transform
+    :param nodata: no-data value - NaN values are saved as no-data
+    :param cog: save the raster as a Cloud-Optimized GeoTiff
+    :return: None
+    """
+    if nodata is not None and np.issubdtype(raster.dtype, np.floating):
+        raster = np.where(np.isnan(raster), nodata, raster)\
+            .astype(raster.dtype, copy=False)
+    profile = geotiff_profile(crs, transform, raster.shape[1],
+                              raster.shape[0], dtype=raster.dtype,
+                              nodata=nodata)
+    if cog:
+        # - COG driver creation options
+        for key in ['tiled', 'blockxsize', 'blockysize']:
+            profile.pop(key)
+        profile.update({'driver': 'COG', 'blocksize': 512,
+                        'overview_resampling': 'nearest'})
+    with rasterio.open(out_path, 'w', **profile) as dst:
+        dst.write(raster, 1)
+
+
+def convert_to_cog(src_file: str, out_file: str, compress: str = 'deflate',
+                   blocksize: int = 512) -> None:
+    """
+    Convert a GeoTiff into a Cloud-Optimized GeoTiff. Find more info here:
+    https://gdal.org/drivers/raster/cog.html
+    :param src_file: absolute path to input raster file
+    :param out_file: absolute path to output raster file
+    :param compress: compression algorithm
+    :param blocksize: internal tile side [pixels]
+    :return: None
+    """
+    # - NOTE: overviews of wrapped phase are computed with nearest neighbour
+    rio_shutil.copy(src_file, out_file, driver='COG', compress=compress,
+                    blocksize=blocksize, overview_resampling='nearest')
+
+
 def vrt_param(crs, res: int, bounds: list,
               resampling_alg: str, dtype: str) -> dict:
     """
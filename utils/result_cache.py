@@ -0,0 +1,212 @@
+"""
+agent 10/2026
+Content-addressed on-disk cache of the products of a processing job.
+
+Each cache entry is stored in a sub-directory of the cache directory named
+after the entry key. The key is the hash of:
+    - the identity of each input file - absolute path, size and
+      modification time - or, if digest is selected, file name, size and
+      digest of the file content (BLAKE2b) - so that entries survive
+      copies/touches of unchanged files;
+    - every processing parameter of the job that affects its products;
+    - CACHE_VERSION - increased when the products of a job change for the
+      same parameters.
+On a hit, the cached products are hard-linked into the output directory
+(copied if the cache is on a different file system): no input is read and
+nothing is computed. Hard links (rather than symbolic links) keep the
+outputs valid when the entry is later evicted.
+
+The cache size is bounded: least recently used entries (modification time
+of the entry directory, refreshed on each hit) are evicted until the total
+size of the cached products fits max_bytes.
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import hashlib
+
+# - Increase to invalidate the entries created by previous versions
+CACHE_VERSION = 1
+# - Name of the entry manifest
+ENTRY_MANIFEST = 'entry.json'
+
+
+def file_digest(in_path: str, chunk_size: int = 2**23) -> str:
+    """
+    Digest of the content of a file
+    :param in_path: absolute path to the input file
+    :param chunk_size: read block size [bytes]
+    :return: BLAKE2b hex digest (128 bits)
+    """
+    f_hash = hashlib.blake2b(digest_size=16)
+    with open(in_path, 'rb') as f_in:
+        for chunk in iter(lambda: f_in.read(chunk_size), b''):
+            f_hash.update(chunk)
+    return f_hash.hexdigest()
+
+
+def input_identity(in_path: str, digest: bool = False) -> list:
+    """
+    Identity of an input file
+    :param in_path: path to the input file
+    :param digest: identify the file by content rather than by location
+        and modification time
+    :return: [absolute path, size [bytes], modification time [ns]] or,
+        with digest, [file name, size [bytes], content digest]
+    """
+    f_stat = os.stat(in_path)
+    if digest:
+        return [os.path.basename(in_path), f_stat.st_size,
+                file_digest(in_path)]
+    return [os.path.abspath(in_path), f_stat.st_size, f_stat.st_mtime_ns]
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """
+    Hard link a file - copy it if linking is not possible. An existing
+    destination is replaced.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return
+    tmp = f'{dst}.{uuid.uuid4().hex[:8]}.tmp'
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def unlink_outputs(out_paths: list) -> None:
+    """
+    Remove the products of a job before computing them again. Products
+    fetched from the cache are hard links to the cache entries: they must
+    be unlinked - not overwritten in place - to leave the entries intact.
+    :param out_paths: absolute paths to the job products
+    :return: None
+    """
+    for out_path in out_paths:
+        try:
+            os.remove(out_path)
+        except FileNotFoundError:
+            pass
+
+
+class ResultCache:
+    """
+    Size-bounded content-addressed cache of job products
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = None,
+                 digest: bool = False):
+        """
+        :param cache_dir: absolute path to the cache directory
+        :param max_bytes: cache budget [bytes] - None: no limit
+        :param digest: identify the input files by content digest - see
+            input_identity
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.digest = digest
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, in_paths: list, params: dict) -> str:
+        """
+        Compute the key of a job
+        :param in_paths: paths to the input files
+        :param params: processing parameters - JSON serializable
+        :return: entry key - hex string
+        """
+        record = {'version': CACHE_VERSION,
+                  'inputs': [input_identity(p, self.digest)
+                             for p in in_paths],
+                  'params': params}
+        return hashlib.blake2b(json.dumps(record, sort_keys=True,
+                                          default=str).encode(),
+                               digest_size=20).hexdigest()
+
+    def fetch(self, key: str, out_dir: str) -> list:
+        """
+        Link the products of a cached job into the output directory
+        :param key: entry key
+        :param out_dir: absolute path to the output directory
+        :return: list of output paths - None if the entry is missing
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry_dir, ENTRY_MANIFEST), 'r') as f_in:
+                files = json.load(f_in)['files']
+            out_paths = []
+            for f_name in files:
+                out_paths.append(os.path.join(out_dir, f_name))
+                _link_or_copy(os.path.join(entry_dir, f_name), out_paths[-1])
+            os.utime(entry_dir)
+        except (OSError, ValueError, KeyError):
+            # - missing, incomplete or concurrently evicted entry
+            return None
+        return out_paths
+
+    def store(self, key: str, out_paths: list) -> None:
+        """
+        Save the products of a job in the cache
+        :param key: entry key
+        :param out_paths: absolute paths to the job products
+        :return: None
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        tmp_dir = os.path.join(self.cache_dir,
+                               f'.{key}.{uuid.uuid4().hex[:8]}.tmp')
+        os.makedirs(tmp_dir)
+        try:
+            for out_path in out_paths:
+                _link_or_copy(out_path, os.path.join(
+                    tmp_dir, os.path.basename(out_path)))
+            with open(os.path.join(tmp_dir, ENTRY_MANIFEST), 'w') as f_out:
+                json.dump({'files': [os.path.basename(p) for p in out_paths],
+                           'created': time.time()}, f_out)
+            # - replace an existing entry (e.g. recomputed with --force)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # - entry created at the same time by another process
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(entry_dir):
+                raise
+        self.evict()
+
+    def entries(self) -> list:
+        """
+        List the cache entries
+        :return: list of (last use time [s], size [bytes], entry directory)
+            sorted from the least recently used
+        """
+        entries = []
+        for e_name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, e_name)
+            if e_name.startswith('.') or not os.path.isdir(entry_dir):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(entry_dir))
+                entries.append((os.stat(entry_dir).st_mtime, size, entry_dir))
+            except OSError:
+                continue
+        return sorted(entries)
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the cache fits its
+        budget
+        :return: number of evicted entries
+        """
+        if self.max_bytes is None:
+            return 0
+        entries = self.entries()
+        total = sum(e[1] for e in entries)
+        n_evicted = 0
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            n_evicted += 1
+        return n_evicted
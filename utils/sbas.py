@@ -0,0 +1,204 @@
+"""
+agent 10/2026
+Per-pixel least-squares (SBAS-style) inversion of a network of unwrapped
+phase measurements.
+
+Each measurement (edge) is the phase difference between two nodes of the
+network - acquisitions for interferograms, interferograms for double
+differences - taken as first node minus second node, the convention of
+read_ee_phase.py (double difference = wrap(phi_ref - phi_sec)):
+    d = x_first - x_second
+The phase of the first node is set to zero and the phase of the remaining
+nodes is estimated in the least-squares (minimum-norm) sense:
+    x = pinv(A) @ d
+with A the (n_edges, n_nodes - 1) design matrix (+1 for the first node and
+-1 for the second node of each edge).
+
+Pixels are inverted in blocks: when all the edges are valid, the inversion
+of a tile is one matrix multiply of the precomputed pseudo-inverse against
+the (n_edges, n_pixels) block of measurements. Otherwise, pixels are grouped
+by validity pattern (the set of valid edges) and each group is inverted
+with the pseudo-inverse of the design matrix restricted to its valid edges.
+Pseudo-inverses are computed once per pattern and reused across tiles.
+Nodes that are not resolved by the valid edges of a pattern (disconnected
+from the first node) are set to NaN.
+"""
+import threading
+import numpy as np
+import rasterio
+from utils.tiling import tile_windows, run_tiles
+from utils.raster_io import geotiff_profile
+from utils.double_diff import common_grid, shift_window, valid_mask, NODATA
+
+
+def design_matrix(edges: list) -> tuple:
+    """
+    Design matrix of a network of phase differences
+    :param edges: list of (first node, second node) tuples - one per edge.
+        Each edge measures the phase of the first node minus the phase of
+        the second node.
+    :return: (design matrix - np.ndarray (n_edges, n_nodes - 1),
+        sorted list of nodes - the first node is the reference)
+    """
+    nodes = sorted({node for edge in edges for node in edge})
+    n_index = {node: k - 1 for k, node in enumerate(nodes)}
+    d_matrix = np.zeros((len(edges), len(nodes) - 1), dtype=np.float64)
+    for e, (n_a, n_b) in enumerate(edges):
+        if n_a == n_b:
+            raise ValueError(f'Invalid edge: {n_a} - {n_b}')
+        if n_index[n_a] >= 0:
+            d_matrix[e, n_index[n_a]] += 1.
+        if n_index[n_b] >= 0:
+            d_matrix[e, n_index[n_b]] -= 1.
+    return d_matrix, nodes
+
+
+class PatternInverse:
+    """
+    Pseudo-inverses of a design matrix restricted to the valid edges of
+    each validity pattern - computed once and cached
+    :param d_matrix: design matrix - np.ndarray (n_edges, n_unknowns)
+    :param rcond: cutoff for small singular values - see numpy.linalg.pinv
+    """
+    def __init__(self, d_matrix: np.ndarray, rcond: float = 1e-10):
+        self.d_matrix = d_matrix
+        self.rcond = rcond
+        self._inverses = {}
+        self._lock = threading.Lock()
+
+    def get(self, pattern: np.ndarray) -> tuple:
+        """
+        Pseudo-inverse of the design matrix restricted to the valid edges
+        :param pattern: boolean mask of the valid edges
+        :return: (pseudo-inverse - np.ndarray (n_unknowns, n_valid_edges),
+            boolean mask of the resolved unknowns)
+        """
+        key = np.packbits(pattern).tobytes()
+        with self._lock:
+            inverse = self._inverses.get(key)
+        if inverse is None:
+            a_valid = self.d_matrix[pattern]
+            p_inv = np.linalg.pinv(a_valid, rcond=self.rcond)
+            # - unknowns fully resolved by the valid edges - diagonal of
+            # - the model resolution matrix equal to one
+            resolved = np.isclose(np.einsum('ij,ji->i', p_inv, a_valid), 1.)
+            inverse = (p_inv, resolved)
+            with self._lock:
+                self._inverses[key] = inverse
+        return inverse
+
+    def __len__(self):
+        return len(self._inverses)
+
+
+def invert_block(data: np.ndarray, valid: np.ndarray,
+                 inverses: PatternInverse) -> tuple:
+    """
+    Least-squares inversion of a block of pixels
+    :param data: measurements - np.ndarray (n_edges, n_pixels)
+    :param valid: boolean mask of valid measurements - same shape as data
+    :param inverses: PatternInverse object of the network design matrix
+    :return: (node phases - np.ndarray (n_unknowns, n_pixels) (float32) -
+        NaN where not resolved, RMS of the residuals - np.ndarray
+        (n_pixels,) (float32) - NaN where no valid edges are found)
+    """
+    d_matrix = inverses.d_matrix
+    n_unknowns, n_pixels = d_matrix.shape[1], data.shape[1]
+    solution = np.full((n_unknowns, n_pixels), np.nan, dtype=np.float32)
+    rms = np.full(n_pixels, np.nan, dtype=np.float32)
+    # - group pixels by validity pattern
+    if valid.all():
+        patterns = np.ones((1, data.shape[0]), dtype=bool)
+        members = [slice(None)]
+    else:
+        # - one key per pixel - packed validity bits (integer keys are
+        # - used for networks of up to 64 edges)
+        packed = np.packbits(valid, axis=0).T
+        if packed.shape[1] <= 8:
+            packed = np.pad(packed, ((0, 0), (0, 8 - packed.shape[1])))
+            keys = packed.view(np.uint64).ravel()
+        else:
+            packed = np.ascontiguousarray(packed)
+            keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+        _, first, groups, counts = np.unique(keys, return_index=True,
+                                             return_inverse=True,
+                                             return_counts=True)
+        patterns = valid[:, first].T
+        members = np.split(np.argsort(groups.ravel(), kind='stable'),
+                           np.cumsum(counts)[:-1])
+    for pattern, cols in zip(patterns, members):
+        if not pattern.any():
+            continue
+        p_inv, resolved = inverses.get(pattern)
+        d_block = data[:, cols][pattern].astype(np.float64)
+        x_block = p_inv @ d_block
+        residuals = d_matrix[pattern] @ x_block - d_block
+        x_block[~resolved] = np.nan
+        solution[:, cols] = x_block
+        rms[cols] = np.sqrt(np.mean(residuals ** 2, axis=0))
+    return solution, rms
+
+
+def sbas_rasters(in_paths: list, edges: list, out_paths: dict,
+                 rms_path: str = None, tile_size: int = 1024,
+                 workers: int = 1) -> PatternInverse:
+    """
+    Per-pixel least-squares inversion of a network of unwrapped phase
+    rasters computed tile by tile
+    :param in_paths: absolute paths to the input unwrapped phase GeoTIFFs
+    :param edges: list of (first node, second node) tuples - one per input
+    :param out_paths: absolute path to the output GeoTIFF of each node -
+        dict(node: path) - the first (reference) node is not saved
+    :param rms_path: absolute path to the output GeoTIFF of the RMS of the
+        residuals - None: not saved
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :return: PatternInverse object used for the inversion
+    """
+    d_matrix, nodes = design_matrix(edges)
+    inverses = PatternInverse(d_matrix)
+    # - Compute the grid covering the overlapping area - headers only
+    srcs = [rasterio.open(p) for p in in_paths]
+    try:
+        offsets, transform, width, height = common_grid(srcs)
+        crs = srcs[0].crs
+    finally:
+        for src in srcs:
+            src.close()
+    profile = geotiff_profile(crs, transform, width, height, nodata=NODATA)
+
+    def process(window):
+        data = np.empty((len(in_paths), window.height * window.width),
+                        dtype=np.float32)
+        valid = np.empty(data.shape, dtype=bool)
+        for e, (in_path, offset) in enumerate(zip(in_paths, offsets)):
+            with rasterio.open(in_path) as src:
+                data[e] = src.read(1, window=shift_window(window, offset))\
+                    .ravel()
+                valid[e] = valid_mask(data[e], src.nodata)
+        solution, rms = invert_block(data, valid, inverses)
+        shape = (window.height, window.width)
+        return solution.reshape(-1, *shape), rms.reshape(shape)
+
+    dsts = {}
+    try:
+        for node in nodes[1:]:
+            dsts[node] = rasterio.open(out_paths[node], 'w', **profile)
+        if rms_path is not None:
+            dsts[None] = rasterio.open(rms_path, 'w', **profile)
+
+        def write(window, result):
+            solution, rms = result
+            for node, x_node in zip(nodes[1:], solution):
+                x_node[np.isnan(x_node)] = NODATA
+                dsts[node].write(x_node, 1, window=window)
+            if rms_path is not None:
+                rms[np.isnan(rms)] = NODATA
+                dsts[None].write(rms, 1, window=window)
+
+        run_tiles(tile_windows(width, height, tile_size), process, write,
+                  workers=workers)
+    finally:
+        for dst in dsts.values():
+            dst.close()
+    return inverses
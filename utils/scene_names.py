@@ -0,0 +1,73 @@
+"""
+agent 10/2026
+Utility functions used to handle ICEYE interferogram file names.
+
+Interferograms are saved as:
+    ICEYE-phase_geo-<YYYYMMDD>_<YYYYMMDD>[...].tif
+Double differences (see read_ee_phase.py) are saved as:
+    <YYYYMMDD>_<YYYYMMDD>-<YYYYMMDD>_<YYYYMMDD>[_suffix].tif
+"""
+import os
+
+# - ICEYE geocoded interferometric phase file name prefix
+ICEYE_PREFIX = 'ICEYE-phase_geo-'
+
+
+def strip_tif(file_name: str) -> str:
+    """
+    Remove the GeoTIFF extension from a file name
+    :param file_name: file name with or without extension
+    :return: file name without the .tif extension
+    """
+    if file_name.lower().endswith('.tif'):
+        return file_name[:-4]
+    return file_name
+
+
+def interferogram_name(file_name: str) -> str:
+    """
+    Extract the Interferogram name from the file name
+    :param file_name: interferogram file name
+    :return: interferogram name - <YYYYMMDD>_<YYYYMMDD>
+    """
+    return os.path.basename(file_name).replace(ICEYE_PREFIX, '')[:17]
+
+
+def interferogram_dates(file_name: str) -> tuple:
+    """
+    Extract the acquisition dates of an interferogram from its file name
+    :param file_name: interferogram file name
+    :return: (reference date, secondary date) - <YYYYMMDD> strings
+    """
+    name = interferogram_name(file_name)
+    dates = name.split('_')
+    if len(dates) != 2 or not all(len(d) == 8 and d.isdigit()
+                                  for d in dates):
+        raise ValueError(f'Unable to parse the acquisition dates of '
+                         f'{file_name}')
+    return dates[0], dates[1]
+
+
+def double_difference_names(file_name: str) -> tuple:
+    """
+    Extract the names of the two interferograms of a double difference
+    from its file name
+    :param file_name: double difference file name
+    :return: (reference interferogram name, secondary interferogram name)
+    """
+    name = strip_tif(os.path.basename(file_name))
+    if len(name) < 35 or name[17] != '-':
+        raise ValueError(f'Not a double difference file name: {file_name}')
+    return name[:17], name[18:35]
+
+
+def edge_nodes(file_name: str) -> tuple:
+    """
+    Nodes connected by an interferogram (acquisition dates) or by a double
+    difference (interferogram names)
+    :param file_name: interferogram or double difference file name
+    :return: (first node, second node)
+    """
+    if os.path.basename(file_name).startswith(ICEYE_PREFIX):
+        return interferogram_dates(file_name)
+    return double_difference_names(file_name)
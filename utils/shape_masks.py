@@ -0,0 +1,270 @@
+"""
+agent 10/2026
+Raster masks and label rasters of vector geometries (e.g. stable reference
+areas or glacier polygons) cached per output grid.
+
+Geometries are read from a shapefile, reprojected to the CRS of the target
+grid and burned with rasterio.features.rasterize into:
+    - a boolean mask (shape_mask) - or only its window over the bounds of
+      the geometries (shape_window_mask) to bound memory in streaming
+      mode. Line outlines are converted into the polygons they enclose;
+      geometries that do not enclose any area raise a ValueError;
+    - an integer label raster (label_raster) - one label per polygon, used
+      to compute zonal statistics. Line features (e.g. glacier outlines
+      stored as LineString/MultiLineString) are converted into the
+      polygons they enclose - see lines_to_polygon. Features that do not
+      enclose any area are skipped with a warning.
+      Where polygons overlap (e.g. nested outlines), the smallest polygon
+      prevails.
+The mask/labels of a given shapefile on a given grid (CRS, transform,
+width, height) are computed only once: they are kept in a small Least
+Recently Used (LRU) cache keyed by shapefile version (path, modification
+time, size) and grid. Cached arrays are read-only.
+"""
+import warnings
+import threading
+from collections import OrderedDict
+import numpy as np
+import fiona
+from rasterio.features import rasterize
+from rasterio.warp import transform_geom
+from rasterio import windows
+from rasterio.windows import Window
+from shapely.geometry import shape, mapping
+from shapely.ops import polygonize_full, unary_union
+from utils.raster_cache import file_identity
+
+# - Maximum number of cached masks
+MASK_CACHE_SIZE = 16
+_MASK_CACHE = OrderedDict()
+_MASK_LOCK = threading.Lock()
+
+
+def lines_to_polygon(geom):
+    """
+    Convert a (Multi)LineString outline into the area it encloses
+    :param geom: shapely LineString or MultiLineString
+    :return: shapely Polygon/MultiPolygon - union of the faces formed by
+        the noded lines - None if the lines do not enclose any area
+    """
+    polygons = polygonize_full([unary_union(geom)])[0]
+    if polygons.is_empty:
+        return None
+    return unary_union(polygons)
+
+
+def read_shapes(shp_path: str) -> tuple:
+    """
+    Read the areas stored in a shapefile - line outlines are converted
+    into the polygons they enclose (see lines_to_polygon)
+    :param shp_path: absolute path to the shapefile
+    :return: (list of GeoJSON-like polygons, shapefile CRS)
+    """
+    shapes = []
+    with fiona.open(shp_path, 'r') as shapefile:
+        for k, feature in enumerate(shapefile):
+            if feature['geometry'] is None:
+                continue
+            geom = shape(feature['geometry'])
+            if geom.geom_type in ('LineString', 'MultiLineString'):
+                geom = lines_to_polygon(geom)
+            elif geom.geom_type not in ('Polygon', 'MultiPolygon'):
+                geom = None
+            if geom is None:
+                raise ValueError(f'Feature {k} of {shp_path} does not '
+                                 f'enclose any area.')
+            shapes.append(mapping(geom))
+        return shapes, shapefile.crs
+
+
+def rasterize_shapes(shapes: list, shp_crs, crs, transform, width: int,
+                     height: int, all_touched: bool = False) -> np.ndarray:
+    """
+    Burn a list of geometries into a boolean mask
+    :param shapes: GeoJSON-like geometries
+    :param shp_crs: geometries CRS
+    :param crs: output grid CRS
+    :param transform: output grid affine transform
+    :param width: output grid width [pixels]
+    :param height: output grid height [pixels]
+    :param all_touched: burn all the pixels touched by the geometries
+    :return: boolean mask - np.ndarray (height, width)
+    """
+    if shp_crs and crs and shp_crs != crs:
+        shapes = [transform_geom(shp_crs, crs, geom) for geom in shapes]
+    if not shapes:
+        return np.zeros((height, width), dtype=bool)
+    return rasterize([(geom, 1) for geom in shapes], out_shape=(height, width),
+                     transform=transform, fill=0, all_touched=all_touched,
+                     dtype='uint8').astype(bool)
+
+
+def _cached(key: tuple, compute):
+    """
+    Retrieve an entry from the LRU cache - computed if missing
+    :param key: cache key
+    :param compute: function computing the entry
+    :return: cached entry
+    """
+    with _MASK_LOCK:
+        if key in _MASK_CACHE:
+            _MASK_CACHE.move_to_end(key)
+            return _MASK_CACHE[key]
+    entry = compute()
+    with _MASK_LOCK:
+        _MASK_CACHE[key] = entry
+        while len(_MASK_CACHE) > MASK_CACHE_SIZE:
+            _MASK_CACHE.popitem(last=False)
+    return entry
+
+
+def _grid_key(shp_path: str, crs, transform, width: int,
+              height: int) -> tuple:
+    """
+    Cache key of a shapefile rasterized on a grid
+    """
+    return (file_identity(shp_path), None if crs is None else crs.to_wkt(),
+            tuple(transform)[:6], width, height)
+
+
+def shape_mask(shp_path: str, crs, transform, width: int, height: int,
+               all_touched: bool = False) -> np.ndarray:
+    """
+    Cached boolean mask of the geometries of a shapefile on a raster grid
+    :param shp_path: absolute path to the shapefile
+    :param crs: grid CRS
+    :param transform: grid affine transform
+    :param width: grid width [pixels]
+    :param height: grid height [pixels]
+    :param all_touched: burn all the pixels touched by the geometries
+    :return: boolean mask - np.ndarray (height, width) - read-only
+    """
+    def compute():
+        shapes, shp_crs = read_shapes(shp_path)
+        mask = rasterize_shapes(shapes, shp_crs, crs, transform, width,
+                                height, all_touched=all_touched)
+        mask.flags.writeable = False
+        return mask
+
+    return _cached(('mask', *_grid_key(shp_path, crs, transform, width,
+                                       height), all_touched), compute)
+
+
+def shape_window_mask(shp_path: str, crs, transform, width: int,
+                      height: int, all_touched: bool = False) -> tuple:
+    """
+    Cached boolean mask of the geometries of a shapefile on a raster grid -
+    rasterized only within the window of the geometries bounds
+    :param shp_path: absolute path to the shapefile
+    :param crs: grid CRS
+    :param transform: grid affine transform
+    :param width: grid width [pixels]
+    :param height: grid height [pixels]
+    :param all_touched: burn all the pixels touched by the geometries
+    :return: (rasterio Window, boolean mask - np.ndarray (window.height,
+        window.width) - read-only) - (None, None) if the geometries do not
+        overlap the grid
+    """
+    def compute():
+        shapes, shp_crs = read_shapes(shp_path)
+        if shp_crs and crs and shp_crs != crs:
+            shapes = [transform_geom(shp_crs, crs, geom) for geom in shapes]
+        if not shapes:
+            return None, None
+        left, bottom, right, top = unary_union(
+            [shape(geom) for geom in shapes]).bounds
+        # - pixel window of the bounds - rounded outwards and clipped
+        cols, rows = zip(*[~transform * (x, y) for x in (left, right)
+                           for y in (bottom, top)])
+        col_off = max(int(np.floor(min(cols))), 0)
+        row_off = max(int(np.floor(min(rows))), 0)
+        col_end = min(int(np.ceil(max(cols))), width)
+        row_end = min(int(np.ceil(max(rows))), height)
+        if col_end <= col_off or row_end <= row_off:
+            return None, None
+        window = Window(col_off, row_off, col_end - col_off,
+                        row_end - row_off)
+        mask = rasterize_shapes(shapes, None, None,
+                                windows.transform(window, transform),
+                                window.width, window.height,
+                                all_touched=all_touched)
+        mask.flags.writeable = False
+        return window, mask
+
+    return _cached(('window_mask', *_grid_key(shp_path, crs, transform,
+                                              width, height), all_touched),
+                   compute)
+
+
+def read_zones(shp_path: str, field: str = None) -> tuple:
+    """
+    Read the polygons stored in a shapefile together with their zone ids
+    :param shp_path: absolute path to the shapefile
+    :param field: attribute used as zone id - None: feature index
+    :return: (list of GeoJSON-like polygons, list of zone ids, CRS)
+    """
+    polygons, zone_ids, skipped = [], [], []
+    with fiona.open(shp_path, 'r') as shapefile:
+        for k, feature in enumerate(shapefile):
+            if feature['geometry'] is None:
+                continue
+            zone_id = k if field is None else feature['properties'][field]
+            geom = shape(feature['geometry'])
+            if geom.geom_type in ('LineString', 'MultiLineString'):
+                geom = lines_to_polygon(geom)
+            elif geom.geom_type not in ('Polygon', 'MultiPolygon'):
+                geom = None
+            if geom is None:
+                skipped.append(zone_id)
+                continue
+            polygons.append(mapping(geom))
+            zone_ids.append(zone_id)
+        shp_crs = shapefile.crs
+    if skipped:
+        warnings.warn(f'{len(skipped)} features of {shp_path} do not '
+                      f'enclose any area and are ignored - zone ids: '
+                      f'{skipped}')
+    return polygons, zone_ids, shp_crs
+
+
+def label_raster(shp_path: str, crs, transform, width: int, height: int,
+                 field: str = None) -> tuple:
+    """
+    Cached label raster of the polygons of a shapefile on a raster grid
+    :param shp_path: absolute path to the shapefile
+    :param crs: grid CRS
+    :param transform: grid affine transform
+    :param width: grid width [pixels]
+    :param height: grid height [pixels]
+    :param field: attribute used as zone id - None: feature index
+    :return: (label raster - np.ndarray (height, width) (int32) - read-only
+        - 0: outside all the polygons, k: k-th polygon, list of zone ids -
+        the k-th polygon corresponds to zone_ids[k - 1])
+    """
+    def compute():
+        polygons, zone_ids, shp_crs = read_zones(shp_path, field=field)
+        if shp_crs and crs and shp_crs != crs:
+            polygons = [transform_geom(shp_crs, crs, geom)
+                        for geom in polygons]
+        labels = np.zeros((height, width), dtype=np.int32)
+        if polygons:
+            # - burn larger polygons first - nested polygons prevail
+            order = sorted(range(len(polygons)),
+                           key=lambda k: -shape(polygons[k]).area)
+            labels = rasterize(((polygons[k], k + 1) for k in order),
+                               out_shape=(height, width),
+                               transform=transform, fill=0, dtype='int32')
+        labels.flags.writeable = False
+        return labels, zone_ids
+
+    return _cached(('labels', *_grid_key(shp_path, crs, transform, width,
+                                         height), field), compute)
+
+
+def clear_mask_cache() -> None:
+    """
+    Release the cached masks
+    :return: None
+    """
+    with _MASK_LOCK:
+        _MASK_CACHE.clear()
@@ -0,0 +1,106 @@
+"""
+agent 10/2026
+Streaming circular-mean stack of wrapped phase rasters.
+
+The stack is computed tile by tile: for each tile, the unit-complex phasors
+exp(1j * phase) of all the inputs are summed - one input at a time - into a
+tile-sized accumulator together with the number of valid pixels. At the end
+of the tile, the accumulator is converted into:
+    mean phase        = angle(sum(exp(1j * phase)))
+    resultant length  = |sum(exp(1j * phase))| / count   [0, 1]
+Memory is therefore bounded by one accumulator plus one input tile (per
+worker thread), independently of the number of stacked rasters.
+
+All the inputs must share the same CRS, resolution and pixel alignment; the
+stack is computed on the intersection of their footprints.
+"""
+import numpy as np
+import rasterio
+from utils.tiling import tile_windows, run_tiles
+from utils.raster_io import geotiff_profile
+from utils.double_diff import common_grid, shift_window, valid_mask, NODATA
+
+
+def accumulate_phasors(acc: dict, phase: np.ndarray,
+                       valid: np.ndarray) -> None:
+    """
+    Add the unit-complex phasors of a phase tile to an accumulator
+    :param acc: accumulator - dict(re, im, count) - updated in place
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param valid: boolean mask of valid pixels
+    :return: None
+    """
+    for key, func in (('re', np.cos), ('im', np.sin)):
+        part = func(phase, dtype=np.float32)
+        part[~valid] = 0.
+        acc[key] += part
+    acc['count'] += valid
+
+
+def stack_rasters(in_paths: list, mean_path: str, length_path: str,
+                  count_path: str = None, tile_size: int = 1024,
+                  workers: int = 1, min_count: int = 1) -> None:
+    """
+    Circular-mean stack of a set of wrapped phase rasters
+    :param in_paths: absolute paths to the input phase GeoTIFFs
+    :param mean_path: absolute path to the output mean phase GeoTIFF
+    :param length_path: absolute path to the output resultant length GeoTIFF
+    :param count_path: absolute path to the output GeoTIFF of the number of
+        valid inputs per pixel - None: not saved
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :param min_count: minimum number of valid inputs - pixels with fewer
+        valid inputs are set to no-data
+    :return: None
+    """
+    # - Compute the grid covering the overlapping area - headers only
+    srcs = [rasterio.open(p) for p in in_paths]
+    try:
+        offsets, transform, width, height = common_grid(srcs)
+        crs = srcs[0].crs
+    finally:
+        for src in srcs:
+            src.close()
+    profile = geotiff_profile(crs, transform, width, height, nodata=NODATA)
+    c_profile = geotiff_profile(crs, transform, width, height,
+                                dtype='uint16', nodata=None)
+
+    def process(window):
+        acc = {'re': np.zeros((window.height, window.width),
+                              dtype=np.float64),
+               'im': np.zeros((window.height, window.width),
+                              dtype=np.float64),
+               'count': np.zeros((window.height, window.width),
+                                 dtype=np.uint16)}
+        for in_path, offset in zip(in_paths, offsets):
+            with rasterio.open(in_path) as src:
+                phase = src.read(1, window=shift_window(window, offset))
+                valid = valid_mask(phase, src.nodata)
+            accumulate_phasors(acc, phase, valid)
+        # - mean phase and resultant length
+        mean = np.arctan2(acc['im'], acc['re']).astype(np.float32)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            length = (np.hypot(acc['re'], acc['im'])
+                      / acc['count']).astype(np.float32)
+        invalid = acc['count'] < max(min_count, 1)
+        mean[invalid] = NODATA
+        length[invalid] = NODATA
+        return mean, length, acc['count']
+
+    with rasterio.open(mean_path, 'w', **profile) as d_mean, \
+            rasterio.open(length_path, 'w', **profile) as d_length:
+        d_count = None if count_path is None \
+            else rasterio.open(count_path, 'w', **c_profile)
+        try:
+
+            def write(window, result):
+                d_mean.write(result[0], 1, window=window)
+                d_length.write(result[1], 1, window=window)
+                if d_count is not None:
+                    d_count.write(result[2], 1, window=window)
+
+            run_tiles(tile_windows(width, height, tile_size), process, write,
+                      workers=workers)
+        finally:
+            if d_count is not None:
+                d_count.close()
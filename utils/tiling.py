@@ -0,0 +1,187 @@
+"""
+agent 10/2026
+Set of utility functions used to process rasters tile by tile.
+
+Tiles are defined as rasterio Windows and are visited in row-major order.
+Peak memory of a tiled computation depends on the tile size and not on the
+size of the processed scene. Neighbourhood operators can read each tile
+together with a halo of surrounding pixels (pad_window) so that the tiled
+result matches the one computed on the whole raster.
+
+Tiles can be processed by a pool of threads: rasterio reads and NumPy
+ufuncs release the GIL. GDAL dataset handles must not be shared between
+threads (nor closed by a thread different from the one that opened them),
+therefore the process function of each tile opens its own read-only
+handles, while results are written by the calling thread in row-major order.
+
+map_raster wraps this pattern for per-pixel and neighbourhood operators
+applied to a single-band raster: each tile is read with its halo, processed
+by a worker thread and written, cropped to the tile, to one or more outputs
+sharing the grid of the input.
+
+For more info about windowed reading/writing in Rasterio see:
+https://rasterio.readthedocs.io/en/latest/topics/windowed-rw.html
+https://rasterio.readthedocs.io/en/latest/topics/concurrency.html
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+from utils.raster_io import geotiff_profile
+
+
+def tile_windows(width: int, height: int, tile_size: int = 1024) -> List:
+    """
+    Split a raster grid into square tiles
+    :param width: raster width [pixels]
+    :param height: raster height [pixels]
+    :param tile_size: tile side [pixels]
+    :return: list of rasterio Windows in row-major order
+    """
+    if tile_size <= 0:
+        raise ValueError(f'Invalid tile size: {tile_size}')
+    windows = []
+    for row_off in range(0, height, tile_size):
+        for col_off in range(0, width, tile_size):
+            windows.append(Window(col_off, row_off,
+                                  min(tile_size, width - col_off),
+                                  min(tile_size, height - row_off)))
+    return windows
+
+
+def pad_window(window, halo: int, width: int, height: int) -> tuple:
+    """
+    Extend a tile by a halo of pixels - clipped to the raster extent
+    :param window: rasterio Window
+    :param halo: halo width [pixels]
+    :param width: raster width [pixels]
+    :param height: raster height [pixels]
+    :return: (padded Window, (row slice, column slice) selecting the
+        original tile within the padded one)
+    """
+    col_0 = max(window.col_off - halo, 0)
+    row_0 = max(window.row_off - halo, 0)
+    col_1 = min(window.col_off + window.width + halo, width)
+    row_1 = min(window.row_off + window.height + halo, height)
+    inner = (slice(window.row_off - row_0,
+                   window.row_off - row_0 + window.height),
+             slice(window.col_off - col_0,
+                   window.col_off - col_0 + window.width))
+    return Window(col_0, row_0, col_1 - col_0, row_1 - row_0), inner
+
+
+def run_tiles(windows: Iterable, process: Callable, write: Callable,
+              workers: int = 1, max_in_flight: int = None) -> None:
+    """
+    Run a tiled computation
+    :param windows: iterable of rasterio Windows
+    :param process: function(window) -> tile result. Executed by the worker
+        threads - must open its own dataset handles.
+    :param write: function(window, tile result) -> None. Always executed by
+        the calling thread following the order of windows.
+    :param workers: number of worker threads
+    :param max_in_flight: maximum number of tiles being processed or
+        waiting to be written [default: 2 * workers]
+    :return: None
+    """
+    if workers <= 1:
+        for window in windows:
+            write(window, process(window))
+        return
+    if max_in_flight is None:
+        max_in_flight = 2 * workers
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for window in windows:
+            if len(in_flight) >= max_in_flight:
+                w_done, future = in_flight.popleft()
+                write(w_done, future.result())
+            in_flight.append((window, executor.submit(process, window)))
+        while in_flight:
+            w_done, future = in_flight.popleft()
+            write(w_done, future.result())
+
+
+def map_raster(in_path: str, out_paths: list, func: Callable, halo: int = 0,
+               tile_size: int = 1024, workers: int = 1,
+               out_types: list = None, merge: Callable = None,
+               on_tile: Callable = None) -> None:
+    """
+    Apply a tile operator to a single-band raster tile by tile
+    :param in_path: absolute path to the input GeoTIFF
+    :param out_paths: absolute paths to the output GeoTIFFs - None: the
+        corresponding result of func is not saved
+    :param func: function(tile, valid) -> np.ndarray or tuple of
+        np.ndarray - one per output - with the shape of the tile. Executed
+        by the worker threads on the tile extended by its halo.
+    :param halo: halo width [pixels]
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :param out_types: list of (dtype, nodata) - one per output
+        [default: float32 - NODATA]. NaN values of floating-point results
+        are saved as nodata.
+    :param merge: optional function(dsts, window, padded window, results)
+        -> results applied by the calling thread to the results of each
+        tile - extended by the halo - before they are cropped to the tile.
+        Outputs are opened in read/write mode so that merge can read the
+        tiles already written (dsts: list of output datasets).
+    :param on_tile: optional function(window, results) called by the
+        calling thread with the results of each tile cropped to the tile
+    :return: None
+    """
+    # - NOTE: imported here - utils.double_diff imports this module
+    from utils.double_diff import valid_mask, NODATA
+    if out_types is None:
+        out_types = [('float32', NODATA)] * len(out_paths)
+    with rasterio.open(in_path) as src:
+        width, height = src.width, src.height
+        profiles = [geotiff_profile(src.crs, src.transform, width, height,
+                                    dtype=dtype, nodata=nodata)
+                    for dtype, nodata in out_types]
+
+    def crop(results, inner):
+        results = tuple(r[inner] for r in results)
+        for result, (_, nodata) in zip(results, out_types):
+            if nodata is not None and np.issubdtype(result.dtype,
+                                                    np.floating):
+                result[np.isnan(result)] = nodata
+        return results
+
+    def process(window):
+        # - read the tile together with its halo
+        p_window, inner = pad_window(window, halo, width, height)
+        with rasterio.open(in_path) as src:
+            tile = src.read(1, window=p_window)
+            valid = valid_mask(tile, src.nodata)
+        results = func(tile, valid)
+        if not isinstance(results, tuple):
+            results = (results, )
+        if merge is None:
+            return crop(results, inner)
+        return p_window, inner, results
+
+    mode = 'w' if merge is None else 'w+'
+    dsts = [None if out_path is None else rasterio.open(out_path, mode,
+                                                        **profile)
+            for out_path, profile in zip(out_paths, profiles)]
+    try:
+
+        def write(window, results):
+            if merge is not None:
+                p_window, inner, results = results
+                results = crop(merge(dsts, window, p_window, results),
+                               inner)
+            for dst, result in zip(dsts, results):
+                if dst is not None:
+                    dst.write(result, 1, window=window)
+            if on_tile is not None:
+                on_tile(window, results)
+
+        run_tiles(tile_windows(width, height, tile_size), process, write,
+                  workers=workers)
+    finally:
+        for dst in dsts:
+            if dst is not None:
+                dst.close()
@@ -0,0 +1,192 @@
+"""
+agent 10/2026
+Tile-based quality-guided phase unwrapping.
+
+Quality-guided path following unwraps the pixels in order of decreasing
+quality, always moving from an unwrapped pixel to its best neighbour - i.e.
+it integrates the wrapped phase gradient along the maximum-quality spanning
+tree of the pixel grid (Prim's algorithm with a heap). Here the spanning
+tree is computed with scipy.sparse.csgraph, the edge cost being a
+decreasing function of the quality of the two pixels it connects. A
+virtual root node, linked to every valid pixel with a cost larger than any
+pixel-to-pixel edge, turns the spanning forest of the disconnected valid
+areas into a single tree seeded at the best pixel of each area. The integer
+number of cycles of each pixel is then accumulated from the root by pointer
+jumping - log2(tree depth) vectorized steps.
+
+By default the pixel quality is the phase coherence (magnitude of the mean
+phasor) within a 3x3 window - see utils.coherence.
+
+Full-frame scenes are unwrapped tile by tile: each tile is unwrapped
+together with an overlap with its neighbours, and tiles are merged in
+row-major order. For each connected area of a tile, the integer-cycle offset
+is the most frequent number of cycles separating the tile from the already
+merged pixels found within the overlap. Memory is bounded by the tile size.
+
+NOTE: scipy is imported only when a phase field is unwrapped, so that
+importing this module does not slow down the startup of read_ee_phase.py.
+"""
+import numpy as np
+from utils.phase_ops import TWO_PI
+from utils.coherence import phase_coherence
+from utils.tiling import tile_windows, pad_window, run_tiles, map_raster
+from utils.double_diff import valid_mask, NODATA
+
+
+def unwrap_phase(phase: np.ndarray, quality: np.ndarray = None,
+                 valid: np.ndarray = None) -> np.ndarray:
+    """
+    Quality-guided unwrapping of a wrapped phase field
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param quality: pixel quality [0, 1] - np.ndarray - None: 3x3 phase
+        coherence
+    :param valid: optional boolean mask of valid pixels - NaN values are
+        always considered invalid
+    :return: unwrapped phase [rad] - np.ndarray (float32) - NaN where the
+        input is not valid. Each connected valid area is unwrapped with
+        respect to its best pixel.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import minimum_spanning_tree, \
+        breadth_first_order
+    n_rows, n_cols = phase.shape
+    n_pixels = n_rows * n_cols
+    v_mask = np.isfinite(phase)
+    if valid is not None:
+        v_mask &= valid
+    if quality is None:
+        quality = phase_coherence(phase, window=3, valid=v_mask)
+    quality = np.clip(np.nan_to_num(quality), 0., 1.).ravel()
+    v_flat = v_mask.ravel()
+    index = np.arange(n_pixels).reshape(n_rows, n_cols)
+    # - pixel-to-pixel edges - horizontal and vertical neighbours
+    h_edge = v_mask[:, :-1] & v_mask[:, 1:]
+    v_edge = v_mask[:-1, :] & v_mask[1:, :]
+    e_from = np.concatenate([index[:, :-1][h_edge], index[:-1, :][v_edge]])
+    e_to = np.concatenate([index[:, 1:][h_edge], index[1:, :][v_edge]])
+    # - virtual root edges - one per valid pixel
+    seeds = np.flatnonzero(v_flat)
+    root = n_pixels
+    # - edge costs - pixel edges in [1, 3], root edges in [3, 4]
+    cost = np.concatenate([3. - quality[e_from] - quality[e_to],
+                           4. - quality[seeds]])
+    graph = coo_matrix(
+        (cost, (np.concatenate([e_from, seeds]),
+                np.concatenate([e_to, np.full(seeds.size, root)]))),
+        shape=(n_pixels + 1, n_pixels + 1)).tocsr()
+    tree = minimum_spanning_tree(graph)
+    _, parent = breadth_first_order(tree, root, directed=False,
+                                    return_predecessors=True)
+    parent[parent < 0] = root
+    parent[root] = root
+    # - integer cycles between each pixel and its parent
+    w_phase = np.zeros(n_pixels + 1, dtype=np.float64)
+    w_phase[:-1][v_flat] = phase.ravel()[v_flat]
+    cycles = -np.rint((w_phase - w_phase[parent]) / TWO_PI).astype(np.int64)
+    cycles[parent == root] = 0
+    # - accumulate cycles from the root - pointer jumping
+    while np.any(parent != root):
+        cycles += cycles[parent]
+        parent = parent[parent]
+    unw_phase = (w_phase[:-1] + TWO_PI * cycles[:-1]).astype(np.float32)
+    unw_phase[~v_flat] = np.nan
+    return unw_phase.reshape(n_rows, n_cols)
+
+
+def merge_offsets(unw_phase: np.ndarray, ref_phase: np.ndarray) \
+        -> np.ndarray:
+    """
+    Integer-cycle offsets that make an unwrapped tile consistent with the
+    already merged pixels - one offset per connected valid area
+    :param unw_phase: unwrapped tile [rad] - NaN where not valid
+    :param ref_phase: already merged phase over the tile [rad] - NaN where
+        not available
+    :return: per-pixel offsets [rad] - np.ndarray (float32)
+    """
+    from scipy import ndimage
+    labels, _ = ndimage.label(np.isfinite(unw_phase))
+    overlap = (labels > 0) & np.isfinite(ref_phase)
+    offsets = np.zeros(labels.max() + 1, dtype=np.int64)
+    if np.any(overlap):
+        cycles = np.rint((ref_phase[overlap] - unw_phase[overlap])
+                         / TWO_PI).astype(np.int64)
+        # - most frequent offset of each connected area
+        pairs, counts = np.unique(np.stack([labels[overlap], cycles]),
+                                  axis=1, return_counts=True)
+        order = np.lexsort((counts, pairs[0]))
+        last = np.r_[pairs[0][order][1:] != pairs[0][order][:-1], True]
+        offsets[pairs[0][order][last]] = pairs[1][order][last]
+    return (TWO_PI * offsets[labels]).astype(np.float32)
+
+
+def merged_mask(p_window, window) -> np.ndarray:
+    """
+    Pixels of a padded tile already merged when tiles are processed in
+    row-major order
+    :param p_window: padded window
+    :param window: tile window
+    :return: boolean mask - np.ndarray (p_window.height, p_window.width)
+    """
+    rows = np.arange(p_window.height)[:, None] + p_window.row_off
+    cols = np.arange(p_window.width)[None, :] + p_window.col_off
+    return (rows < window.row_off) | \
+        ((rows < window.row_off + window.height) & (cols < window.col_off))
+
+
+def unwrap_tiled(phase: np.ndarray, tile_size: int = 1024,
+                 overlap: int = 64, workers: int = 1) -> np.ndarray:
+    """
+    Quality-guided unwrapping of a wrapped phase field computed tile by tile
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param tile_size: tile side [pixels]
+    :param overlap: overlap between adjacent tiles [pixels]
+    :param workers: number of worker threads
+    :return: unwrapped phase [rad] - np.ndarray (float32)
+    """
+    n_rows, n_cols = phase.shape
+    unw_phase = np.full(phase.shape, np.nan, dtype=np.float32)
+
+    def process(window):
+        p_window, inner = pad_window(window, overlap, n_cols, n_rows)
+        rows, cols = p_window.toslices()
+        return p_window, inner, unwrap_phase(phase[rows, cols])
+
+    def write(window, result):
+        p_window, inner, tile = result
+        rows, cols = p_window.toslices()
+        ref_phase = np.where(merged_mask(p_window, window),
+                             unw_phase[rows, cols], np.nan)
+        tile += merge_offsets(tile, ref_phase)
+        rows, cols = window.toslices()
+        unw_phase[rows, cols] = tile[inner]
+
+    run_tiles(tile_windows(n_cols, n_rows, tile_size), process, write,
+              workers=workers)
+    return unw_phase
+
+
+def unwrap_raster(in_path: str, out_path: str, tile_size: int = 1024,
+                  overlap: int = 64, workers: int = 1) -> None:
+    """
+    Quality-guided unwrapping of a wrapped phase raster computed tile by tile
+    :param in_path: absolute path to the input wrapped phase GeoTIFF
+    :param out_path: absolute path to the output unwrapped phase GeoTIFF
+    :param tile_size: tile side [pixels]
+    :param overlap: overlap between adjacent tiles [pixels]
+    :param workers: number of worker threads
+    :return: None
+    """
+    def merge(dsts, window, p_window, results):
+        # - integer-cycle offsets estimated from the tiles already written
+        tile = results[0]
+        ref_phase = dsts[0].read(1, window=p_window)
+        ref_phase[~(merged_mask(p_window, window)
+                    & valid_mask(ref_phase, NODATA))] = np.nan
+        tile += merge_offsets(tile, ref_phase)
+        return (tile, )
+
+    # - each tile is read together with the overlap with its neighbours
+    map_raster(in_path, [out_path],
+               lambda phase, valid: unwrap_phase(phase, valid=valid),
+               halo=overlap, tile_size=tile_size, workers=workers,
+               merge=merge)
@@ -0,0 +1,116 @@
+"""
+agent 10/2026
+Incremental processing of the interferograms delivered to a data
+directory.
+
+The directory is polled at regular intervals. At each poll:
+    - the scene catalog is updated (see utils.catalog) - files modified
+      less than `settle` seconds ago (e.g. still being copied) are skipped
+      and picked up by a later poll; files whose header cannot be read
+      (e.g. truncated) are reported, recorded as failed in the catalog and
+      skipped until they are modified;
+    - the pairs formed by the cataloged interferograms are selected by
+      temporal separation and footprint overlap (see utils.pair_selection);
+    - the pairs not listed in the done-manifest are processed and, once
+      processed successfully, appended to the done-manifest.
+The done-manifest is a CSV file written in append mode and flushed after
+each batch, so that no pair is computed twice across restarts. Failed
+pairs are retried only after a restart.
+"""
+import os
+import csv
+import time
+from datetime import datetime
+from typing import Callable
+from utils.catalog import open_catalog, scan_directory, query_scenes
+from utils.pair_selection import select_pairs
+
+
+def read_done_manifest(done_path: str) -> set:
+    """
+    Read the pairs already processed
+    :param done_path: absolute path to the done-manifest (.csv)
+    :return: set of (reference, secondary) tuples - empty if the
+        manifest does not exist
+    """
+    if not os.path.isfile(done_path):
+        return set()
+    with open(done_path, 'r', newline='') as f_in:
+        return {(row[0], row[1]) for row in csv.reader(f_in)
+                if len(row) >= 2 and row[0] != 'reference'}
+
+
+def append_done_manifest(done_path: str, pairs: list) -> None:
+    """
+    Append the pairs processed successfully to the done-manifest
+    :param done_path: absolute path to the done-manifest (.csv)
+    :param pairs: list of (reference, secondary) tuples
+    :return: None
+    """
+    new_file = not os.path.isfile(done_path)
+    with open(done_path, 'a', newline='') as f_out:
+        writer = csv.writer(f_out)
+        if new_file:
+            writer.writerow(['reference', 'secondary', 'done_at'])
+        done_at = datetime.now().isoformat(timespec='seconds')
+        writer.writerows([(*pair, done_at) for pair in pairs])
+        f_out.flush()
+        os.fsync(f_out.fileno())
+
+
+def watch_directory(directory: str, process_batch: Callable, db_path: str,
+                    done_path: str, interval: float = 60.,
+                    settle: float = 30., min_days: int = 1,
+                    max_days: int = 4, min_overlap: float = 0.6,
+                    max_polls: int = None) -> None:
+    """
+    Poll a data directory and process the new pairs of interferograms
+    :param directory: absolute path to the data directory
+    :param process_batch: function processing a list of (reference,
+        secondary) tuples - must return the job summaries of
+        utils.batch.run_batch
+    :param db_path: absolute path to the scene catalog
+    :param done_path: absolute path to the done-manifest (.csv)
+    :param interval: time between two polls [s]
+    :param settle: minimum time [s] since the last modification of a file
+        before it is processed
+    :param min_days: minimum separation between reference dates [days]
+    :param max_days: maximum separation between reference dates [days]
+    :param min_overlap: minimum overlap fraction of the footprints [0, 1]
+    :param max_polls: number of polls - None: poll until interrupted
+    :return: None
+    """
+    done = read_done_manifest(done_path)
+    failed = set()
+    print(f'# - Watching: {directory} - pairs already processed: '
+          f'{len(done)}')
+    n_poll = 0
+    while max_polls is None or n_poll < max_polls:
+        if n_poll > 0:
+            time.sleep(interval)
+        n_poll += 1
+        conn = open_catalog(db_path)
+        try:
+            summary = scan_directory(conn, directory, min_age=settle)
+            records = query_scenes(conn, directory=directory)
+        finally:
+            conn.close()
+        if summary['failed']:
+            print(f'# - Unreadable rasters skipped: {summary["failed"]}')
+        pairs = [(p['reference'], p['secondary'])
+                 for p in select_pairs(records, min_days=min_days,
+                                       max_days=max_days,
+                                       min_overlap=min_overlap)]
+        new_pairs = [p for p in pairs if p not in done and p not in failed]
+        if not new_pairs:
+            continue
+        print(f'# - {datetime.now().isoformat(timespec="seconds")} - '
+              + ' - '.join(f'{key}: {val}' for key, val in summary.items())
+              + f' - new pairs: {len(new_pairs)}')
+        b_summary = process_batch(new_pairs)
+        processed = [tuple(s_job['job'][:2]) for s_job in b_summary
+                     if s_job['status'] == 'ok']
+        append_done_manifest(done_path, processed)
+        done.update(processed)
+        failed.update(tuple(s_job['job'][:2]) for s_job in b_summary
+                      if s_job['status'] != 'ok')
@@ -0,0 +1,136 @@
+"""
+agent 10/2026
+Zonal circular statistics of a wrapped phase field.
+
+The zones (e.g. glacier polygons) are rasterized once per grid into an
+integer label raster - see utils.shape_masks.label_raster. For each zone,
+the number of valid pixels and the sums of cos(phase) and sin(phase) are
+computed with np.bincount over the labels of the valid pixels, so that the
+cost does not depend on the number of zones. The sums are converted into:
+    circular mean     = angle(C + 1j * S)
+    resultant length  R = |C + 1j * S| / count
+    circular std      = sqrt(-2 * ln(R))   [rad]
+
+Rasters are processed tile by tile: the per-zone sums of each tile are
+added to a global accumulator of (3, n_zones + 1) values.
+"""
+import csv
+import numpy as np
+import rasterio
+from utils.tiling import tile_windows, run_tiles
+from utils.shape_masks import label_raster
+from utils.double_diff import valid_mask
+
+
+def zonal_sums(phase: np.ndarray, labels: np.ndarray, n_zones: int,
+               valid: np.ndarray = None) -> np.ndarray:
+    """
+    Per-zone number of valid pixels and sums of the unit-complex phasors
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param labels: label raster - np.ndarray (int) - 0: no zone
+    :param n_zones: number of zones
+    :param valid: optional boolean mask of valid pixels - NaN values are
+        always considered invalid
+    :return: np.ndarray (3, n_zones + 1) - count, sum of cos(phase), sum of
+        sin(phase) - column k refers to label k
+    """
+    v_mask = np.isfinite(phase) & (labels > 0)
+    if valid is not None:
+        v_mask &= valid
+    z_labels = labels[v_mask]
+    # - NOTE: float64 phasors - float32 sums of a fully coherent zone can
+    # -       exceed the number of pixels (resultant length > 1)
+    z_phase = phase[v_mask].astype(np.float64)
+    return np.stack([
+        np.bincount(z_labels, minlength=n_zones + 1),
+        np.bincount(z_labels, weights=np.cos(z_phase), minlength=n_zones + 1),
+        np.bincount(z_labels, weights=np.sin(z_phase), minlength=n_zones + 1),
+    ]).astype(np.float64)
+
+
+def circular_stats(sums: np.ndarray) -> dict:
+    """
+    Convert per-zone phasor sums into circular statistics
+    :param sums: np.ndarray (3, n_zones + 1) - see zonal_sums
+    :return: dictionary of arrays (one value per zone, label 0 excluded) -
+        count, mean [rad], std [rad] and resultant length - NaN where no
+        valid pixels are found
+    """
+    count, re_sum, im_sum = sums[:, 1:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        length = np.clip(np.hypot(re_sum, im_sum) / count, 0., 1.)
+        std = np.sqrt(-2. * np.log(length))
+    mean = np.arctan2(im_sum, re_sum)
+    mean[count == 0] = np.nan
+    return {'count': count.astype(np.int64), 'mean': mean, 'std': std,
+            'length': length}
+
+
+def zonal_stats(phase: np.ndarray, labels: np.ndarray, n_zones: int,
+                valid: np.ndarray = None) -> dict:
+    """
+    Zonal circular statistics of a wrapped phase field
+    :param phase: wrapped phase [rad] - np.ndarray
+    :param labels: label raster - np.ndarray (int) - 0: no zone
+    :param n_zones: number of zones
+    :param valid: optional boolean mask of valid pixels
+    :return: dictionary of arrays - see circular_stats
+    """
+    return circular_stats(zonal_sums(phase, labels, n_zones, valid=valid))
+
+
+def zonal_stats_raster(in_path: str, shp_path: str, field: str = None,
+                       tile_size: int = 1024, workers: int = 1) -> tuple:
+    """
+    Zonal circular statistics of a wrapped phase raster computed tile by
+    tile
+    :param in_path: absolute path to the input phase GeoTIFF
+    :param shp_path: absolute path to the shapefile of the zones
+    :param field: attribute used as zone id - None: feature index
+    :param tile_size: tile side [pixels]
+    :param workers: number of worker threads
+    :return: (list of zone ids, dictionary of arrays - see circular_stats)
+    """
+    with rasterio.open(in_path) as src:
+        width, height = src.width, src.height
+        labels, zone_ids = label_raster(shp_path, src.crs, src.transform,
+                                        width, height, field=field)
+    sums = np.zeros((3, len(zone_ids) + 1), dtype=np.float64)
+
+    def process(window):
+        rows, cols = window.toslices()
+        with rasterio.open(in_path) as src:
+            phase = src.read(1, window=window)
+            valid = valid_mask(phase, src.nodata)
+        return zonal_sums(phase, labels[rows, cols], len(zone_ids),
+                          valid=valid)
+
+    def write(window, t_sums):
+        sums[:] += t_sums
+
+    run_tiles(tile_windows(width, height, tile_size), process, write,
+              workers=workers)
+    return zone_ids, circular_stats(sums)
+
+
+def write_zonal_stats(zone_ids: list, stats: dict, out_path: str,
+                      min_count: int = 1) -> None:
+    """
+    Save zonal statistics in CSV format
+    :param zone_ids: list of zone ids
+    :param stats: dictionary of arrays - see circular_stats
+    :param out_path: absolute path to the output CSV file
+    :param min_count: minimum number of valid pixels - zones with fewer
+        valid pixels are not saved
+    :return: None
+    """
+    with open(out_path, 'w', newline='') as f_out:
+        writer = csv.writer(f_out)
+        writer.writerow(['zone', 'count', 'mean_rad', 'std_rad', 'length'])
+        for k, zone in enumerate(zone_ids):
+            if stats['count'][k] < min_count:
+                continue
+            writer.writerow([zone, stats['count'][k],
+                             f"{stats['mean'][k]:.6f}",
+                             f"{stats['std'][k]:.6f}",
+                             f"{stats['length'][k]:.6f}"])